@@ -1,13 +1,19 @@
-import pickle
-from tempfile import TemporaryDirectory
-from contextlib import contextmanager
-from pathlib import Path
-from functools import cache, lru_cache
+import json
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import Executor
 from enum import Enum
-from typing import IO, Any, Generator, NamedTuple, Self
+from typing import Any, Awaitable, Callable, Hashable
 
 from erdb.table import Table
+from erdb.app_api.indexes import Predicate, TableIndex
+from erdb.app_api.responses import EncodedResponse
+from erdb.loaders.cache import LoaderCache
 from erdb.loaders import GAME_VERSIONS
+from erdb.utils.generation_cache import GenerationCache
+from erdb.utils.armament_ranking import ArmamentRanking
+from erdb.utils.search import SearchIndex
+from erdb.utils.attack_power import CalculatorData
 from erdb.typing.game_version import GameVersion
 from erdb.typing.api_version import ApiVersion
 
@@ -15,49 +21,196 @@ from erdb.typing.api_version import ApiVersion
 GameVersionEnum = Enum("GameVersionEnum", {"latest": "latest"} | {str(v).replace(".", "_"): str(v) for v in GAME_VERSIONS})
 LATEST_VERSION = list(GameVersionEnum)[1]
 
-class DataProxy(NamedTuple):
-    cache_dir: Path
+_Key = tuple[ApiVersion, str, Table]
 
-    def precache(self):
-        for game_version in GameVersionEnum:
+def _build(cache: GenerationCache, api: ApiVersion, game_version: str, table: Table) -> dict:
+    # module level so that it can be submitted to a process pool
+    return cache.get(table, api, GameVersion.from_string(game_version))
+
+def _build_item(api: ApiVersion, game_version: str, table: Table, item_key: str) -> Any | None:
+    # params and messages are memory-mapped, loading all of them is cheap compared to making every item
+    generator = table.make_generator(GameVersion.from_string(game_version))
+
+    if (row := generator.find_row(item_key)) is None:
+        return None
+
+    return generator.spec.make_object(api, generator.data, row)
+
+class DataProxy:
+    """
+    Asynchronous access to generated tables. Cold tables are built in the executor
+    so the event loop keeps serving other requests, and concurrent requests for
+    the same table share a single build.
+    """
+    cache: GenerationCache
+    executor: Executor | None
+    maxsize: int
+
+    _latest: dict[_Key, dict] # always in memory
+    _recent: OrderedDict[_Key, dict] # up to `maxsize` tables
+    _pending: dict[_Key, asyncio.Future[dict]]
+    _indexes: dict[_Key, TableIndex] # of tables in memory only
+    _responses: LoaderCache
+    _items: LoaderCache # single items of tables not in memory
+    _rankings: OrderedDict[str, asyncio.Future[ArmamentRanking]] # of the 4 most recent versions
+    _searches: OrderedDict[str, asyncio.Future[SearchIndex]] # of the 4 most recent versions
+
+    def __init__(self, cache: GenerationCache, executor: Executor | None = None, maxsize: int = 8) -> None:
+        self.cache = cache
+        self.executor = executor
+        self.maxsize = maxsize
+        self._latest = {}
+        self._recent = OrderedDict()
+        self._pending = {}
+        self._indexes = {}
+        self._responses = LoaderCache(maxsize=32)
+        self._items = LoaderCache(maxsize=256)
+        self._rankings = OrderedDict()
+        self._searches = OrderedDict()
+
+    async def warm_up(self, precache: bool = False):
+        """
+        Generate every table of the latest version, and of all other versions too
+        if `precache` is set. Meant to run in the background once the server started.
+        """
+        versions = list(GameVersionEnum)[1:] if precache else [LATEST_VERSION]
+
+        for game_version in versions:
             print(f">>> Precaching version {game_version.value}:", flush=True)
 
             for tb in Table.effective():
                 for api in tb.spec.model.keys():
                     print(f"> {tb.title} [v{api}]", flush=True)
-                    self.generate(api, game_version, tb)
+                    await self.generate(api, game_version, tb)
 
             print(flush=True)
 
-    def generate(self, api: ApiVersion, game_version: GameVersionEnum, table: Table) -> dict: # type: ignore
-        return \
-            self._generate_latest(api, table) if game_version == GameVersionEnum.latest else \
-            self._generate_specific(api, game_version, table)
+    async def generate(self, api: ApiVersion, game_version: GameVersionEnum, table: Table) -> dict: # type: ignore
+        key = self._key(api, game_version, table)
 
-    @cache # always in memory
-    def _generate_latest(self, api: ApiVersion, table: Table) -> dict:
-        return self._generate_specific(api, LATEST_VERSION, table)
+        if (data := self._retrieve(key)) is not None:
+            return data
 
-    @lru_cache(maxsize=8) # up to 8 tables, single item access caches an entire table
-    def _generate_specific(self, api: ApiVersion, game_version: GameVersionEnum, table: Table) -> dict: # type: ignore
-        try:
-            with self._open_cache(api, game_version, table, mode="rb") as f:
-                return pickle.load(f)
+        if (pending := self._pending.get(key)) is None:
+            loop = asyncio.get_running_loop()
+            pending = self._pending[key] = loop.run_in_executor(self.executor, _build, self.cache, *key)
+            pending.add_done_callback(lambda future: self._finish(key, future))
 
-        except FileNotFoundError:
-            ver = GameVersion.from_string(game_version.value)
-            data = table.make_generator(ver).generate(api)
+        # shielded, a cancelled request must not cancel the build other requests wait for
+        return await asyncio.shield(pending)
 
-            with self._open_cache(api, game_version, table, mode="wb") as f:
-                pickle.dump(data, f)
+    async def item(self, api: ApiVersion, game_version: GameVersionEnum, table: Table, item_key: str) -> Any | None: # type: ignore
+        """
+        Item of the table with the key, None if there is no such item. Taken from the
+        table if it is in memory or being built, otherwise only the item itself is made,
+        in a thread so it does not wait for table builds in the executor.
+        """
+        key = self._key(api, game_version, table)
 
-            return data
+        if (data := self._retrieve(key)) is not None:
+            return data.get(item_key)
+
+        if (pending := self._pending.get(key)) is not None:
+            return (await asyncio.shield(pending)).get(item_key)
+
+        return await asyncio.to_thread(self._items.get, (*key, item_key), lambda: _build_item(*key, item_key))
+
+    async def select(self, api: ApiVersion, game_version: GameVersionEnum, table: Table, predicates: list[Predicate]) -> list[str]: # type: ignore
+        """
+        Keys of the items matching all predicates, answered from the table's indexes.
+        Raises AttributeError if a queried field does not exist.
+        """
+        data = await self.generate(api, game_version, table)
+        key = self._key(api, game_version, table)
+
+        if (index := self._indexes.get(key)) is None:
+            index = TableIndex(data)
+
+            if self._retrieve(key) is data: # not evicted in the meantime
+                self._indexes[key] = index
+
+        return index.select(predicates)
+
+    async def encode(self, api: ApiVersion, game_version: GameVersionEnum, table: Table, variant: Hashable, data: Any) -> EncodedResponse: # type: ignore
+        """
+        Encoded `data`, which is the response of the table's endpoint identified by
+        `variant` (its parameters). Encoding is done in a thread and only once.
+        """
+        key = (*self._key(api, game_version, table), variant)
+        return await asyncio.to_thread(self._responses.get, key, lambda: EncodedResponse.encode(data))
+
+    async def ranking(self, game_version: GameVersionEnum) -> ArmamentRanking: # type: ignore
+        """
+        Armament ranking of the game version, built once from its generated tables.
+        """
+        version = self._key(ApiVersion.VER_1, game_version, Table.ARMAMENTS)[1]
+        return await self._per_version(self._rankings, version, lambda: self._build_ranking(game_version))
+
+    async def search(self, game_version: GameVersionEnum) -> SearchIndex: # type: ignore
+        """
+        Search index of the game version, loaded from the generation cache or built
+        there once, in a thread so it does not wait for table builds in the executor.
+        """
+        version = self._key(ApiVersion.VER_1, game_version, Table.ALL)[1]
+        return await self._per_version(self._searches, version, lambda: asyncio.to_thread(SearchIndex.load, GameVersion.from_string(version), self.cache))
+
+    async def _per_version(self, futures: OrderedDict[str, asyncio.Future], version: str, build: Callable[[], Awaitable]) -> Any:
+        if (pending := futures.get(version)) is None:
+            pending = futures[version] = asyncio.ensure_future(build())
+            pending.add_done_callback(lambda future: self._discard_failed(futures, version, future))
+
+            while len(futures) > 4:
+                futures.popitem(last=False)
+
+        futures.move_to_end(version)
+        return await asyncio.shield(pending)
+
+    @staticmethod
+    def _discard_failed(futures: OrderedDict[str, asyncio.Future], version: str, future: asyncio.Future):
+        # failed builds are retried by the next request
+        if future.cancelled() or future.exception() is not None:
+            if futures.get(version) is future:
+                del futures[version]
+
+    async def _build_ranking(self, game_version: GameVersionEnum) -> ArmamentRanking: # type: ignore
+        data: list[bytes] = []
+
+        for tb in [Table.ARMAMENTS, Table.REINFORCEMENTS, Table.CORRECTION_ATTACK, Table.CORRECTION_GRAPH]:
+            # shares the encoding with responses of the tables' list endpoints
+            encoded = await self.encode(ApiVersion.VER_1, game_version, tb, ((), ()), await self.generate(ApiVersion.VER_1, game_version, tb))
+            data.append(encoded.plain)
+
+        return await asyncio.to_thread(lambda: ArmamentRanking(CalculatorData(*map(json.loads, data))))
+
+    @staticmethod
+    def _key(api: ApiVersion, game_version: GameVersionEnum, table: Table) -> _Key: # type: ignore
+        if game_version == GameVersionEnum.latest:
+            game_version = LATEST_VERSION
+
+        return (api, game_version.value, table)
+
+    def _retrieve(self, key: _Key) -> dict | None:
+        if key in self._latest:
+            return self._latest[key]
+
+        if key in self._recent:
+            self._recent.move_to_end(key)
+            return self._recent[key]
+
+        return None
+
+    def _finish(self, key: _Key, future: asyncio.Future[dict]):
+        del self._pending[key]
+
+        if future.cancelled() or future.exception() is not None:
+            return
+
+        if key[1] == LATEST_VERSION.value:
+            self._latest[key] = future.result()
+            return
 
-    def _open_cache(self, api: ApiVersion, game_version: GameVersionEnum, table: Table, mode: str) -> IO[Any]: # type: ignore
-        return open(self.cache_dir / f"{api}-{game_version.value}-{table}.bin", mode=mode)
+        self._recent[key] = future.result()
 
-    @classmethod
-    @contextmanager
-    def in_temp_dir(cls, **kwargs) -> Generator[Self, None, None]:
-        with TemporaryDirectory(**kwargs) as temp_dir:
-            yield cls(Path(temp_dir))
\ No newline at end of file
+        while len(self._recent) > self.maxsize:
+            evicted, _ = self._recent.popitem(last=False)
+            self._indexes.pop(evicted, None)
\ No newline at end of file
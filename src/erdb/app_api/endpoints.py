@@ -1,11 +1,17 @@
+from enum import Enum
 from typing import Any
-from fastapi import Query, status
+from fastapi import Query, Request, status
 from fastapi.responses import JSONResponse
 from pydantic.dataclasses import dataclass
 
 from erdb.table import Table
 from erdb.app_api.common import DataProxy, GameVersionEnum
-from erdb.utils.common import getattrstr
+from erdb.app_api.indexes import Predicate
+from erdb.utils.armament_ranking import SORT_KEYS
+from erdb.utils.search import SEARCHABLE_TABLES
+from erdb.utils.attack_power import Attributes
+from erdb.typing.categories import ArmamentCategory
+from erdb.typing.enums import ArmamentUpgradeMaterial
 from erdb.typing.api_version import ApiVersion
 
 
@@ -13,6 +19,25 @@ from erdb.typing.api_version import ApiVersion
 class _Detail:
     detail: str
 
+@dataclass
+class _RankedArmament:
+    name: str
+    affinity: str
+    level: int
+    total: int
+    attack_power: dict[str, int]
+    status_effects: dict[str, int]
+
+@dataclass
+class _SearchResult:
+    table: str
+    key: str
+    name: str
+    score: float
+
+SortKeyEnum = Enum("SortKeyEnum", {k: k for k in SORT_KEYS})
+SearchTableEnum = Enum("SearchTableEnum", {str(tb): str(tb) for tb in SEARCHABLE_TABLES})
+
 class DataEndpoint:
     data_proxy: DataProxy
     api: ApiVersion
@@ -44,30 +69,36 @@ class DataEndpoint:
         return {
             status.HTTP_400_BAD_REQUEST: {
                 "model": _Detail,
-                "description": "Bad Request: `query` format is valid, but the specified field does not exist for this model."
+                "description": "Bad Request: `query` format is valid, but the specified field does not exist for this model or a range targets a non-numeric field."
             }
         }
 
-    def __call__(self,
+    async def __call__(self,
+        request: Request,
         game_version: GameVersionEnum,
         keys: list[str] | None = Query(None, alias="k", description="Specify a list of keys (ascii names) to retrieve specific items."),
-        query: str | None = Query(None, description="Filter elements by field in format \"{field}:{value}\".", regex=r"^\w+\:.+$"),
+        query: list[str] | None = Query(None, description="Filter elements by field in format \"{field}:{value}\", numeric fields also accept ranges: \"{field}:>=10\", \"{field}:<2.5\" or \"{field}:10..20\". Multiple queries must all match.", regex=r"^\w+\:.+$"),
     ) -> Any:
-        data = self.data_proxy.generate(self.api, game_version, self.table)
-
-        if keys is not None:
-            data = {k: v for k, v in data.items() if k in keys}
+        data = await self.data_proxy.generate(self.api, game_version, self.table)
 
         if query is not None:
-            field, value = query.split(":", maxsplit=1)
-
             try:
-                data = {k: v for k, v in data.items() if getattrstr(v, field) == value}
-            
-            except AttributeError:
-                return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": f"{self.table.title} has no field: \"{field}\"."})
+                predicates = [Predicate.parse(q) for q in query]
+                selected = await self.data_proxy.select(self.api, game_version, self.table, predicates)
+
+            except ValueError as e:
+                return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(e)})
+
+            except AttributeError as e:
+                return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": f"{self.table.title} has no field: \"{e.name}\"."})
+
+            data = {k: data[k] for k in selected}
 
-        return data
+        if keys is not None:
+            data = {k: v for k, v in data.items() if k in keys}
+
+        encoded = await self.data_proxy.encode(self.api, game_version, self.table, (tuple(keys or ()), tuple(query or ())), data)
+        return encoded.respond(request)
 
 class ItemEndpoint:
     data_proxy: DataProxy
@@ -101,9 +132,103 @@ class ItemEndpoint:
             status.HTTP_404_NOT_FOUND: {"model": _Detail}
         }
 
-    def __call__(self, game_version: GameVersionEnum, key: str) -> Any:
+    async def __call__(self, game_version: GameVersionEnum, key: str) -> Any:
+        if (item := await self.data_proxy.item(self.api, game_version, self.table, key)) is None:
+            return JSONResponse(status_code=status.HTTP_404_NOT_FOUND, content={"detail": f"{self.table.title} has no key: \"{key}\""})
+
+        return item
+
+class RankingEndpoint:
+    data_proxy: DataProxy
+
+    def __init__(self, data_proxy: DataProxy) -> None:
+        self.data_proxy = data_proxy
+
+    @property
+    def route(self) -> str:
+        return "/"
+
+    @property
+    def model(self) -> Any:
+        return list[_RankedArmament]
+
+    @property
+    def summary(self) -> str:
+        return "best armaments"
+
+    @property
+    def description(self) -> str:
+        return "Rank armaments of every affinity by attack power or status effects for the given attributes."
+
+    @property
+    def responses(self) -> dict[int, dict]:
+        return {
+            status.HTTP_400_BAD_REQUEST: {"model": _Detail}
+        }
+
+    async def __call__(self,
+        game_version: GameVersionEnum,
+        attributes: str = Query(..., description="Player attributes in format \"str,dex,int,fth,arc\".", regex=r"^\d+,\d+,\d+,\d+,\d+$"),
+        two_handed: bool = Query(False, description="Wield armaments with both hands, multiplying strength by 1.5."),
+        level: int | None = Query(None, ge=0, le=25, description="Upgrade level, converted for somber armaments. Maximum level of each armament if not specified."),
+        category: list[ArmamentCategory] | None = Query(None, description="Only rank armaments of these categories."),
+        upgrade_material: ArmamentUpgradeMaterial | None = Query(None, description="Only rank armaments upgraded with this material."),
+        requirements_met: bool = Query(True, description="Only rank armaments whose requirements are met."),
+        sort_by: SortKeyEnum = Query(SortKeyEnum["total"], description="Total attack power, an attack type or a status effect."), # type: ignore
+        limit: int = Query(10, ge=1, le=100, description="Number of armaments to retrieve."),
+    ) -> Any:
         try:
-            return self.data_proxy.generate(self.api, game_version, self.table)[key]
+            attribs = Attributes.from_string(attributes)
+
+        except AssertionError as e:
+            return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(e)})
+
+        ranking = await self.data_proxy.ranking(game_version)
+        ranked = ranking.rank(
+            attribs,
+            two_handed=two_handed,
+            level=level,
+            categories=None if category is None else [c.value for c in category],
+            upgrade_material=None if upgrade_material is None else upgrade_material.value,
+            requirements_met=requirements_met,
+            sort_by=sort_by.value,
+            limit=limit,
+        )
+
+        return [r._asdict() for r in ranked]
+
+class SearchEndpoint:
+    data_proxy: DataProxy
+
+    def __init__(self, data_proxy: DataProxy) -> None:
+        self.data_proxy = data_proxy
 
-        except KeyError:
-            return JSONResponse(status_code=status.HTTP_404_NOT_FOUND, content={"detail": f"{self.table.title} has no key: \"{key}\""})
\ No newline at end of file
+    @property
+    def route(self) -> str:
+        return "/"
+
+    @property
+    def model(self) -> Any:
+        return list[_SearchResult]
+
+    @property
+    def summary(self) -> str:
+        return "search items"
+
+    @property
+    def description(self) -> str:
+        return "Find items of every table by words of their names, summaries and descriptions, ignoring case and accents. Words of the query also match longer words beginning with them."
+
+    @property
+    def responses(self) -> dict[int, dict]:
+        return {}
+
+    async def __call__(self,
+        game_version: GameVersionEnum,
+        q: str = Query(..., min_length=1, description="Words to search for, all of which have to match."),
+        table: list[SearchTableEnum] | None = Query(None, description="Only search items of these tables."), # type: ignore
+        limit: int = Query(20, ge=1, le=100, description="Number of items to retrieve."),
+    ) -> Any:
+        index = await self.data_proxy.search(game_version)
+        tables = None if table is None else [Table(t.value) for t in table]
+        return [r._asdict() for r in index.search(q, limit, tables)]
\ No newline at end of file
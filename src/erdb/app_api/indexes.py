@@ -0,0 +1,117 @@
+import re
+from bisect import bisect_left, bisect_right
+from typing import Any, NamedTuple, Self
+
+from erdb.utils.common import as_str
+
+
+"""
+Secondary indexes answering the `query` filter of list endpoints. A table's items
+never change once generated, so every field index is built once on first use
+and then serves each predicate in O(log n + matches).
+"""
+
+_RANGE = re.compile(r"^(?P<op>>=|<=|>|<)(?P<value>.+)$")
+_BETWEEN = re.compile(r"^(?P<lo>-?\d+(\.\d+)?)\.\.(?P<hi>-?\d+(\.\d+)?)$")
+
+def _number(value: str) -> float | None:
+    try:
+        return float(value)
+
+    except ValueError:
+        return None
+
+class Predicate(NamedTuple):
+    field: str
+    equals: str | None = None
+    lo: float = float("-inf")
+    hi: float = float("inf")
+    lo_inclusive: bool = True
+    hi_inclusive: bool = True
+
+    @classmethod
+    def parse(cls, query: str) -> Self:
+        """
+        Parse a query in format "{field}:{value}", where value is matched exactly
+        unless it is a numeric range: ">=x", "<=x", ">x", "<x" or "x..y" (inclusive).
+        Values like "<Bow" are not ranges, but matched exactly.
+        """
+        field, value = query.split(":", maxsplit=1)
+
+        if (match := _RANGE.match(value)) and (bound := _number(match["value"])) is not None:
+            op = match["op"]
+            return cls(field, lo=bound, lo_inclusive=op == ">=") if op[0] == ">" else cls(field, hi=bound, hi_inclusive=op == "<=")
+
+        if match := _BETWEEN.match(value):
+            return cls(field, lo=float(match["lo"]), hi=float(match["hi"]))
+
+        return cls(field, equals=value)
+
+class FieldIndex:
+    """
+    Positions of a table's items grouped by the string form of a field, as well
+    as ordered by its value for numeric fields.
+    """
+    _values: dict[str, list[int]]
+    _numbers: list[float]
+    _positions: list[int]
+
+    def __init__(self, items: list[Any], field: str) -> None:
+        self._values = {}
+        numbers: list[tuple[float, int]] = []
+
+        for pos, item in enumerate(items):
+            value = getattr(item, field)
+            self._values.setdefault(as_str(value), []).append(pos)
+
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                numbers.append((value, pos))
+
+        numbers.sort()
+        self._numbers = [num for num, _ in numbers]
+        self._positions = [pos for _, pos in numbers]
+
+    @property
+    def numeric(self) -> bool:
+        return len(self._numbers) > 0
+
+    def select(self, predicate: Predicate) -> list[int]:
+        if predicate.equals is not None:
+            return self._values.get(predicate.equals, [])
+
+        begin = (bisect_left if predicate.lo_inclusive else bisect_right)(self._numbers, predicate.lo)
+        end = (bisect_right if predicate.hi_inclusive else bisect_left)(self._numbers, predicate.hi)
+        return self._positions[begin:end]
+
+class TableIndex:
+    """
+    Lazily built field indexes of a single generated table.
+    """
+    keys: list[str]
+
+    _items: list[Any]
+    _fields: dict[str, FieldIndex]
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        self.keys = list(data.keys())
+        self._items = list(data.values())
+        self._fields = {}
+
+    def field(self, field: str) -> FieldIndex:
+        if (index := self._fields.get(field)) is None:
+            index = self._fields[field] = FieldIndex(self._items, field)
+        return index
+
+    def select(self, predicates: list[Predicate]) -> list[str]:
+        """
+        Keys of items matching all predicates, in the original order of the table.
+        Raises AttributeError if a field does not exist and ValueError if a range
+        targets a field without numeric values.
+        """
+        for p in predicates:
+            if p.equals is None and not self.field(p.field).numeric:
+                raise ValueError(f"\"{p.field}\" is not a numeric field.")
+
+        matches = sorted((self.field(p.field).select(p) for p in predicates), key=len)
+        positions = set(matches[0]).intersection(*matches[1:]) if len(matches) > 0 else range(len(self.keys))
+        return [self.keys[pos] for pos in sorted(positions)]
\ No newline at end of file
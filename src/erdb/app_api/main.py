@@ -1,10 +1,13 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import uvicorn
 from fastapi import FastAPI, APIRouter, Depends
 from fastapi_versioning import VersionedFastAPI, versioned_api_route
 from fastapi.middleware.cors import CORSMiddleware
 
-from erdb.app_api.endpoints import DataEndpoint, ItemEndpoint
+from erdb.app_api.endpoints import DataEndpoint, ItemEndpoint, RankingEndpoint, SearchEndpoint
 from erdb.app_api.common import DataProxy
+from erdb.utils.generation_cache import GenerationCache
 from erdb.typing.api_version import ApiVersion
 from erdb.table import Table
 
@@ -30,18 +33,77 @@ def _get_router(data_proxy: DataProxy, api: ApiVersion, table: Table) -> APIRout
 
     return router
 
-def serve(port: int, *, bind: str = "0.0.0.0", precache: bool = False):
-    with DataProxy.in_temp_dir(prefix="erdb-cache-") as data_proxy:
-        if precache:
-            data_proxy.precache()
+def _get_ranking_router(data_proxy: DataProxy) -> APIRouter:
+    router = APIRouter(
+        prefix="/{game_version}/armament-ranking",
+        route_class=versioned_api_route(ApiVersion.VER_1),
+        tags=["Armament Ranking"],
+    )
+
+    endpoint = RankingEndpoint(data_proxy)
+    router.add_api_route(
+        endpoint.route,
+        lambda dep = Depends(endpoint): dep,
+        response_model=endpoint.model,
+        responses=endpoint.responses,
+        summary=endpoint.summary,
+        description=endpoint.description
+    )
+
+    return router
+
+def _get_search_router(data_proxy: DataProxy) -> APIRouter:
+    router = APIRouter(
+        prefix="/{game_version}/search",
+        route_class=versioned_api_route(ApiVersion.VER_1),
+        tags=["Search"],
+    )
+
+    endpoint = SearchEndpoint(data_proxy)
+    router.add_api_route(
+        endpoint.route,
+        lambda dep = Depends(endpoint): dep,
+        response_model=endpoint.model,
+        responses=endpoint.responses,
+        summary=endpoint.summary,
+        description=endpoint.description
+    )
+
+    return router
+
+def serve(port: int, *, bind: str = "0.0.0.0", precache: bool = False, jobs: int = 1):
+    # cold tables are built off the event loop, in worker processes if more than one job is requested
+    executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else ThreadPoolExecutor(max_workers=1)
+    data_proxy = DataProxy(GenerationCache.default(), executor)
+
+    app = FastAPI(title="ERDB API Docs", description="RESTful API documentation for ERDB.")
+
+    for tb in sorted(Table.effective()):
+        for api in tb.spec.model.keys():
+            app.include_router(_get_router(data_proxy, api, tb))
+
+    app.include_router(_get_ranking_router(data_proxy))
+    app.include_router(_get_search_router(data_proxy))
+
+    app = VersionedFastAPI(app, version_format="API v{major}", prefix_format="/v{major}")
+    app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["GET"], allow_headers=["*"])
+
+    background: set[asyncio.Task] = set()
 
-        app = FastAPI(title="ERDB API Docs", description="RESTful API documentation for ERDB.")
+    @app.on_event("startup")
+    async def warm_up():
+        # the server is available right away, requests for tables not yet generated simply wait for them
+        task = asyncio.create_task(data_proxy.warm_up(precache))
+        background.add(task)
+        task.add_done_callback(background.discard)
 
-        for tb in sorted(Table.effective()):
-            for api in tb.spec.model.keys():
-                app.include_router(_get_router(data_proxy, api, tb))
+    @app.on_event("shutdown")
+    async def stop_warm_up():
+        # otherwise an interrupted warm-up keeps submitting builds to the executor being shut down
+        for task in list(background):
+            task.cancel()
 
-        app = VersionedFastAPI(app, version_format="API v{major}", prefix_format="/v{major}")
-        app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["GET"], allow_headers=["*"])
+        await asyncio.gather(*background, return_exceptions=True)
 
-        uvicorn.run(app, host=bind, port=port)
+    with executor:
+        uvicorn.run(app, host=bind, port=port)
\ No newline at end of file
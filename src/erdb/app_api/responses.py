@@ -0,0 +1,78 @@
+import json
+import gzip
+from hashlib import sha256
+from typing import Any, NamedTuple, Self
+from fastapi import Request, Response, status
+
+from erdb.utils.common import pydantic_encoder_no_nulls
+
+try:
+    import brotli # type: ignore
+
+except ImportError:
+    brotli = None
+
+
+"""
+Responses of list endpoints encoded once and kept as bytes. Data of a game version
+never changes, so an encoded response stays valid for as long as the server runs
+and is identified by strong ETags derived from its content.
+"""
+
+def _accepts(request: Request, encoding: str) -> bool:
+    for accepted in request.headers.get("accept-encoding", "").split(","):
+        name, *params = [part.strip() for part in accepted.split(";")]
+        if name == encoding:
+            return "q=0" not in params and "q=0.0" not in params
+
+    return False
+
+def _matches(request: Request, digest: str) -> bool:
+    if (if_none_match := request.headers.get("if-none-match")) is None:
+        return False
+
+    for tag in if_none_match.split(","):
+        # If-None-Match uses weak comparison, and every encoding represents the same data
+        tag = tag.strip().removeprefix("W/").strip("\"")
+
+        if tag == "*" or tag.split("-", maxsplit=1)[0] == digest:
+            return True
+
+    return False
+
+class EncodedResponse(NamedTuple):
+    digest: str
+    plain: bytes
+    gzip: bytes
+    brotli: bytes | None
+
+    @classmethod
+    def encode(cls, data: Any) -> Self:
+        # same output as FastAPI's serialization of the response model, excluding nulls
+        plain = json.dumps(data, default=pydantic_encoder_no_nulls, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+        return cls(
+            digest=sha256(plain).hexdigest()[:32],
+            plain=plain,
+            gzip=gzip.compress(plain, compresslevel=6, mtime=0),
+            brotli=None if brotli is None else brotli.compress(plain),
+        )
+
+    def respond(self, request: Request) -> Response:
+        if _matches(request, self.digest):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self._headers())
+
+        if self.brotli is not None and _accepts(request, "br"):
+            return Response(self.brotli, media_type="application/json", headers=self._headers("br"))
+
+        if _accepts(request, "gzip"):
+            return Response(self.gzip, media_type="application/json", headers=self._headers("gzip"))
+
+        return Response(self.plain, media_type="application/json", headers=self._headers())
+
+    def _headers(self, encoding: str | None = None) -> dict[str, str]:
+        # strong ETags must differ between content encodings of the same data
+        if encoding is None:
+            return {"ETag": f"\"{self.digest}\"", "Vary": "Accept-Encoding"}
+
+        return {"ETag": f"\"{self.digest}-{encoding}\"", "Vary": "Accept-Encoding", "Content-Encoding": encoding}
\ No newline at end of file
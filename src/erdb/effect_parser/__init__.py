@@ -2,8 +2,9 @@ import erdb.effect_parser.attribute_fields as attrib_fields
 import erdb.effect_parser.parsers as parse
 import erdb.effect_parser.hardcoded as hardcoded_effects
 from erdb.effect_parser.aggregator import aggregate_effects
+from erdb.loaders.cache import LoaderCache, CacheStats
 from erdb.typing.models.effect import StatusEffects
-from erdb.typing.params import ParamRow, ParamDict
+from erdb.typing.params import ParamRow, ParamDict, ParamFieldSource
 from erdb.typing.enums import SpEffectType, AttackCondition
 from erdb.typing.effects import SchemaEffect
 
@@ -30,6 +31,31 @@ _SP_EFFECT_TO_STR: dict[SpEffectType, str] = {
     SpEffectType.BLIGHT: "death_blight",
 }
 
+"""
+Memoized parse results. The same SpEffects are referenced by every affinity and level
+of an armament, and by many armor pieces and talismans, so they are only parsed once
+per param scope. Cached values are tuples and must be treated as immutable.
+"""
+_CACHE = LoaderCache(maxsize=65536)
+
+_Scope = tuple[ParamFieldSource | None, int | None, int | None, int]
+
+def _scope(sp_effects: ParamDict) -> _Scope:
+    """
+    Identify the effect dictionary by its source param (which identifies the version)
+    and the loaded ID range, as ranged loads may resolve references differently.
+    """
+    first = next(iter(sp_effects.values()), None)
+    return (
+        None if first is None else first.source,
+        next(iter(sp_effects), None),
+        next(reversed(sp_effects), None),
+        len(sp_effects),
+    )
+
+def cache_stats() -> CacheStats:
+    return _CACHE.stats()
+
 def get_effects(sp_effect: ParamRow, sp_effect_type: SpEffectType, triggeree: ParamRow | None = None, init_conditions: list[str] | None = None) -> list[SchemaEffect]:
     effects = hardcoded_effects.get(sp_effect.index, sp_effect_type)
 
@@ -71,23 +97,38 @@ def get_status_effect(sp_effect: ParamRow) -> tuple[str, int]:
     etype = SpEffectType(sp_effect["stateInfo"])
     return _SP_EFFECT_TO_STR[etype], sp_effect[_SP_EFFECT_TO_FIELD[etype]].as_int
 
+def _get_effects_nested_cached(sp_effect: ParamRow, sp_effects: ParamDict, add_condition: AttackCondition | None, scope: _Scope) -> tuple[SchemaEffect, ...]:
+    def parse() -> tuple[SchemaEffect, ...]:
+        return tuple(get_effects_nested(sp_effect, sp_effects, add_condition))
+
+    return _CACHE.get(("nested", scope, sp_effect.index, add_condition), parse)
+
 def parse_effects(row: ParamRow, sp_effects: ParamDict, *effect_referencing_fields: str, add_condition: AttackCondition | None = None) -> list[dict]:
-    effects: list[SchemaEffect] = []
+    effect_ids = tuple(row[ref_field].as_int for ref_field in effect_referencing_fields)
+    scope = _scope(sp_effects)
 
-    for effect_id in (row[ref_field].as_int for ref_field in effect_referencing_fields):
-        if effect_id in hardcoded_effects.get_status_effect_ranges():
-            continue
+    def parse() -> tuple[SchemaEffect, ...]:
+        effects: list[SchemaEffect] = []
+
+        for effect_id in effect_ids:
+            if effect_id in hardcoded_effects.get_status_effect_ranges():
+                continue
 
-        if effect_id in sp_effects:
-            effects += get_effects_nested(sp_effects[effect_id], sp_effects, add_condition)
+            if effect_id in sp_effects:
+                effects += _get_effects_nested_cached(sp_effects[effect_id], sp_effects, add_condition, scope)
 
-    return [e.to_dict() for e in aggregate_effects(effects)]
+        return tuple(aggregate_effects(effects))
+
+    return [e.to_dict() for e in _CACHE.get(("aggregated", scope, effect_ids, add_condition), parse)]
 
 def parse_status_effects(effect_ids: list[int], sp_effects: ParamDict) -> StatusEffects:
-    # Getting 0th effect if value no found, bug with Antspur Rapier -- get anything to return a 0 status effect
-    effects = [sp_effects.get(i, sp_effects[0]) for i in effect_ids if i != -1]
-    status_effects = hardcoded_effects.get_status_effect_ranges()
-    return StatusEffects(**dict([get_status_effect(e) for e in effects if e.index in status_effects]))
+    def parse() -> tuple[tuple[str, int], ...]:
+        # Getting 0th effect if value no found, bug with Antspur Rapier -- get anything to return a 0 status effect
+        effects = [sp_effects.get(i, sp_effects[0]) for i in effect_ids if i != -1]
+        status_effects = hardcoded_effects.get_status_effect_ranges()
+        return tuple(get_status_effect(e) for e in effects if e.index in status_effects)
+
+    return StatusEffects(**dict(_CACHE.get(("status", _scope(sp_effects), tuple(effect_ids)), parse)))
 
 def parse_weapon_effects(weapon: ParamRow) -> list[dict]:
     effects: list[SchemaEffect] = []
@@ -1,3 +1,4 @@
+import os
 import importlib.resources
 from pathlib import Path
 
@@ -7,6 +8,21 @@ from erdb.typing.game_version import GameVersion
 TOP_LEVEL_PKG = __name__.split(".")[0]
 PKG_DATA_PATH = Path(str(importlib.resources.files(TOP_LEVEL_PKG))) / "data"
 GAME_VERSIONS = sorted(
-    [GameVersion.from_string(p.stem) for p in (PKG_DATA_PATH / "gamedata").glob("*zip")],
+    [GameVersion.from_string(p.stem) for p in (PKG_DATA_PATH / "gamedata" / "versions").glob("*.json")],
     reverse=True
-)
\ No newline at end of file
+)
+
+def cache_path() -> Path:
+    """
+    Directory for data derived from the gamedata, `ERDB_CACHE_DIR` if set, XDG cache otherwise.
+    """
+    if path := os.getenv("ERDB_CACHE_DIR"):
+        return Path(path)
+
+    return Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / TOP_LEVEL_PKG
+
+def set_cache_path(path: Path):
+    """
+    Override the cache directory for this process and any worker processes it spawns.
+    """
+    os.environ["ERDB_CACHE_DIR"] = str(path.resolve())
\ No newline at end of file
@@ -0,0 +1,67 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable, NamedTuple, TypeVar
+
+
+T = TypeVar("T")
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+
+    def __str__(self) -> str:
+        return f"{self.hits} hits, {self.misses} misses, {self.size}/{self.maxsize} entries"
+
+class LoaderCache:
+    """
+    Bounded LRU of loaded gamedata files, shared by every retriever in the process
+    so that a file is parsed once per version instead of once per table.
+    """
+    maxsize: int
+    hits: int
+    misses: int
+
+    _entries: OrderedDict[Hashable, Any]
+    _lock: Lock
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable, loader: Callable[[], T]) -> T:
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+            self.misses += 1
+
+        # loading is not locked, racing threads may both load the same file
+        value = loader()
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return value
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.hits, self.misses, len(self._entries), self.maxsize)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+# roughly all params, messages and shop lookups of two game versions
+LOADER_CACHE = LoaderCache(maxsize=96)
\ No newline at end of file
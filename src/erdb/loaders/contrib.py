@@ -1,10 +1,25 @@
+import os
 import json
+from bisect import bisect_right
 from pathlib import Path
+from typing import NamedTuple, Self
 
 from erdb.typing.game_version import GameVersion, GameVersionRange
 from erdb.loaders import PKG_DATA_PATH
 
 
+"""
+User contributed properties of elements, one file per element mapping version ranges
+to properties. Every file is parsed once per process: its version ranges split all
+versions into intervals, each holding the properties already overlaid for the
+versions within it, so that a lookup is a binary search. Files are re-parsed when
+their modification time or size changes, new and removed files are picked up as well.
+
+Returned properties are shared by every lookup and must not be mutated.
+"""
+
+_Version = tuple[int, ...]
+
 def _overlay_properties(ret: dict, source: dict):
     """
     Append to lists and sets, override scalars and dictionaries
@@ -17,22 +32,63 @@ def _overlay_properties(ret: dict, source: dict):
         else:
             ret[key] = value
 
-def _parse_user_file(path: Path, version: GameVersion) -> dict:
-    assert path.is_file
-    assert path.suffix == ".json"
+def _interval(version_range: GameVersionRange) -> tuple[_Version, _Version]:
+    begin = tuple(version_range.begin.nums)
+
+    # no version lies between (1, 2, 3) and (1, 2, 3, 0)
+    return begin, begin + (0,) if version_range.only else tuple(version_range.end.nums)
+
+class _UserFile(NamedTuple):
+    mtime_ns: int
+    size: int
+    boundaries: list[_Version]
+    properties: list[dict] # overlaid properties from a boundary until the next one
+
+    @classmethod
+    def parse(cls, path: Path, mtime_ns: int, size: int) -> Self:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        ranges = [(_interval(GameVersionRange.from_string(r)), properties) for r, properties in data.items()]
+        boundaries = sorted({bound for (begin, end), _ in ranges for bound in (begin, end)})
+
+        def overlay(version: _Version) -> dict:
+            ret = dict()
+
+            for (begin, end), properties in ranges:
+                if begin <= version < end:
+                    _overlay_properties(ret, properties)
+
+            return ret
+
+        return cls(mtime_ns, size, boundaries, [overlay(b) for b in boundaries])
+
+    def get(self, version: GameVersion) -> dict:
+        pos = bisect_right(self.boundaries, tuple(version.nums)) - 1
+        return self.properties[pos] if pos >= 0 else {}
+
+_FILES: dict[str, _UserFile] = {}
+
+def _user_files(element: str) -> dict[str, _UserFile]:
+    # called for every table and version, plain strings are much cheaper than Path objects
+    ret: dict[str, _UserFile] = {}
+
+    try:
+        entries = sorted(os.scandir(os.path.join(PKG_DATA_PATH, "contrib", element)), key=lambda e: e.name)
+    except (FileNotFoundError, NotADirectoryError):
+        return ret
 
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    for entry in entries:
+        stat = entry.stat()
+        user_file = _FILES.get(entry.path)
 
-    ret = dict()
+        if user_file is None or (user_file.mtime_ns, user_file.size) != (stat.st_mtime_ns, stat.st_size):
+            assert entry.name.endswith(".json")
+            user_file = _FILES[entry.path] = _UserFile.parse(Path(entry.path), stat.st_mtime_ns, stat.st_size)
 
-    for version_range, properties in data.items():
-        if version in GameVersionRange.from_string(version_range):
-            _overlay_properties(ret, properties)
+        ret[entry.name.removesuffix(".json")] = user_file
 
     return ret
 
 def load(element: str, version: GameVersion) -> dict[str, dict]:
-    path = PKG_DATA_PATH / "contrib" / element
-    files = path.iterdir() if path.is_dir() else []
-    return {f.stem: _parse_user_file(f, version) for f in files}
\ No newline at end of file
+    return {stem: user_file.get(version) for stem, user_file in _user_files(element).items()}
\ No newline at end of file
@@ -0,0 +1,341 @@
+import os
+import re
+import json
+import lzma
+from io import BufferedReader, RawIOBase, TextIOWrapper, BytesIO
+from difflib import SequenceMatcher
+from functools import cache, lru_cache
+from hashlib import sha256
+from pathlib import Path
+from typing import Iterable, Iterator
+from zipfile import ZipFile
+
+from erdb.loaders import PKG_DATA_PATH
+from erdb.typing.game_version import GameVersion
+
+
+"""
+Content-addressed storage of sourced gamedata, replacing one archive per version.
+
+Layout:
+    versions/<version>.json -- names of the files of a version, mapped to SHA-256 of their content
+    objects/<sha256>        -- LZMA-compressed content, stored once no matter how many versions share it
+
+The newest content of every file is stored whole, older contents are line-based deltas
+against the next newer content of the same file, so that the versions read most often
+are the cheapest to read and every patch only stores the lines it changed. Importing
+a version re-encodes the objects it supersedes, object names never change.
+
+Files can also be streamed: deltas are then applied line by line to the streamed
+base and decoded one operation at a time. Objects are compressed with a small
+dictionary, which is all the decompressor holds, so a stream takes about the same
+memory whatever the size of the file.
+"""
+
+_FULL = b"F"
+_DELTA = b"D"
+
+# the decompressor holds the whole dictionary, the default of preset 9 is 64 MiB
+_FILTERS = [{"id": lzma.FILTER_LZMA2, "preset": 9, "dict_size": 1 << 20}]
+
+# characters of inserted text per operation, so that streams never decode more at once
+_MAX_INSERT = 1 << 16
+
+_DELTA_HEAD = re.compile(r'\{\s*"base"\s*:\s*"(?P<base>[0-9a-f]+)"\s*,\s*"ops"\s*:\s*\[')
+_DELTA_SEPARATOR = re.compile(r"[\s,]*")
+
+_Delta = list[list[int] | str] # [begin, end) line ranges of the base or inserted text
+
+def _versions_path() -> Path:
+    return PKG_DATA_PATH / "gamedata" / "versions"
+
+def _objects_path() -> Path:
+    return PKG_DATA_PATH / "gamedata" / "objects"
+
+def versions() -> list[GameVersion]:
+    return sorted([GameVersion.from_string(p.stem) for p in _versions_path().glob("*.json")], reverse=True)
+
+@cache
+def _files(version: str) -> dict[str, str]:
+    path = _versions_path() / f"{version}.json"
+    assert path.exists(), f"No gamedata found for version {version}"
+
+    with open(path, mode="r", encoding="utf-8") as f:
+        return json.load(f)
+
+def files(version: GameVersion) -> dict[str, str]:
+    """
+    Every file of the version, mapped to the hash of its content.
+    """
+    return _files(str(version))
+
+def digest(version: GameVersion) -> str:
+    """
+    Fingerprint of the whole gamedata of the version.
+    """
+    return sha256(json.dumps(files(version), sort_keys=True).encode("utf-8")).hexdigest()
+
+def contains(version: GameVersion, filename: str) -> bool:
+    return filename in files(version)
+
+def _lines(data: bytes) -> list[str]:
+    return data.decode("utf-8").splitlines(keepends=True)
+
+def _pieces(lines: list[str]) -> Iterator[str]:
+    piece: list[str] = []
+    size = 0
+
+    for line in lines:
+        piece.append(line)
+        size += len(line)
+
+        if size >= _MAX_INSERT:
+            yield "".join(piece)
+            piece, size = [], 0
+
+    if len(piece) > 0:
+        yield "".join(piece)
+
+def _delta(base: bytes, data: bytes) -> _Delta:
+    base_lines, lines = _lines(base), _lines(data)
+    ops: _Delta = []
+
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, base_lines, lines, autojunk=False).get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.extend(_pieces(lines[j1:j2]))
+
+    return ops
+
+def _apply(base: bytes, ops: _Delta) -> bytes:
+    lines = _lines(base)
+    return "".join(op if isinstance(op, str) else "".join(lines[op[0]:op[1]]) for op in ops).encode("utf-8")
+
+@lru_cache(maxsize=16)
+def _object(digest: str) -> bytes:
+    # deltas of a file are read in a row when walking versions, recently used bases are kept
+    payload = lzma.decompress((_objects_path() / digest).read_bytes())
+
+    if payload[:1] == _FULL:
+        data = payload[1:]
+
+    else:
+        delta = json.loads(payload[1:])
+        data = _apply(_object(delta["base"]), delta["ops"])
+
+    assert sha256(data).hexdigest() == digest, f"Gamedata object {digest} is corrupted"
+    return data
+
+def read(version: GameVersion, filename: str) -> bytes:
+    assert contains(version, filename), f"No {filename} found in gamedata of version {version}"
+    return _object(files(version)[filename])
+
+def open_text(version: GameVersion, filename: str) -> TextIOWrapper:
+    """
+    Open the file for reading the same way as a text file in the filesystem.
+    """
+    return TextIOWrapper(BytesIO(read(version, filename)), encoding="utf-8", newline="")
+
+def _split(chunks: Iterable[str]) -> Iterator[str]:
+    # same lines as _lines() of the whole text, a line may continue in the next chunk
+    rest = ""
+
+    for chunk in chunks:
+        *lines, rest = (rest + chunk).splitlines(keepends=True) or [""]
+        yield from lines
+
+    if len(rest) > 0:
+        yield rest
+
+def _stream_ops(text: TextIOWrapper) -> tuple[str, Iterator[list[int] | str]]:
+    """
+    Base and operations of a delta, the operations decoded one at a time.
+    """
+    decoder = json.JSONDecoder()
+    buffer = text.read(1 << 16)
+
+    while (head := _DELTA_HEAD.match(buffer)) is None:
+        assert len(chunk := text.read(1 << 16)) > 0, "Invalid gamedata delta"
+        buffer += chunk
+
+    def ops(buffer: str, pos: int) -> Iterator[list[int] | str]:
+        while True:
+            pos = _DELTA_SEPARATOR.match(buffer, pos).end() # type: ignore
+
+            if buffer.startswith("]", pos):
+                return
+
+            try:
+                op, pos = decoder.raw_decode(buffer, pos)
+
+            except json.JSONDecodeError:
+                # an operation continues in the next chunk
+                assert len(chunk := text.read(1 << 16)) > 0, "Invalid gamedata delta"
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+
+            yield op
+
+    return head["base"], ops(buffer, head.end())
+
+def _stream_object(digest: str) -> Iterator[str]:
+    with lzma.open(_objects_path() / digest, mode="rb") as f:
+        kind = f.read(1)
+        text = TextIOWrapper(f, encoding="utf-8", newline="") # type: ignore
+
+        if kind == _FULL:
+            while len(chunk := text.read(1 << 16)) > 0:
+                yield chunk
+            return
+
+        base_digest, ops = _stream_ops(text)
+        base = _split(_stream_object(base_digest))
+        pos = 0
+
+        # line ranges of the base are in order, lines between them were replaced or deleted
+        for op in ops:
+            if isinstance(op, str):
+                yield op
+                continue
+
+            for _ in range(op[0] - pos):
+                next(base)
+
+            for _ in range(op[1] - op[0]):
+                yield next(base)
+
+            pos = op[1]
+
+def _verified(digest: str, chunks: Iterator[str]) -> Iterator[bytes]:
+    h = sha256()
+
+    for chunk in chunks:
+        data = chunk.encode("utf-8")
+        h.update(data)
+        yield data
+
+    assert h.hexdigest() == digest, f"Gamedata object {digest} is corrupted"
+
+class _ChunkReader(RawIOBase):
+    _chunks: Iterator[bytes]
+    _rest: bytes
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._rest = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while len(self._rest) == 0:
+            if (chunk := next(self._chunks, None)) is None:
+                return 0
+            self._rest = chunk
+
+        size = min(len(buffer), len(self._rest))
+        buffer[:size] = self._rest[:size]
+        self._rest = self._rest[size:]
+        return size
+
+def stream(version: GameVersion, filename: str) -> BufferedReader:
+    """
+    Open the (UTF-8) file for reading without holding its whole content, the content
+    hash is verified once it is read to the end.
+    """
+    assert contains(version, filename), f"No {filename} found in gamedata of version {version}"
+    digest = files(version)[filename]
+    return BufferedReader(_ChunkReader(_verified(digest, _stream_object(digest))))
+
+def stream_text(version: GameVersion, filename: str) -> TextIOWrapper:
+    """
+    Same as `open_text`, but without holding the whole content of the file.
+    """
+    return TextIOWrapper(stream(version, filename), encoding="utf-8", newline="")
+
+def _write_atomic(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_suffix(f".{os.getpid()}.tmp")
+    temp.write_bytes(data)
+    os.replace(temp, path)
+
+def _encoding(digest: str) -> str | None:
+    """
+    Hash of the base of a delta object, None if the object is stored whole.
+    """
+    payload = lzma.decompress((_objects_path() / digest).read_bytes())
+    return None if payload[:1] == _FULL else json.loads(payload[1:])["base"]
+
+def _store(digest: str, data: bytes, base: tuple[str, bytes] | None):
+    if base is not None:
+        try:
+            payload = _DELTA + json.dumps({"base": base[0], "ops": _delta(base[1], data)}, ensure_ascii=False).encode("utf-8")
+        except UnicodeDecodeError:
+            payload = _FULL + data
+    else:
+        payload = _FULL + data
+
+    _write_atomic(_objects_path() / digest, lzma.compress(payload, filters=_FILTERS))
+
+def _repack():
+    """
+    Store the newest content of every file whole and each older one as a delta against
+    the next newer content. Objects shared by different files are stored whole, so that
+    deltas never form a cycle.
+    """
+    chains: dict[str, list[str]] = {}
+    owners: dict[str, set[str]] = {}
+
+    for version in versions():
+        for filename, digest in files(version).items():
+            chain = chains.setdefault(filename, [])
+            if digest not in chain:
+                chain.append(digest)
+            owners.setdefault(digest, set()).add(filename)
+
+    for chain in chains.values():
+        desired = {
+            digest: None if i == 0 or len(owners[digest]) > 1 else chain[i - 1]
+            for i, digest in enumerate(chain)
+        }
+        outdated = [digest for digest, base in desired.items() if _encoding(digest) != base]
+
+        if len(outdated) == 0:
+            continue
+
+        # decode the whole chain before any of its objects is rewritten
+        contents = {digest: _object(digest) for digest in chain}
+
+        for digest in outdated:
+            base = desired[digest]
+            _store(digest, contents[digest], None if base is None else (base, contents[base]))
+
+    _object.cache_clear()
+
+def add_version(version: GameVersion, contents: dict[str, bytes]):
+    """
+    Add every file of a version, then re-encode the objects the version supersedes.
+    """
+    path = _versions_path() / f"{version}.json"
+    assert not path.exists(), f"Gamedata of version {version} already exists"
+
+    listing = {filename: sha256(data).hexdigest() for filename, data in sorted(contents.items())}
+
+    for filename, digest in listing.items():
+        if not (_objects_path() / digest).exists():
+            _store(digest, contents[filename], None)
+
+    _write_atomic(path, json.dumps(listing, indent=4).encode("utf-8"))
+    _files.cache_clear()
+
+    _repack()
+
+def import_archive(archive: Path, version: GameVersion):
+    """
+    Add a version from a zip archive of its files, the format gamedata used to be stored in.
+    """
+    with ZipFile(archive) as z:
+        contents = {info.filename: z.read(info) for info in z.infolist() if not info.is_dir()}
+
+    add_version(version, contents)
\ No newline at end of file
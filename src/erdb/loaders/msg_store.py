@@ -0,0 +1,190 @@
+import os
+import sys
+import mmap
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Container, Iterator, Mapping, Self
+from xml.etree.ElementTree import iterparse
+
+from erdb.loaders import gamedata, cache_path
+from erdb.typing.game_version import GameVersion
+
+
+"""
+Precompiled representation of a single FMG file from the gamedata store, in the
+same spirit as compiled params.
+
+Layout of a compiled file:
+    MAGIC | u32 entries | u32 texts | i64 IDs | u32 text of every entry | padding | u32 text offsets | UTF-8 blob
+
+IDs are sorted and unique. Every distinct text is stored once, entries sharing
+a text (ex. "no summary" or names of affinities) point to the same one.
+"""
+
+_MAGIC = b"ERDBMSG1"
+_ALIGN = 8
+
+def iterate_msgs(filename: str, version: GameVersion, id_min: int | None = None, id_max: int | None = None, ids: Container[int] | None = None) -> Iterator[tuple[int, str]]:
+    """
+    Parse the FMG file as a stream, yielding (ID, text) pairs in file order, optionally
+    restricted to an inclusive ID range and to the `ids`. Null entries do not exist.
+    """
+    with gamedata.stream(version, f"{filename}.fmg.xml") as f:
+        entries = None
+
+        for event, elem in iterparse(f, events=("start", "end")):
+            if event == "start":
+                if elem.tag == "entries":
+                    entries = elem
+                continue
+
+            if elem.tag != "text":
+                continue
+
+            index = int(str(elem.get("id")))
+
+            if elem.text != "%null%" and (id_min is None or index >= id_min) and (id_max is None or index <= id_max) and (ids is None or index in ids):
+                yield index, elem.text or ""
+
+            # parsed entries are dropped, otherwise the whole tree is kept in memory
+            if entries is not None:
+                entries.clear()
+
+def _align(buffer: bytearray):
+    buffer.extend(b"\0" * (-len(buffer) % _ALIGN))
+
+def _compile(msgs: Iterator[tuple[int, str]]) -> bytes:
+    # duplicate IDs resolve to the last entry, same as a dictionary
+    entries = dict(msgs)
+    ids = sorted(entries.keys())
+
+    texts: dict[str, int] = {}
+    text_ids = array("I", [texts.setdefault(entries[i], len(texts)) for i in ids])
+
+    encoded = [t.encode("utf-8") for t in texts.keys()]
+    offsets = array("I", [0])
+    for e in encoded:
+        offsets.append(offsets[-1] + len(e))
+
+    out = bytearray(_MAGIC + struct.pack("<II", len(ids), len(texts)))
+    out.extend(array("q", ids).tobytes())
+    out.extend(text_ids.tobytes())
+    _align(out)
+    out.extend(offsets.tobytes())
+
+    return bytes(out + b"".join(encoded))
+
+class MsgTable(Mapping[int, str]):
+    """
+    Read-only dictionary of the messages of a compiled FMG file, decoding texts
+    from the (usually memory-mapped) buffer only when they are looked up. Decoded
+    texts are interned, so equal texts of different entries or versions are a
+    single string. Tables restricted to an ID range share the buffer.
+    """
+    filename: str
+    version: GameVersion
+
+    _buffer: mmap.mmap | bytes
+    _ids: memoryview
+    _text_ids: memoryview
+    _offsets: memoryview
+    _blob: memoryview
+    _begin: int
+    _end: int
+    _texts: dict[int, str]
+
+    def __init__(self, filename: str, version: GameVersion, buffer: mmap.mmap | bytes) -> None:
+        self.filename = filename
+        self.version = version
+        self._buffer = buffer
+
+        view = memoryview(buffer)
+        assert bytes(view[:len(_MAGIC)]) == _MAGIC, f"Invalid compiled FMG file for {filename} {version}"
+
+        count, texts = struct.unpack_from("<II", view, len(_MAGIC))
+        start = len(_MAGIC) + 8
+
+        self._ids = view[start:start + count * 8].cast("q")
+        start += count * 8
+
+        self._text_ids = view[start:start + count * 4].cast("I")
+        start += count * 4
+        start += -start % _ALIGN
+
+        self._offsets = view[start:start + (texts + 1) * 4].cast("I")
+        self._blob = view[start + (texts + 1) * 4:]
+
+        self._begin = 0
+        self._end = count
+        self._texts = {}
+
+    def _find(self, index: int) -> int | None:
+        pos = bisect_left(self._ids, index, self._begin, self._end)
+        return pos if pos < self._end and self._ids[pos] == index else None
+
+    def _text(self, pos: int) -> str:
+        text_id = self._text_ids[pos]
+
+        if (text := self._texts.get(text_id)) is None:
+            text = self._texts[text_id] = sys.intern(str(self._blob[self._offsets[text_id]:self._offsets[text_id + 1]], "utf-8"))
+
+        return text
+
+    def __getitem__(self, index: int) -> str:
+        if not isinstance(index, int) or (pos := self._find(index)) is None:
+            raise KeyError(index)
+
+        return self._text(pos)
+
+    def __contains__(self, index: object) -> bool:
+        return isinstance(index, int) and self._find(index) is not None
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._ids[self._begin:self._end])
+
+    def __len__(self) -> int:
+        return self._end - self._begin
+
+    def range(self, id_min: int | None = None, id_max: int | None = None) -> Self:
+        """
+        Messages within the inclusive ID range, without copying any of them.
+        """
+        ret = object.__new__(type(self))
+        ret.__dict__.update(self.__dict__)
+
+        if id_min is not None:
+            ret._begin = bisect_left(self._ids, id_min, self._begin, self._end)
+
+        if id_max is not None:
+            ret._end = bisect_right(self._ids, id_max, ret._begin, self._end)
+
+        return ret
+
+    @classmethod
+    def compile(cls, filename: str, version: GameVersion) -> bytes:
+        return _compile(iterate_msgs(filename, version))
+
+    @classmethod
+    def open(cls, filename: str, version: GameVersion) -> Self:
+        """
+        Open the compiled FMG file, building it first if there is no up-to-date one
+        in the cache directory, the same way as compiled params.
+        """
+        digest = gamedata.files(version)[f"{filename}.fmg.xml"]
+        path = cache_path() / "msgs" / f"{filename}.{digest[:32]}.bin"
+
+        if not path.exists():
+            data = cls.compile(filename, version)
+
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                temp = path.with_suffix(f".{os.getpid()}.tmp")
+                temp.write_bytes(data)
+                os.replace(temp, path)
+
+            except OSError:
+                return cls(filename, version, data) # cache is not writable, serve from memory
+
+        with open(path, "rb") as f:
+            return cls(filename, version, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
\ No newline at end of file
@@ -0,0 +1,219 @@
+import os
+import json
+import mmap
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from csv import reader
+from typing import Iterator, NamedTuple, Self
+
+from erdb.loaders import gamedata, cache_path
+from erdb.typing.game_version import GameVersion
+from erdb.typing.params import ParamField
+
+
+"""
+Precompiled, columnar representation of a single param CSV from the gamedata store.
+
+Layout of a compiled file:
+    MAGIC | u32 header length | JSON header | padding | column sections
+
+Every column is either an integer column (array of int64) or a string column
+(array of uint32 offsets followed by an UTF-8 blob). A column is only stored as
+integers if every value survives a `str(int(value))` round trip, so reading it
+back yields exactly the same text as the CSV. Sections are 8-byte aligned which
+allows casting the memory-mapped file directly into typed views.
+"""
+
+_MAGIC = b"ERDBPRM1"
+_ALIGN = 8
+
+_INT = "i"
+_STR = "s"
+
+def _align(buffer: bytearray):
+    buffer.extend(b"\0" * (-len(buffer) % _ALIGN))
+
+def _is_canonical_int(value: str) -> bool:
+    try:
+        return str(num := int(value)) == value and -2**63 <= num < 2**63
+    except ValueError:
+        return False
+
+def _compile(fields: list[str], rows: list[list[str]]) -> bytes:
+    columns: list[tuple[str, bytes]] = []
+
+    for i in range(len(fields)):
+        values = [row[i] if i < len(row) else "" for row in rows]
+
+        if all(map(_is_canonical_int, values)):
+            columns.append((_INT, array("q", map(int, values)).tobytes()))
+
+        else:
+            encoded = [v.encode("utf-8") for v in values]
+            offsets = array("I", [0])
+            for e in encoded:
+                offsets.append(offsets[-1] + len(e))
+
+            section = bytearray(offsets.tobytes())
+            _align(section)
+            columns.append((_STR, bytes(section) + b"".join(encoded)))
+
+    body = bytearray()
+    sections = []
+
+    for kind, data in columns:
+        sections.append([kind, len(body), len(data)])
+        body.extend(data)
+        _align(body)
+
+    header = json.dumps({"fields": fields, "rows": len(rows), "sections": sections}).encode("utf-8")
+    out = bytearray(_MAGIC + struct.pack("<I", len(header)) + header)
+    _align(out)
+
+    return bytes(out + body)
+
+class _Column(NamedTuple):
+    kind: str
+    values: memoryview # int64 values or uint32 offsets
+    blob: memoryview | None = None
+
+    def get(self, pos: int) -> str:
+        if self.blob is None:
+            return str(self.values[pos])
+
+        return str(self.blob[self.values[pos]:self.values[pos + 1]], "utf-8")
+
+    def get_int(self, pos: int) -> int:
+        return self.values[pos] if self.blob is None else int(self.get(pos))
+
+class ParamTable:
+    """
+    Read-only view over a compiled param, retrieving values straight from the
+    (usually memory-mapped) buffer without materializing any rows. Acts as the
+    field source of every ParamRow loaded from it.
+    """
+    param: str
+    version: GameVersion
+    fields: list[str]
+    columns: dict[str, _Column]
+    ids: memoryview | list[int]
+    ids_sorted: bool
+
+    _buffer: mmap.mmap | bytes
+    _int_fields: dict[int, ParamField]
+    _str_fields: dict[str, ParamField]
+
+    def __init__(self, param: str, version: GameVersion, buffer: mmap.mmap | bytes) -> None:
+        self.param = param
+        self.version = version
+        self._buffer = buffer
+        self._int_fields = {}
+        self._str_fields = {}
+
+        view = memoryview(buffer)
+        assert bytes(view[:len(_MAGIC)]) == _MAGIC, f"Invalid compiled param file for {param} {version}"
+
+        header_len, = struct.unpack_from("<I", view, len(_MAGIC))
+        header_start = len(_MAGIC) + 4
+        header = json.loads(bytes(view[header_start:header_start + header_len]))
+
+        body_start = header_start + header_len
+        body_start += -body_start % _ALIGN
+
+        rows: int = header["rows"]
+        self.fields = header["fields"]
+        self.columns = {}
+
+        for field, (kind, offset, size) in zip(self.fields, header["sections"]):
+            section = view[body_start + offset:body_start + offset + size]
+
+            if kind == _INT:
+                self.columns[field] = _Column(kind, section.cast("q"))
+
+            else:
+                offsets_size = (rows + 1) * 4
+                blob_start = offsets_size + (-offsets_size % _ALIGN)
+                self.columns[field] = _Column(kind, section[:offsets_size].cast("I"), section[blob_start:])
+
+        row_ids = self.columns["Row ID"]
+        self.ids = row_ids.values if row_ids.blob is None else [row_ids.get_int(i) for i in range(rows)]
+        self.ids_sorted = all(a <= b for a, b in zip(self.ids, self.ids[1:]))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, field: object) -> bool:
+        return field in self.columns
+
+    def positions(self, id_min: int | None = None, id_max: int | None = None) -> Iterator[int]:
+        """
+        Row positions in file order, optionally restricted to an inclusive ID range.
+        Sorted params are sliced with a binary search instead of a full scan.
+        """
+        if id_min is None and id_max is None:
+            yield from range(len(self.ids))
+            return
+
+        lo = -2**63 if id_min is None else id_min
+        hi = 2**63 - 1 if id_max is None else id_max
+
+        if self.ids_sorted:
+            yield from range(bisect_left(self.ids, lo), bisect_right(self.ids, hi))
+
+        else:
+            yield from (pos for pos, index in enumerate(self.ids) if lo <= index <= hi)
+
+    def value(self, field: str, pos: int) -> str:
+        return self.columns[field].get(pos)
+
+    def field(self, field: str, pos: int) -> ParamField:
+        """
+        Retrieve the value as a ParamField instance shared by every cell holding
+        the same value, so its typed conversions are computed only once.
+        """
+        column = self.columns[field]
+
+        if column.blob is None:
+            value = column.values[pos]
+            if (ret := self._int_fields.get(value)) is None:
+                ret = self._int_fields[value] = ParamField.from_int(value)
+            return ret
+
+        text = column.get(pos)
+        if (ret := self._str_fields.get(text)) is None:
+            ret = self._str_fields[text] = ParamField(text)
+        return ret
+
+    @classmethod
+    def compile(cls, param: str, version: GameVersion) -> bytes:
+        with gamedata.open_text(version, f"{param}.csv") as f:
+            fields, *rows = reader(f, delimiter=";")
+
+        return _compile(fields, rows)
+
+    @classmethod
+    def open(cls, param: str, version: GameVersion) -> Self:
+        """
+        Open the compiled param, building it first if there is no up-to-date one
+        in the cache directory. The hash of the CSV content identifies the compiled
+        file, so re-sourced gamedata is picked up and versions which did not change
+        the param share one compiled file.
+        """
+        digest = gamedata.files(version)[f"{param}.csv"]
+        path = cache_path() / "params" / f"{param}.{digest[:32]}.bin"
+
+        if not path.exists():
+            data = cls.compile(param, version)
+
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                temp = path.with_suffix(f".{os.getpid()}.tmp")
+                temp.write_bytes(data)
+                os.replace(temp, path)
+
+            except OSError:
+                return cls(param, version, data) # cache is not writable, serve from memory
+
+        with open(path, "rb") as f:
+            return cls(param, version, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
\ No newline at end of file
@@ -1,30 +1,32 @@
-from typing import Iterator
-import xml.etree.ElementTree as xmltree
-from csv import DictReader
-from zipfile import Path as ZipPath
-
-from erdb.loaders import PKG_DATA_PATH
+from erdb.loaders import gamedata
+from erdb.loaders.param_store import ParamTable
+from erdb.loaders.msg_store import MsgTable
+from erdb.loaders.cache import LOADER_CACHE
 from erdb.typing.game_version import GameVersion
 from erdb.typing.params import ParamRow, ParamDict
 from erdb.typing.enums import ItemIDFlag
 
 
-def _load(param: str, version: GameVersion) -> Iterator[dict[str, str]]:
-    archive = PKG_DATA_PATH / "gamedata" / f"{version}.zip"
-    with ZipPath(archive, at=f"{param}.csv").open(mode="r") as f:
-        yield from DictReader(f, delimiter=";") # type: ignore
+def load_table(param: str, version: GameVersion) -> ParamTable:
+    # full and ID-range loads of the same param share one opened table
+    return LOADER_CACHE.get(("table", param, str(version)), lambda: ParamTable.open(param, version))
+
+def _load_table(param: str, version: GameVersion, item_id_flag: ItemIDFlag, id_min: int | None = None, id_max: int | None = None) -> ParamDict:
+    table = load_table(param, version)
+    names = table.columns["Row Name"]
+    return {
+        table.ids[pos]: ParamRow(table.ids[pos], item_id_flag, names.get(pos), table, pos)
+        for pos in table.positions(id_min, id_max)
+    }
 
 def load(param: str, version: GameVersion, item_id_flag: ItemIDFlag) -> ParamDict:
-    return {int(row["Row ID"]): ParamRow.make(row, item_id_flag) for row in _load(param, version)}
+    return _load_table(param, version, item_id_flag)
 
 # optimal variant for params with a lot of IDs like spEffects
 def load_ids(param: str, version: GameVersion, item_id_flag: ItemIDFlag, id_min: int, id_max: int = 999999999) -> ParamDict:
-    return {int(row["Row ID"]): ParamRow.make(row, item_id_flag) for row in _load(param, version) if id_min <= int(row["Row ID"]) <= id_max}
-
-def load_msg(filename: str, version: GameVersion) -> dict[int, str]:
-    archive = PKG_DATA_PATH / "gamedata" / f"{version}.zip"
-    with ZipPath(archive, at=f"{filename}.fmg.xml").open(mode="r", encoding="utf-8") as f:
-        tree = xmltree.fromstring(f.read())
-        entries = tree.findall(".//text")
+    return _load_table(param, version, item_id_flag, id_min, id_max)
 
-    return {int(str(e.get("id"))): str(e.text) for e in entries if e.text != "%null%"}
\ No newline at end of file
+def load_msg(filename: str, version: GameVersion, id_min: int | None = None, id_max: int | None = None) -> MsgTable:
+    # full and ID-range loads of the same file share one opened table
+    table = LOADER_CACHE.get(("msg_table", filename, str(version)), lambda: MsgTable.open(filename, version))
+    return table if id_min is None and id_max is None else table.range(id_min, id_max)
\ No newline at end of file
@@ -1,17 +1,30 @@
-import json
+from sys import stdout, stderr
+from contextlib import redirect_stdout
+from time import perf_counter
 from pathlib import Path
 from typing import Sequence
 
 from erdb.main.args import parse_args
 from erdb.table import Table
-from erdb.loaders import GAME_VERSIONS
+from erdb.loaders import GAME_VERSIONS, set_cache_path
+from erdb.loaders.gamedata import import_archive as import_gamedata
+from erdb.loaders.cache import LOADER_CACHE
+from erdb.effect_parser import cache_stats as effects_cache_stats
 from erdb.app_api.main import serve as serve_app_api
 from erdb.app_wiki import generate as generate_app_wiki
 from erdb.utils.attack_power import Attributes, CalculatorData, ArmamentCalculator
-from erdb.utils.changelog import generate as generate_changelog
+from erdb.utils.armament_ranking import ArmamentRanking
+from erdb.utils.attack_power_batch import BatchCalculator
+from erdb.utils.changelog import generate as generate_changelog, generate_matrix as generate_changelog_matrix
 from erdb.utils.find_valid_values import find_valid_values
+from erdb.utils.param_diff import diff_rows, write_jsonl, write_markdown
+from erdb.utils.generation import generate_tables
+from erdb.utils.search import SearchIndex
 from erdb.utils.sourcer import source_gamedata, source_map, source_icons
-from erdb.utils.common import Destination, pydantic_encoder_no_nulls
+from erdb.utils.stat_optimizer import StartingClass, optimize_attributes, parse_weights
+from erdb.utils.common import Destination
+from erdb.typing.categories import ArmamentCategory
+from erdb.typing.enums import ArmamentUpgradeMaterial
 from erdb.typing.game_version import GameVersion, GameVersionRange
 
 
@@ -23,8 +36,14 @@ class App:
             "generate": self.generate,
             "find-values": self.find_values,
             "calculate-ar": self.calculate_ar,
+            "optimize-ar": self.optimize_ar,
+            "rank-armaments": self.rank_armaments,
+            "search": self.search,
             "changelog": self.changelog,
+            "changelog-matrix": self.changelog_matrix,
+            "diff-params": self.diff_params,
             "source": self.source,
+            "import-gamedata": self.import_gamedata,
             "map": self.source_map,
             "icons": self.source_icons,
             "serve-api": self.serve_api,
@@ -36,31 +55,30 @@ class App:
         return handler(**self.args)
 
     @staticmethod
-    def generate(tables: list[Table], gamedata: GameVersionRange, minimize: bool, out: Path | None) -> int:
-        if out is None:
-            out = Path.cwd()
+    def generate(tables: list[Table], gamedata: GameVersionRange, minimize: bool, out: Path | None, format: str, jobs: int, cache_dir: Path | None) -> int:
+        if cache_dir is not None:
+            set_cache_path(cache_dir)
+
+        if out == Path("-"):
+            assert jobs <= 1, "Cannot write to stdout using multiple jobs"
+            assert format in ["json", "msgpack"], f"Cannot write {format} to stdout"
+            destination = stdout
         else:
-            out = out.resolve()
-
-        for version in gamedata.iterate(GAME_VERSIONS):
-            destination = out / str(version)
-            destination.mkdir(parents=True, exist_ok=True)
-
-            for tb, gen in ((tb, tb.make_generator(version)) for tb in tables):
-                print(f"\n>>> Generating \"{tb}\" from version {version}", flush=True)
-
-                output_file = destination / f"{tb}.json"
-                print(f"Output file: {output_file}", flush=True)
+            destination = Path.cwd() if out is None else out.resolve()
 
-                if output_file.exists():
-                    print(f"Output file exists and will be overridden", flush=True)
+        # data is the only output of stdout when streaming, progress goes to stderr
+        with redirect_stdout(stderr if destination is stdout else stdout):
+            start = perf_counter()
+            versions = list(gamedata.iterate(GAME_VERSIONS))
+            timings = generate_tables(tables, versions, destination, minimize, jobs, format)
 
-                data = gen.generate()
-                print(f"Generated {len(data)} elements", flush=True)
+            print(f"\n>>> Generated {len(timings)} tables in {perf_counter() - start:.2f}s", flush=True)
+            for timing in timings:
+                print(timing, flush=True)
 
-                with open(output_file, mode="w", encoding="utf-8") as f:
-                    kwargs = {"separators": (",", ":")} if minimize else {"indent": 4}
-                    json.dump(data, f, ensure_ascii=False, default=pydantic_encoder_no_nulls, allow_nan=False, **kwargs)
+            if jobs <= 1:
+                print(f"\nLoader cache: {LOADER_CACHE.stats()}", flush=True)
+                print(f"Effect cache: {effects_cache_stats()}", flush=True)
 
         return 0
 
@@ -74,18 +92,9 @@ class App:
 
     @staticmethod
     def calculate_ar(attribs: str, armament: str, affinity: str, level: int, data_path: Path) -> int:
-        def load_data_file(name: str):
-            with open(data_path / name) as f:
-                return json.load(f)
-
         print(f"\n>>> Calculating AR for {affinity} {armament} +{level} at {attribs}")
 
-        armaments = load_data_file("armaments.json")
-        reinforcements = load_data_file("reinforcements.json")
-        correction_attack = load_data_file("correction-attack.json")
-        correction_graph = load_data_file("correction-graph.json")
-
-        data = CalculatorData(armaments, reinforcements, correction_attack, correction_graph)
+        data = CalculatorData.create(data_path)
         calc = ArmamentCalculator(data, armament, affinity, level)
         attr = Attributes.from_string(attribs)
 
@@ -98,7 +107,76 @@ class App:
         return 0
 
     @staticmethod
-    def changelog(version: GameVersion, from_version: GameVersion | None, formatter: str, out: Path | None) -> int:
+    def optimize_ar(armament: str, affinity: str, level: int, starting_class: StartingClass | None, base: str | None, rune_level: int | None, points: int | None, weights: str | None, data_path: Path) -> int:
+        assert (starting_class is None) != (base is None), "Provide either a starting class or base attributes"
+        assert (rune_level is None) != (points is None), "Provide either a rune level or a number of points"
+        assert rune_level is None or starting_class is not None, "Rune level can only be used with a starting class"
+
+        base_attributes = starting_class.attributes if starting_class is not None else Attributes.from_string(base) # type: ignore
+        points = rune_level - starting_class.level if rune_level is not None else points # type: ignore
+
+        print(f"\n>>> Optimizing attributes for {affinity} {armament} +{level} with {points} points on top of {base_attributes}")
+
+        data = CalculatorData.create(data_path)
+        calc = ArmamentCalculator(data, armament, affinity, level)
+        batch = BatchCalculator(data)
+
+        allocation = optimize_attributes(batch, batch.index(armament, affinity), level, base_attributes, points, None if weights is None else parse_weights(weights))
+        print(f"attributes: {allocation.attributes} ({allocation.points} points spent)")
+
+        for attack_type, value in calc.attack_power(allocation.attributes).items():
+            print(f"{attack_type}: {value.base} +{value.scaling} ({value.total})")
+
+        for effect_type, value in calc.status_effects(allocation.attributes).items():
+            print(f"{effect_type}: {value.base} +{value.scaling} ({value.total})")
+
+        return 0
+
+    @staticmethod
+    def rank_armaments(attributes: str, two_handed: bool, level: int | None, category: list[ArmamentCategory], upgrade_material: ArmamentUpgradeMaterial | None, requirements_met: bool, sort_by: str, limit: int, data_path: Path) -> int:
+        attribs = Attributes.from_string(attributes)
+        ranking = ArmamentRanking(CalculatorData.create(data_path))
+
+        print(f"\n>>> Ranking armaments by {sort_by} for {attribs}{' (two-handed)' if two_handed else ''}")
+
+        ranked = ranking.rank(
+            attribs,
+            two_handed=bool(two_handed),
+            level=level,
+            categories=[c.value for c in category] if len(category) > 0 else None,
+            upgrade_material=None if upgrade_material is None else upgrade_material.value,
+            requirements_met=requirements_met,
+            sort_by=sort_by,
+            limit=limit,
+        )
+
+        for pos, armament in enumerate(ranked, start=1):
+            attack_power = ", ".join(f"{t}: {v}" for t, v in armament.attack_power.items() if v > 0)
+            status_effects = ", ".join(f"{e}: {v}" for e, v in armament.status_effects.items() if v > 0)
+            print(f"{pos}. {armament.affinity} {armament.name} +{armament.level}: {armament.total} ({attack_power}){f' [{status_effects}]' if status_effects else ''}")
+
+        return 0
+
+    @staticmethod
+    def search(query: list[str], version: GameVersion | None, table: list[Table], limit: int, cache_dir: Path | None) -> int:
+        if cache_dir is not None:
+            set_cache_path(cache_dir)
+
+        version = GAME_VERSIONS[0] if version is None else version
+        assert version in GAME_VERSIONS, f"No {version} version found"
+
+        index = SearchIndex.load(version)
+        results = index.search(" ".join(query), limit, table if len(table) > 0 else None)
+
+        print(f"\n>>> Found {len(results)} items matching \"{' '.join(query)}\" in {version}")
+
+        for pos, result in enumerate(results, start=1):
+            print(f"{pos}. [{result.table}] {result.name} ({result.key}): {result.score}")
+
+        return 0
+
+    @staticmethod
+    def changelog(version: GameVersion, from_version: GameVersion | None, formatter: str, incremental: bool, out: Path | None) -> int:
         assert version in GAME_VERSIONS, f"No {version} version found"
         assert from_version is None or from_version in GAME_VERSIONS, f"No {from_version} version found"
 
@@ -111,7 +189,55 @@ class App:
 
             from_version = GAME_VERSIONS[prev_id]
 
-        generate_changelog(from_version, version, out, formatter)
+        generate_changelog(from_version, version, out, formatter, incremental)
+        return 0
+
+    @staticmethod
+    def changelog_matrix(gamedata: GameVersionRange, formatter: str, incremental: bool, out: Path | None, jobs: int, cache_dir: Path | None) -> int:
+        if cache_dir is not None:
+            set_cache_path(cache_dir)
+
+        out = Path.cwd() if out is None else out.resolve()
+        versions = list(gamedata.iterate(GAME_VERSIONS))
+        assert len(versions) > 1, f"At least two versions are required, found {len(versions)} in the range"
+
+        start = perf_counter()
+        files = generate_changelog_matrix(versions, out, formatter, incremental, jobs)
+
+        print(f"\n>>> Generated {len(files)} changelogs in {perf_counter() - start:.2f}s", flush=True)
+        for f in files:
+            print(f, flush=True)
+
+        return 0
+
+    @staticmethod
+    def diff_params(name: str, version: GameVersion, from_version: GameVersion | None, id_min: int | None, id_max: int | None, fields: list[str] | None, exclude_fields: list[str] | None, formatter: str, out: Path | None) -> int:
+        assert version in GAME_VERSIONS, f"No {version} version found"
+        assert from_version is None or from_version in GAME_VERSIONS, f"No {from_version} version found"
+
+        if from_version is None:
+            prev_id = GAME_VERSIONS.index(version) + 1
+            assert prev_id < len(GAME_VERSIONS), f"No version found before {version}"
+
+            from_version = GAME_VERSIONS[prev_id]
+
+        changes = diff_rows(name, from_version, version, id_min=id_min, id_max=id_max, fields=fields, exclude_fields=exclude_fields)
+
+        def write(f) -> int:
+            if formatter == "markdown":
+                return write_markdown(changes, f, name, from_version, version)
+
+            return write_jsonl(changes, f)
+
+        if out is None:
+            write(stdout)
+
+        else:
+            with open(out.resolve(), mode="w", encoding="utf-8") as f:
+                count = write(f)
+
+            print(f"Written {count} changed rows of {name} from {from_version} to {version} to {out}", flush=True)
+
         return 0
 
     @staticmethod
@@ -129,6 +255,24 @@ class App:
 
         return 0
 
+    @staticmethod
+    def import_gamedata(archive: Path, version: GameVersion | None) -> int:
+        archive = archive.resolve()
+
+        if version is None:
+            version = GameVersion.from_string(archive.stem)
+
+        print(f"\n>>> Importing gamedata of version {version} from \"{archive}\".")
+
+        try:
+            import_gamedata(archive, version)
+
+        except AssertionError as e:
+            print("Importing gamedata failed:", *e.args)
+            return 1
+
+        return 0
+
     @staticmethod
     def source_map(lod: int, underground: bool, game_dir: Path, ignore_checksum: bool, keep_cache: bool, out: Path | None) -> int:
         game_dir = game_dir.resolve()
@@ -166,8 +310,11 @@ class App:
         return 0
 
     @staticmethod
-    def serve_api(port: int, bind: str, precache: bool) -> int:
-        serve_app_api(port, bind=bind, precache=precache)
+    def serve_api(port: int, bind: str, precache: bool, jobs: int, cache_dir: Path | None) -> int:
+        if cache_dir is not None:
+            set_cache_path(cache_dir)
+
+        serve_app_api(port, bind=bind, precache=precache, jobs=jobs)
         return 0
 
     @staticmethod
@@ -7,7 +7,14 @@ from textwrap import wrap, dedent
 from erdb.table import Table
 from erdb.loaders import GAME_VERSIONS
 from erdb.utils.changelog import FormatterBase
+from erdb.utils.param_diff import OUTPUT_FORMATS
+from erdb.utils.table_formats import OUTPUT_FORMATS as TABLE_FORMATS
 from erdb.utils.common import Destination
+from erdb.utils.armament_ranking import SORT_KEYS
+from erdb.utils.search import SEARCHABLE_TABLES
+from erdb.utils.stat_optimizer import StartingClass
+from erdb.typing.categories import ArmamentCategory
+from erdb.typing.enums import ArmamentUpgradeMaterial
 from erdb.typing.game_version import GameVersion, GameVersionRange
 
 
@@ -98,6 +105,12 @@ class _Argument(NamedTuple):
             cls.make("--data-path", type=Path, required=True, help="Location of the ERDB-generated data."),
         ]
 
+    @classmethod
+    def uses_cache(cls) -> list[Self]:
+        return [
+            cls.make("--cache-dir", type=Path, default=None, help="Directory for compiled params and generated tables, defaults to $ERDB_CACHE_DIR or the XDG cache directory."),
+        ]
+
     @classmethod
     def parses_gamedata(cls) -> list[Self]:
         default = GameVersionRange.from_version(GAME_VERSIONS[0]) if len(GAME_VERSIONS) > 0 else None
@@ -147,7 +160,12 @@ class Generate(_Subcommand):
     details = """\
     Parse extracted gamedata into a well-structured JSON output.
     The resulting data will be written to `{table}.json` files in a folder named after the `--out` argument, or cwd if not provided.
+    With `--out -` every table is written to stdout instead, one JSON document after another, and progress is reported to stderr.
+    Other formats load faster than JSON: `msgpack` writes `{table}.msgpack` files of the same structure, `parquet` writes `{table}.parquet`
+    files of one row per item with nested values flattened into columns, and `sqlite` writes all tables of a version into one indexed `erdb.sqlite` database.
+    Tables are written item by item as they are generated or read from the cache, without holding a whole table in memory.
     This is a manual way of generating data, many other subcommands do this automatically.
+    Generated tables are kept in the cache directory and reused until the gamedata, contributions or ERDB itself change.
     """
 
     aliases = ["gen"]
@@ -165,11 +183,26 @@ class Generate(_Subcommand):
             "Generate all data for all versions from 1.06.0 (including), minimize the JSON output",
             "erdb gen all --gamedata until 1.06.0 --minimize",
         ),
+        (
+            "Generate all data for every version using 8 worker processes",
+            "erdb gen all --gamedata any version --jobs 8",
+        ),
+        (
+            "Stream minimized Armament data of the latest version to another program",
+            "erdb gen armaments --minimize --out - | jq length",
+        ),
+        (
+            "Generate all data for the latest version into a SQLite database",
+            "erdb gen all --format sqlite --out data",
+        ),
     ]
 
     arguments = [
         _Argument.make("tables", type=Table, default=[], choices=list(Table), nargs="+", action=_TablesAction, help="Specify any or all tables.")
-    ] + _Argument.parses_gamedata() + _Argument.outputs_json()
+    ] + _Argument.parses_gamedata() + _Argument.outputs_json() + [
+        _Argument.make("--format", "-f", type=str, default=TABLE_FORMATS[0], choices=TABLE_FORMATS, help="Format to output the tables in, `msgpack` and `parquet` require optional dependencies (default json)."),
+        _Argument.make("--jobs", "-j", type=int, default=1, metavar="N", help="Number of worker processes, tables sharing params are generated by the same worker (default 1)."),
+    ] + _Argument.uses_cache()
 
 class FindValues(_Subcommand):
     command = "find-values"
@@ -229,12 +262,110 @@ class CalculateAR(_Subcommand):
         _Argument.make("level", type=int, help="Upgrade level of the armament."),
     ] + _Argument.parses_generated_data()
 
+class OptimizeAR(_Subcommand):
+    command = "optimize-ar"
+    summary = "Find attributes maximizing attack power of an armament"
+    details = """\
+    Distribute attribute points to maximize attack power of an armament of any affinity or level combination using the generated data.
+    Start from either a starting class or explicit base attributes, and spend either a number of points or, given a starting class, all points up to a rune level.
+    Attack types and status effects can be weighted with `--weights`, by default attack power of all types is weighted equally and status effects are ignored.
+    Provide the path to the data output directory from `erdb generate` via `--data-path`.
+    """
+
+    aliases = ["opt"]
+
+    examples = [
+        (
+            "Find the best attributes for Heavy Claymore +25 for a Samurai at rune level 150",
+            "erdb opt Claymore Heavy 25 --starting-class samurai --rune-level 150 --data-path ./1.10.0",
+        ),
+        (
+            "Spend 60 points on top of 20 in every attribute for Blood Uchigatana +25, counting bleed buildup as much as attack power",
+            "erdb opt Uchigatana Blood 25 --base 20,20,20,20,20 --points 60 --weights physical=1,bleed=1 --data-path ./1.10.0",
+        ),
+    ]
+
+    arguments = [
+        _Argument.make("armament", type=str, help="Name of the armament."),
+        _Argument.make("affinity", type=str, help="Affinity of the armament."),
+        _Argument.make("level", type=int, help="Upgrade level of the armament."),
+        _Argument.make("--starting-class", "-c", type=StartingClass, default=None, choices=list(StartingClass), help="Starting class providing base attributes."),
+        _Argument.make("--base", "-b", type=str, default=None, help="Base attributes in format \"str,dex,int,fth,arc\", instead of a starting class."),
+        _Argument.make("--rune-level", "-r", type=int, default=None, help="Target rune level, requires a starting class."),
+        _Argument.make("--points", "-p", type=int, default=None, help="Number of attribute points to distribute, instead of a rune level."),
+        _Argument.make("--weights", "-w", type=str, default=None, help="Weights in format \"{type}={weight},...\" of attack types and status effects to maximize."),
+    ] + _Argument.parses_generated_data()
+
+class RankArmaments(_Subcommand):
+    command = "rank-armaments"
+    summary = "Rank armaments by attack power for given attributes"
+    details = """\
+    Evaluate every armament of every affinity for the given attributes using the generated data and list the best ones.
+    Armaments are ranked by total attack power unless `--sort-by` specifies an attack type or a status effect.
+    Armaments are at their maximum level unless `--level` is specified, which is converted for somber armaments.
+    Provide the path to the data output directory from `erdb generate` via `--data-path`.
+    """
+
+    aliases = ["rank"]
+
+    examples = [
+        (
+            "List 10 best armaments for 40 strength and 30 dexterity, wielded with both hands",
+            "erdb rank 40,30,10,10,10 --two-handed --data-path ./1.10.0",
+        ),
+        (
+            "List 5 katanas with the highest bleed buildup at +10 (+4 for somber armaments)",
+            "erdb rank 12,40,9,8,30 --category Katana --sort-by bleed --level 10 --limit 5 --data-path ./1.10.0",
+        ),
+    ]
+
+    arguments = [
+        _Argument.make("attributes", type=str, help="Player attributes in format \"str,dex,int,fth,arc\"."),
+        _Argument.make("--two-handed", action=BooleanOptionalAction, help="Wield armaments with both hands, multiplying strength by 1.5."),
+        _Argument.make("--level", "-l", type=int, default=None, help="Upgrade level, converted for somber armaments. Maximum level of each armament if not specified."),
+        _Argument.make("--category", "-c", type=ArmamentCategory, default=[], nargs="+", help="Only rank armaments of these categories."),
+        _Argument.make("--upgrade-material", "-u", type=ArmamentUpgradeMaterial, default=None, help="Only rank armaments upgraded with this material."),
+        _Argument.make("--requirements-met", action=BooleanOptionalAction, default=True, help="Only rank armaments whose requirements are met."),
+        _Argument.make("--sort-by", "-s", type=str, default="total", choices=SORT_KEYS, help="Total attack power, an attack type or a status effect."),
+        _Argument.make("--limit", "-n", type=int, default=10, help="Number of armaments to list."),
+    ] + _Argument.parses_generated_data()
+
+class Search(_Subcommand):
+    command = "search"
+    summary = "Search items of every table by name or description"
+    details = """\
+    Find items whose names, summaries and descriptions contain all words of the query, ignoring case and accents.
+    Words of the query also match longer words beginning with them, though whole words rank higher, as do words found in names.
+    The search index is built once per version and stored alongside generated tables in the cache directory.
+    """
+
+    aliases = ["find"]
+
+    examples = [
+        (
+            "Find items mentioning Godrick in the latest version",
+            "erdb search godrick",
+        ),
+        (
+            "List 5 armaments and spells dealing frost damage",
+            "erdb search frost dam --table armaments spells --limit 5",
+        ),
+    ]
+
+    arguments = [
+        _Argument.make("query", type=str, annotation=list[str], nargs="+", help="Words to search for."),
+        _Argument.make("--version", "-v", type=GameVersion.from_string, annotation=GameVersion | None, default=None, help="Version to search, latest if not specified."),
+        _Argument.make("--table", "-t", type=Table, default=[], nargs="+", choices=SEARCHABLE_TABLES, help="Only search items of these tables."),
+        _Argument.make("--limit", "-n", type=int, default=20, help="Number of items to list."),
+    ] + _Argument.uses_cache()
+
 class Changelog(_Subcommand):
     command = "changelog"
     summary = "Create a changelog of ERDB-detectable differences between specified versions."
     details = """\
     Compare two generated data and create a human-readable list of updates.
     ERDB automatically finds the previous version from the one requested, but that can be overridden with an optional `--from-version` argument.
+    Only items whose params or messages changed between the versions are generated and compared, unless `--no-incremental` is provided.
     Different formatters are available, using which the output will be written to stdout, or a specific file if `--out` is provided.
     """
 
@@ -255,8 +386,76 @@ class Changelog(_Subcommand):
         _Argument.make("version", type=GameVersion.from_string, annotation=GameVersion, help="Version to generate the changelog of."),
         _Argument.make("--from-version", type=GameVersion.from_string, annotation=GameVersion | None, default=None, help="Optional starting version of the changelog, previous if not specified."),
         _Argument.make("--formatter", "-f", type=str, default=FormatterBase.identifiers()[0], choices=FormatterBase.identifiers(), help="Format to output the changelog in."),
+        _Argument.make("--incremental", action=BooleanOptionalAction, default=True, help="Only generate and compare items whose gamedata changed, enabled by default."),
+    ] + _Argument.outputs_file()
+
+class DiffParams(_Subcommand):
+    command = "diff-params"
+    summary = "Compare rows of a raw param or FMG file between specified versions."
+    details = """\
+    List rows added, removed or changed in a param (CSV) or message (FMG) file, field by field and independently of any ERDB table.
+    Useful for inspecting regulation patches before ERDB data covers the changes.
+    ERDB automatically finds the previous version from the one requested, but that can be overridden with an optional `--from-version` argument.
+    Rows are streamed in ID order, so even the largest params are compared with little memory.
+    """
+
+    aliases = ["diff"]
+
+    examples = [
+        (
+            "Show changes of \"SpEffectParam\" in version 1.10.0 as JSON lines",
+            "erdb diff SpEffectParam 1.10.0",
+        ),
+        (
+            "Show damage changes of weapons with IDs between 1000000 and 1999999 from version 1.07.0 to 1.09.0 in markdown",
+            "erdb diff EquipParamWeapon 1.09.0 --from-version 1.07.0 --id-min 1000000 --id-max 1999999 --fields attackBasePhysics attackBaseMagic -f markdown",
+        ),
+        (
+            "Write changed weapon names to a file",
+            "erdb diff WeaponName 1.10.0 --out weapon-names.jsonl",
+        ),
+    ]
+
+    arguments = [
+        _Argument.make("name", type=str, help="Name of the param or FMG file, ex. SpEffectParam or WeaponName."),
+        _Argument.make("version", type=GameVersion.from_string, annotation=GameVersion, help="Version to compare."),
+        _Argument.make("--from-version", type=GameVersion.from_string, annotation=GameVersion | None, default=None, help="Optional version to compare against, previous if not specified."),
+        _Argument.make("--id-min", type=int, default=None, metavar="ID", help="Lowest row ID to compare."),
+        _Argument.make("--id-max", type=int, default=None, metavar="ID", help="Highest row ID to compare."),
+        _Argument.make("--fields", type=str, annotation=list[str] | None, default=None, nargs="+", metavar="FIELD", help="Only compare these fields."),
+        _Argument.make("--exclude-fields", type=str, annotation=list[str] | None, default=None, nargs="+", metavar="FIELD", help="Do not compare these fields."),
+        _Argument.make("--formatter", "-f", type=str, default=OUTPUT_FORMATS[0], choices=OUTPUT_FORMATS, help="Format to output the differences in, one JSON object per row or markdown."),
     ] + _Argument.outputs_file()
 
+class ChangelogMatrix(_Subcommand):
+    command = "changelog-matrix"
+    summary = "Create changelogs between every consecutive pair of versions in a range."
+    details = """\
+    Create a changelog for every pair of consecutive versions within the gamedata range, one file per version named after it.
+    Each version is generated only once and shared by both changelogs it takes part in, generated tables are kept in the cache directory.
+    Only items whose params or messages changed between the versions are compared, unless `--no-incremental` is provided.
+    """
+
+    aliases = []
+
+    examples = [
+        (
+            "Regenerate markdown changelogs of every version in the changelogs directory using 8 worker processes",
+            "erdb changelog-matrix --gamedata any version --out changelogs --jobs 8",
+        ),
+        (
+            "Create changelogs of versions 1.05.0 to 1.07.0 in a text format",
+            "erdb changelog-matrix --gamedata from 1.04.1 until 1.07.0 --formatter text",
+        ),
+    ]
+
+    arguments = _Argument.parses_gamedata() + [
+        _Argument.make("--formatter", "-f", type=str, default=FormatterBase.identifiers()[0], choices=FormatterBase.identifiers(), help="Format to output the changelogs in."),
+        _Argument.make("--incremental", action=BooleanOptionalAction, default=True, help="Only compare items whose gamedata changed, enabled by default."),
+        _Argument.make("--out", "-o", type=Path, default=None, help="Optional output directory, current working directory if not specified."),
+        _Argument.make("--jobs", "-j", type=int, default=1, metavar="N", help="Number of worker processes generating versions and comparing pairs (default 1)."),
+    ] + _Argument.uses_cache()
+
 class Source(_Subcommand):
     command = "source"
     summary = "Extract gamedata from an UXM-unpacked ELDEN RING installation (Windows only)."
@@ -284,6 +483,33 @@ class Source(_Subcommand):
         _Argument.make("--version", "-v", type=GameVersion.from_string, annotation=GameVersion | None, default=None, help="Version directory storing the extracted files, overrides autodetection."),
     ] + _Argument.sources_gamedata()
 
+class ImportGamedata(_Subcommand):
+    command = "import-gamedata"
+    summary = "Import gamedata of a version from a zip archive."
+    details = """\
+    Add the files of a zip archive to the gamedata of ERDB, the format gamedata of every version was previously kept in.
+    Files already present in other versions are stored only once and older versions of changed files are reduced to the lines they differ by.
+    The version is read from the archive's name unless it is provided explicitly.
+    """
+
+    aliases = []
+
+    examples = [
+        (
+            "Import gamedata from an archive named after its version",
+            "erdb import-gamedata 1.10.0.zip",
+        ),
+        (
+            "Import gamedata from an archive of a modded game as version 1.99.0",
+            "erdb import-gamedata modded.zip --version 1.99.0",
+        ),
+    ]
+
+    arguments = [
+        _Argument.make("archive", type=Path, help="Path to the zip archive containing params and messages of a single version."),
+        _Argument.make("--version", "-v", type=GameVersion.from_string, annotation=GameVersion | None, default=None, help="Version to import the gamedata as, name of the archive if not specified."),
+    ]
+
 class Map(_Subcommand):
     command = "map"
     summary = "Extract world map image from an UXM-unpacked ELDEN RING installation (Windows only)."
@@ -349,7 +575,11 @@ class ServeAPI(_Subcommand):
     summary = "Begin serving the API web server."
     details = """\
     Start a web server providing a REST API for every table and for all available game versions.
-    Data is served from memory, and is generated lazily unless `--precache` is provided.
+    Data is served from memory. Tables of the latest version are always generated in the background once the server starts, even without `--precache`.
+    `--precache` generates every other version in the background as well, it does not delay startup: the server accepts requests right away and a request for a table not generated yet waits for it.
+    The Docker image (Dockerfile_Api) passes `--precache`, so a container serves requests immediately while it warms up every version.
+    Tables of versions not precached are generated on first request.
+    Generated tables are persisted in the cache directory, so restarts only regenerate what changed.
     The full documentation is available under `/v{api_version}/docs` or `/v{api_version}/redoc` endpoints.
     Higher level endpoints, `/docs` and `/redoc` outline all API versions there are thus far.
     """
@@ -366,8 +596,9 @@ class ServeAPI(_Subcommand):
     arguments = [
         _Argument.make("--port", "-p", type=int, required=True, help="Port number to listen on."),
         _Argument.make("--bind", "-b", type=str, default="0.0.0.0", help="Address to bind the server on."),
-        _Argument.make("--precache", action=BooleanOptionalAction, help="Pregenerate all data instead of lazy loading."),
-    ]
+        _Argument.make("--precache", action=BooleanOptionalAction, help="Generate every version in the background after startup, not only the latest."),
+        _Argument.make("--jobs", "-j", type=int, default=1, metavar="N", help="Number of worker processes generating tables, a single background thread if 1 (default 1)."),
+    ] + _Argument.uses_cache()
 
 class GenerateWiki(_Subcommand):
     command = "generate-wiki"
@@ -4,22 +4,36 @@ from erdb.shop.shop_typing import Material, Lineup, Product
 
 """
 Helper class for looking up any sort of item exchanges (purchases, alterations, crafting...)
+
+All lineups are built once on construction and indexed by the materials they
+require and the product they offer, so lookups do not scan the shop params.
 """
 class Lookup(object):
-    _shop_lineup: ParamDict
-    _material_sets: ParamDict
+    _lineups: list[Lineup]
+    _by_material: dict[Material, list[Lineup]]
+    _by_product: dict[Product, list[Lineup]]
 
     def __init__(self, shop_lineup: ParamDict, material_sets: ParamDict) -> None:
-        self._shop_lineup = shop_lineup
-        self._material_sets = material_sets
+        self._lineups = []
+        self._by_material = {}
+        self._by_product = {}
 
-    def get_lineups_from_material(self, material: Material) -> list[Lineup]:
-        lineups: list[Lineup] = []
+        for lineup_param in shop_lineup.values():
+            mat_id = lineup_param["mtrlId"].get_int()
+            lineup = Lineup.from_params(lineup_param, material_sets[mat_id] if mat_id else None)
+
+            self._lineups.append(lineup)
+            self._by_product.setdefault(lineup.product, []).append(lineup)
 
-        for lineup_param in self._shop_lineup.values():
-            if mat_id := lineup_param["mtrlId"].get_int():
-                lineup = Lineup.from_params(lineup_param, self._material_sets[mat_id])
-                if material in lineup.materials.keys():
-                    lineups.append(lineup)
+            for material in lineup.materials.keys():
+                self._by_material.setdefault(material, []).append(lineup)
+
+    @property
+    def lineups(self) -> list[Lineup]:
+        return list(self._lineups)
+
+    def get_lineups_from_material(self, material: Material) -> list[Lineup]:
+        return list(self._by_material.get(material, []))
 
-        return lineups
\ No newline at end of file
+    def get_lineups_from_product(self, product: Product) -> list[Lineup]:
+        return list(self._by_product.get(product, []))
\ No newline at end of file
@@ -69,14 +69,16 @@ class Lineup(NamedTuple):
     currency: Currency=Currency.RUNES
 
     @classmethod
-    def from_params(cls, lineup_param: ParamRow, material_set: ParamRow) -> Self:
+    def from_params(cls, lineup_param: ParamRow, material_set: ParamRow | None) -> Self:
         product = Product(lineup_param["equipId"].as_int, Product.Category(lineup_param["equipType"].as_int))
         materials: Dict[Material, int] = {}
 
-        for param in _MATERIAL_SET_PARAM_LIST:
-            if mat_id := material_set[param.index].get_int():
-                category = Material.Category(material_set[param.category].as_int)
-                materials[Material(mat_id, category)] = material_set[param.quantity].as_int
+        # lineups without a material set are bought with currency only
+        if material_set is not None:
+            for param in _MATERIAL_SET_PARAM_LIST:
+                if mat_id := material_set[param.index].get_int():
+                    category = Material.Category(material_set[param.category].as_int)
+                    materials[Material(mat_id, category)] = material_set[param.quantity].as_int
 
         return cls(
             product=product,
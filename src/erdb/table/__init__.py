@@ -1,12 +1,13 @@
 from enum import StrEnum
-from typing import Any, Self, NamedTuple
+from typing import Any, Container, Iterator, Self, NamedTuple
 
 from erdb.table._retrievers import RetrieverData
-from erdb.table._common import TableSpec
+from erdb.table._common import TableSpec, load_item_keys
 from erdb.table.ammo import AmmoTableSpec
 from erdb.table.armaments import ArmamentTableSpec
 from erdb.table.armor import ArmorTableSpec
 from erdb.table.ashes_of_war import AshOfWarTableSpec
+from erdb.table.attack_power import AttackPowerTableSpec
 from erdb.table.bolstering_materials import BolsteringMaterialTableSpec
 from erdb.table.correction_attack import CorrectionAttackTableSpec
 from erdb.table.correction_graph import CorrectionGraphTableSpec
@@ -29,7 +30,10 @@ class Generator(NamedTuple):
     spec: TableSpec
     data: RetrieverData
 
-    def generate(self, api: ApiVersion | None = None) -> dict:
+    def iterate(self, api: ApiVersion | None = None, keys: Container[str] | None = None) -> Iterator[tuple[str, Any]]:
+        """
+        Generate (key, item) pairs one at a time, of all items or only those with one of the `keys` if specified.
+        """
         api = self.spec.latest_api() if api is None else api
 
         def key(row: ParamRow) -> Any:
@@ -39,10 +43,39 @@ class Generator(NamedTuple):
             return self.spec.make_object(api, self.data, row)
 
         def valid(row: ParamRow) -> bool:
-            return all(pred(row) for pred in self.spec.predicates)
-
+            return all(pred(row) for pred in self.spec.predicates) and (keys is None or key(row) in keys)
+
+        # keys are cheap, finding them first lets duplicate keys behave the same as in a dictionary:
+        # the first position and the value of the last row
+        rows = {key(row): row for row in self.data.main_param.values() if valid(row)}
+
+        return ((k, value(row)) for k, row in rows.items())
+
+    def generate(self, api: ApiVersion | None = None, keys: Container[str] | None = None) -> dict:
+        """
+        Generate all items, or only those with one of the `keys` if specified.
+        """
+        return dict(self.iterate(api, keys))
+
+    def find_row(self, key: str) -> ParamRow | None:
+        """
+        Main row of the item with the key, the same row `generate` makes the item of,
+        without going through every row if the items are named. None if there is no such item.
+        """
+        if self.data.keys is None:
+            rows = self.data.main_param.values()
+        else:
+            rows = (row for index in self.data.keys.ids.get(key, ()) if (row := self.data.main_param.get(index)) is not None)
+
+        valid = [row for row in rows if all(pred(row) for pred in self.spec.predicates) and self.spec.get_pk(self.data, row) == key]
+        return valid[-1] if len(valid) > 0 else None
+
+    def item_keys(self) -> dict[int, str]:
+        """
+        Keys of items by the index of their main row, without generating anything.
+        """
         rows = self.data.main_param.values()
-        return {key(row): value(row) for row in rows if valid(row)}
+        return {row.index: self.spec.get_pk(self.data, row) for row in rows if all(pred(row) for pred in self.spec.predicates)}
 
     @classmethod
     def create(cls, spec: TableSpec, version: GameVersion) -> Self:
@@ -57,6 +90,7 @@ class Generator(NamedTuple):
                 retrieve_dict(spec.msg_retrievers),
                 retrieve_dict(spec.shop_retrievers),
                 spec.contrib_retriever.get(spec.title(), version),
+                load_item_keys(spec.msg_retrievers["names"], version) if "names" in spec.msg_retrievers else None,
             )
         )
 
@@ -66,6 +100,7 @@ class Table(StrEnum):
     ARMAMENTS = "armaments"
     ARMOR = "armor"
     ASHES_OF_WAR = "ashes-of-war"
+    ATTACK_POWER = "attack-power"
     BOLSTERING_MATERIALS = "bolstering-materials"
     CORRECTION_ATTACK = "correction-attack"
     CORRECTION_GRAPH = "correction-graph"
@@ -97,6 +132,7 @@ class Table(StrEnum):
             Table.ARMAMENTS: ArmamentTableSpec,
             Table.ARMOR: ArmorTableSpec,
             Table.ASHES_OF_WAR: AshOfWarTableSpec,
+            Table.ATTACK_POWER: AttackPowerTableSpec,
             Table.BOLSTERING_MATERIALS: BolsteringMaterialTableSpec,
             Table.CORRECTION_ATTACK: CorrectionAttackTableSpec,
             Table.CORRECTION_GRAPH: CorrectionGraphTableSpec,
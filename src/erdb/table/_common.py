@@ -1,11 +1,13 @@
-from typing import Any, Callable, Protocol
+from typing import Any, Callable, Mapping, Protocol
 from unicodedata import normalize, combining
 
 from erdb.utils.common import get_filename
+from erdb.loaders.cache import LOADER_CACHE
+from erdb.typing.game_version import GameVersion
 from erdb.typing.enums import GoodsRarity
 from erdb.typing.params import ParamRow
 from erdb.typing.api_version import ApiVersion
-from erdb.table._retrievers import ParamDictRetriever, MsgsRetriever, ShopRetriever, ContribRetriever, RetrieverData
+from erdb.table._retrievers import ParamDictRetriever, MsgsRetriever, ShopRetriever, ContribRetriever, RetrieverData, ItemKeys
 
 
 RowPredicate = Callable[[ParamRow], bool]
@@ -14,6 +16,20 @@ def _remove_accents(string: str) -> str:
     nfkd_form = normalize("NFKD", string)
     return "".join(c for c in nfkd_form if not combining(c))
 
+def _make_item_keys(names: Mapping[int, str]) -> ItemKeys:
+    pks = {index: _remove_accents(TableSpecContext.parse_name(name)) for index, name in names.items()}
+    filenames = {index: get_filename(pk) for index, pk in pks.items()}
+    ids: dict[str, tuple[int, ...]] = {}
+
+    for index, pk in pks.items():
+        ids[pk] = ids.get(pk, ()) + (index,)
+
+    return ItemKeys(pks, filenames, ids)
+
+def load_item_keys(names: MsgsRetriever, version: GameVersion) -> ItemKeys:
+    # shared by every table naming its items with the same msg file
+    return LOADER_CACHE.get(("keys", *names, str(version)), lambda: _make_item_keys(names.get(version)))
+
 class TableSpec(Protocol):
     model: dict[ApiVersion, Any]
 
@@ -69,8 +85,8 @@ class TableSpecContext:
 
     @classmethod # override
     def get_pk(cls, data: RetrieverData, row: ParamRow) -> str:
-        assert "names" in data.msgs, "names were not parsed, override get_pk() for non-standard pk"
-        return _remove_accents(cls.parse_name(data.msgs["names"][row.index]))
+        assert data.keys is not None, "names were not parsed, override get_pk() for non-standard pk"
+        return data.keys.pks[row.index]
 
     @classmethod
     def parse_name(cls, name: str) -> str:
@@ -102,10 +118,11 @@ class TableSpecContext:
 
     @classmethod
     def make_contrib(cls, data: RetrieverData, row: ParamRow, *fields: str) -> dict[str, Any]:
-        row_name = cls.get_pk(data, row)
+        assert data.keys is not None, "make_contrib() cannot be called without names parsed"
+        filename = data.keys.filenames[row.index]
 
         def get_user_value(field: str):
-            return data.contrib.get(get_filename(row_name), {}).get(field)
+            return data.contrib.get(filename, {}).get(field)
 
         user_data = {field: get_user_value(field) for field in fields}
         user_data = {k: v for k, v in user_data.items() if v is not None}
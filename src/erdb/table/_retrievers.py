@@ -1,19 +1,29 @@
-from typing import NamedTuple
+from typing import Mapping, NamedTuple
 
 from erdb.typing.game_version import GameVersion
 from erdb.loaders.params import load as load_params, load_ids as load_param_ids, load_msg
 from erdb.loaders.contrib import load as load_contrib
+from erdb.loaders.cache import LOADER_CACHE
 from erdb.typing.params import ParamDict
 from erdb.typing.enums import ItemIDFlag
 from erdb.shop import Lookup
 
 
+class ItemKeys(NamedTuple):
+    """
+    Keys of items named in a msg file, computed once per file and version.
+    """
+    pks: dict[int, str]            # row ID -> pk
+    filenames: dict[int, str]      # row ID -> name of the contrib file
+    ids: dict[str, tuple[int, ...]] # pk -> row IDs named the same, ascending
+
 class RetrieverData(NamedTuple):
     main_param: ParamDict
     params: dict[str, ParamDict]
-    msgs: dict[str, dict[int, str]]
+    msgs: dict[str, Mapping[int, str]]
     shops: dict[str, Lookup]
     contrib: dict[str, dict]
+    keys: ItemKeys | None = None # if names are parsed
 
 class ParamDictRetriever(NamedTuple):
     param_name: str
@@ -22,10 +32,13 @@ class ParamDictRetriever(NamedTuple):
     id_max: int | None = None
 
     def get(self, version: GameVersion) -> ParamDict:
-        args = [self.param_name, version, self.item_id_flag]
-        args += [arg for arg in [self.id_min, self.id_max] if arg is not None]
-        func = load_params if len(args) <= 3 else load_param_ids
-        return func(*args) # type: ignore
+        def load() -> ParamDict:
+            args = [self.param_name, version, self.item_id_flag]
+            args += [arg for arg in [self.id_min, self.id_max] if arg is not None]
+            func = load_params if len(args) <= 3 else load_param_ids
+            return func(*args) # type: ignore
+
+        return LOADER_CACHE.get(("param", *self, str(version)), load)
 
     def __contains__(self, __x: object) -> bool:
         assert isinstance(__x, int), f"Can only check for integer range"
@@ -34,9 +47,11 @@ class ParamDictRetriever(NamedTuple):
 
 class MsgsRetriever(NamedTuple):
     file_name: str
+    id_min: int | None = None
+    id_max: int | None = None
 
-    def get(self, version: GameVersion) -> dict[int, str]:
-        return load_msg(self.file_name, version)
+    def get(self, version: GameVersion) -> Mapping[int, str]:
+        return LOADER_CACHE.get(("msg", *self, str(version)), lambda: load_msg(self.file_name, version, self.id_min, self.id_max))
 
 class ShopRetriever(NamedTuple):
     shop_lineup_id_min: int | None
@@ -45,12 +60,19 @@ class ShopRetriever(NamedTuple):
     material_set_id_max: int | None
     recipe: bool = False
 
+    @property
+    def param_names(self) -> list[str]:
+        return ["ShopLineupParam_Recipe" if self.recipe else "ShopLineupParam", "EquipMtrlSetParam"]
+
     def get(self, version: GameVersion) -> Lookup:
-        F = ParamDictRetriever
-        shop_param = "ShopLineupParam_Recipe" if self.recipe else "ShopLineupParam"
-        shop = F(shop_param, ItemIDFlag.NON_EQUIPABBLE, self.shop_lineup_id_min, self.shop_lineup_id_max)
-        mats = F("EquipMtrlSetParam", ItemIDFlag.NON_EQUIPABBLE, self.material_set_id_min, self.material_set_id_max)
-        return Lookup(shop.get(version), mats.get(version))
+        def load() -> Lookup:
+            F = ParamDictRetriever
+            shop_param, mats_param = self.param_names
+            shop = F(shop_param, ItemIDFlag.NON_EQUIPABBLE, self.shop_lineup_id_min, self.shop_lineup_id_max)
+            mats = F(mats_param, ItemIDFlag.NON_EQUIPABBLE, self.material_set_id_min, self.material_set_id_max)
+            return Lookup(shop.get(version), mats.get(version))
+
+        return LOADER_CACHE.get(("shop", *self, str(version)), load)
 
 class ContribRetriever(NamedTuple):
     def get(self, element_name: str, version: GameVersion) -> dict[str, dict]:
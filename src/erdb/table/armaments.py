@@ -7,10 +7,15 @@ from erdb.typing.categories import ArmamentCategory
 from erdb.typing.api_version import ApiVersion
 from erdb.utils.common import find_offset_indices, remove_nulls
 from erdb.effect_parser import parse_effects, parse_status_effects, parse_weapon_effects
+from erdb.loaders.cache import LoaderCache
 from erdb.table._retrievers import ParamDictRetriever, MsgsRetriever, RetrieverData
 from erdb.table._common import RowPredicate, TableSpecContext
 
 
+# affinities are parsed for armaments and attack-power alike, memoized per source param
+# (which identifies the version) and must not be mutated
+_CACHE = LoaderCache(maxsize=4096)
+
 _BEHAVIOR_EFFECTS_FIELDS: list[str] = ["spEffectBehaviorId0", "spEffectBehaviorId1", "spEffectBehaviorId2"]
 _RESIDENT_EFFECTS_FIELDS: list[str] = ["residentSpEffectId", "residentSpEffectId1", "residentSpEffectId2"]
 
@@ -42,7 +47,7 @@ def _get_correction_calc_ids(row: ParamRow) -> CorrectionCalcID:
         madness=row["correctType_Madness"].as_int
     )
 
-def _get_requirements(row: ParamRow) -> StatRequirements:
+def get_requirements(row: ParamRow) -> StatRequirements:
     data = {
         "strength": row["properStrength"].get_int(null_value=0),
         "dexterity": row["properAgility"].get_int(null_value=0),
@@ -141,11 +146,12 @@ def _get_affinity_properties(row: ParamRow, effects: ParamDict, reinforces: Para
         status_effect_overlay=get_status_effect_overlay(row, effects, reinforces, reinforcement_id),
     )
 
-def _get_affinities(row: ParamRow, armaments: ParamDict, effects: ParamDict, reinforces: ParamDict, allow_ash_of_war: bool) -> dict[Affinity, AffinityProperties]:
+def get_affinities(row: ParamRow, armaments: ParamDict, effects: ParamDict, reinforces: ParamDict, allow_ash_of_war: bool) -> dict[Affinity, AffinityProperties]:
     possible_maxima = [0, 12] if allow_ash_of_war else [0]
     indices, levels = find_offset_indices(row.index, armaments, possible_maxima, increment=100)
     affinities: list[Affinity] = [Affinity.from_id(round(l / 100)) for l in levels]
-    return {a: _get_affinity_properties(armaments[i], effects, reinforces) for i, a in zip(indices, affinities)}
+    parse = lambda i: _CACHE.get(("affinity", armaments[i].source, i), lambda: _get_affinity_properties(armaments[i], effects, reinforces))
+    return {a: parse(i) for i, a in zip(indices, affinities)}
 
 class ArmamentTableSpec(TableSpecContext):
     model = {
@@ -201,7 +207,7 @@ class ArmamentTableSpec(TableSpecContext):
             upgrade_costs=upgrade_costs,
             attack_attributes=_get_attack_attributes(row),
             sp_consumption_rate=row["staminaConsumptionRate"].as_float,
-            requirements=_get_requirements(row),
+            requirements=get_requirements(row),
             effects=[Effect(**eff) for eff in weapon_effects],
-            affinity=_get_affinities(row, data.main_param, effects, reinforces, allow_ash_of_war)
+            affinity=get_affinities(row, data.main_param, effects, reinforces, allow_ash_of_war)
         )
\ No newline at end of file
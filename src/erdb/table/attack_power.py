@@ -0,0 +1,197 @@
+from erdb.typing.models.attack_power import AttackPower, AffinityAttackPower, AttackTypes, AttackTypeValues, AttributeContribution, AttributeContributions, DamageCurves, ReinforcementCurves, ScalingCurves, StatusEffectTypes, StatusEffectValues
+from erdb.typing.models.armament import AffinityProperties
+from erdb.typing.models.correction_attack import Correction, Override, Ratio
+from erdb.typing.models.reinforcement import ReinforcementLevel
+from erdb.typing.params import ParamRow
+from erdb.typing.enums import AshOfWarMountType, ItemIDFlag
+from erdb.typing.api_version import ApiVersion
+from erdb.utils.common import find_offset_indices
+from erdb.loaders.cache import LoaderCache
+from erdb.table.armaments import ArmamentTableSpec, get_affinities, get_requirements
+from erdb.table.correction_attack import get_damage_types
+from erdb.table.correction_graph import CorrectionGraphTableSpec
+from erdb.table.reinforcements import get_reinforcement_level
+from erdb.table._retrievers import ParamDictRetriever, MsgsRetriever, RetrieverData
+from erdb.table._common import TableSpecContext
+
+
+"""
+Attack power of every Armament and affinity from `reinforcements`, `correction-attack`
+and `correction-graph`, so that it is found without the source tables. Affinities keep
+their base values, while multipliers per upgrade level are listed once per reinforcement
+and correction curves once per Armament, both shared by most affinities. Operations
+are ordered the same as in `ArmamentCalculator`, correction curves are rounded.
+
+Reinforcements and corrections are shared by many affinities, their parse results are
+memoized per source param (which identifies the version) and must not be mutated.
+"""
+
+_CACHE = LoaderCache(maxsize=1024)
+_DECIMALS = 6
+
+_ATTACK_TYPES = ["physical", "magic", "fire", "lightning", "holy"]
+_STATUS_EFFECTS = ["bleed", "frostbite", "poison", "scarlet_rot", "sleep", "madness"]
+_ATTRIBUTES = ["strength", "dexterity", "intelligence", "faith", "arcane"]
+
+def _get_reinforcement(reinforcement_id: int, data: RetrieverData) -> tuple[ReinforcementLevel, ...]:
+    reinforces = data.params["reinforces"]
+
+    def parse() -> tuple[ReinforcementLevel, ...]:
+        indices, levels = find_offset_indices(reinforcement_id, reinforces, possible_maxima=[0, 10, 25])
+        return tuple(get_reinforcement_level(reinforces[i], lvl) for i, lvl in zip(indices, levels))
+
+    return _CACHE.get(("reinforcement", reinforces[reinforcement_id].source, reinforcement_id), parse)
+
+def _get_correction_attack(correction_attack_id: int, data: RetrieverData) -> tuple[Correction, Override, Ratio] | None:
+    # early versions reference rows which were added later, ex. Rivers of Blood in 1.02.x
+    if (row := data.params["correction_attacks"].get(correction_attack_id)) is None:
+        return None
+
+    parse = lambda: (get_damage_types(row, Correction), get_damage_types(row, Override), get_damage_types(row, Ratio))
+    return _CACHE.get(("correction_attack", row.source, correction_attack_id), parse)
+
+def _get_correction(correction_id: int, data: RetrieverData) -> tuple[float, ...]:
+    row = data.params["correction_graphs"][correction_id]
+    parse = lambda: tuple(round(v, _DECIMALS) for v in CorrectionGraphTableSpec.make_object(ApiVersion.VER_1, data, row)[1:100])
+    return _CACHE.get(("correction_graph", row.source, correction_id), parse)
+
+def _get_attack_type(attack_type: str, props: AffinityProperties, reinforcement: tuple[ReinforcementLevel, ...], data: RetrieverData) -> AttackTypeValues | None:
+    base = getattr(props.damage, attack_type) or 0.0
+
+    if not base > 0 or not any(getattr(r.damage, attack_type) > 0 for r in reinforcement):
+        return None
+
+    if (correction_attack := _get_correction_attack(props.correction_attack_id, data)) is None:
+        return AttackTypeValues(base=base, correction_id=getattr(props.correction_calc_id, attack_type), attributes=AttributeContributions())
+
+    correction, override, ratio = (getattr(c, attack_type) for c in correction_attack)
+
+    def contribution(attribute: str) -> AttributeContribution | None:
+        if not getattr(correction, attribute):
+            return None
+
+        base_scaling = getattr(props.scaling, attribute) or 0.0
+
+        # override base scaling if an override is defined
+        if override is not None and (value := getattr(override, attribute)) is not None:
+            base_scaling = value
+
+        impact_ratio = getattr(ratio, attribute)
+
+        return AttributeContribution(
+            ratio=impact_ratio,
+            penalty=round(0.6 * (impact_ratio - 1) - 0.4, _DECIMALS),
+            scaling=base_scaling,
+        )
+
+    return AttackTypeValues(
+        base=base,
+        correction_id=getattr(props.correction_calc_id, attack_type),
+        attributes=AttributeContributions(**{a: contribution(a) for a in _ATTRIBUTES}),
+    )
+
+def _get_status_effect(effect_type: str, props: AffinityProperties, reinforcement: tuple[ReinforcementLevel, ...], data: RetrieverData) -> StatusEffectValues | None:
+    base = getattr(props.status_effects, effect_type) or 0.0
+    overlays = props.status_effect_overlay
+
+    # overwrite base value per level if the effect upgrades for the affinity
+    upgrades = [
+        value if len(overlays) > r.level and (value := getattr(overlays[r.level], effect_type)) is not None else base
+        for r in reinforcement
+    ] if len(overlays) > 0 else [base]
+
+    if not any(u > 0 for u in upgrades):
+        return None
+
+    # base values per level are only listed when they differ
+    upgrades = upgrades if any(u != base for u in upgrades) else None
+
+    if not (correction_id := getattr(props.correction_calc_id, effect_type, None)):
+        return StatusEffectValues(base=base, upgrades=upgrades)
+
+    return StatusEffectValues(
+        base=base,
+        upgrades=upgrades,
+        correction_id=correction_id,
+        scaling=props.scaling.arcane or 0.0,
+    )
+
+def _get_affinity_attack_power(props: AffinityProperties, data: RetrieverData) -> AffinityAttackPower:
+    reinforcement = _get_reinforcement(props.reinforcement_id, data)
+
+    return AffinityAttackPower(
+        reinforcement_id=props.reinforcement_id,
+        attack_power=AttackTypes(**{t: _get_attack_type(t, props, reinforcement, data) for t in _ATTACK_TYPES}),
+        status_effects=StatusEffectTypes(**{e: _get_status_effect(e, props, reinforcement, data) for e in _STATUS_EFFECTS}),
+    )
+
+def _get_reinforcement_curves(reinforcement_id: int, affinities: list[AffinityAttackPower], data: RetrieverData) -> ReinforcementCurves:
+    attack_types = [(t, v) for aff in affinities for t in _ATTACK_TYPES if (v := getattr(aff.attack_power, t)) is not None]
+    attributes = {a for _, v in attack_types for a in _ATTRIBUTES if getattr(v.attributes, a) is not None}
+
+    # status effects only ever scale with arcane
+    if any((v := getattr(aff.status_effects, e)) is not None and v.scaling is not None for aff in affinities for e in _STATUS_EFFECTS):
+        attributes.add("arcane")
+
+    damage = tuple(t for t in _ATTACK_TYPES if any(t == u for u, _ in attack_types))
+    scaling = tuple(a for a in _ATTRIBUTES if a in attributes)
+
+    def parse() -> ReinforcementCurves:
+        reinforcement = _get_reinforcement(reinforcement_id, data)
+
+        return ReinforcementCurves(
+            damage=DamageCurves(**{t: [getattr(r.damage, t) for r in reinforcement] for t in damage}),
+            scaling=ScalingCurves(**{a: [getattr(r.scaling, a) for r in reinforcement] for a in scaling}),
+        )
+
+    source = data.params["reinforces"][reinforcement_id].source
+    return _CACHE.get(("reinforcement_curves", source, reinforcement_id, damage, scaling), parse)
+
+class AttackPowerTableSpec(TableSpecContext):
+    model = {
+        ApiVersion.VER_1: AttackPower,
+    }
+
+    main_param_retriever = ArmamentTableSpec.main_param_retriever
+    predicates = ArmamentTableSpec.predicates
+
+    param_retrievers = {
+        "effects": ParamDictRetriever("SpEffectParam", ItemIDFlag.NON_EQUIPABBLE),
+        "reinforces": ParamDictRetriever("ReinforceParamWeapon", ItemIDFlag.NON_EQUIPABBLE),
+        "correction_attacks": ParamDictRetriever("AttackElementCorrectParam", ItemIDFlag.NON_EQUIPABBLE),
+        "correction_graphs": ParamDictRetriever("CalcCorrectGraph", ItemIDFlag.NON_EQUIPABBLE),
+    }
+
+    msg_retrievers = {
+        "names": MsgsRetriever("WeaponName"),
+    }
+
+    @classmethod
+    def make_object(cls, api: ApiVersion, data: RetrieverData, row: ParamRow):
+        effects = data.params["effects"]
+        reinforces = data.params["reinforces"]
+
+        allow_ash_of_war = AshOfWarMountType(row["gemMountType"]) == AshOfWarMountType.ALLOW_CHANGE
+        affinities = get_affinities(row, data.main_param, effects, reinforces, allow_ash_of_war)
+
+        affinity = {a: _get_affinity_attack_power(props, data) for a, props in affinities.items()}
+
+        # correction curves are shared by most affinities and only listed once
+        values = [getattr(aff.attack_power, t) for aff in affinity.values() for t in _ATTACK_TYPES] \
+               + [getattr(aff.status_effects, e) for aff in affinity.values() for e in _STATUS_EFFECTS]
+        correction_ids = {v.correction_id for v in values if v is not None and v.correction_id is not None}
+
+        # so are reinforcements, with only the curves any of their affinities use
+        reinforcement_ids = {aff.reinforcement_id for aff in affinity.values()}
+        reinforcements = {
+            i: _get_reinforcement_curves(i, [aff for aff in affinity.values() if aff.reinforcement_id == i], data)
+            for i in sorted(reinforcement_ids)
+        }
+
+        return AttackPower(
+            name=cls.parse_name(data.msgs["names"][row.index]),
+            requirements=get_requirements(row),
+            corrections={i: list(_get_correction(i, data)) for i in sorted(correction_ids)},
+            reinforcements=reinforcements,
+            affinity=affinity,
+        )
\ No newline at end of file
@@ -38,7 +38,7 @@ def _get_attributes(row: ParamRow, damage_type: str, cls: Any) -> Any:
     ret = {k: v for k, v in ret.items() if v is not None}
     return cls.get_field_type()(**ret)
 
-def _get_damage_types(row: ParamRow, cls: Any) -> Any:
+def get_damage_types(row: ParamRow, cls: Any) -> Any:
     data = {damage: _get_attributes(row, damage, cls) for damage in _DAMAGE_TYPE.keys()}
     return cls(**data)
 
@@ -56,7 +56,7 @@ class CorrectionAttackTableSpec(TableSpecContext):
     @classmethod
     def make_object(cls, api: ApiVersion, data: RetrieverData, row: ParamRow):
         return CorrectionAttack(
-            correction=_get_damage_types(row, Correction),
-            override=_get_damage_types(row, Override),
-            ratio=_get_damage_types(row, Ratio),
+            correction=get_damage_types(row, Correction),
+            override=get_damage_types(row, Override),
+            ratio=get_damage_types(row, Ratio),
         )
\ No newline at end of file
@@ -47,7 +47,7 @@ def _get_resistances(row: ParamRow) -> ResistanceMultiplier:
         death_blight=row["curseGuardResistRate"].as_float,
     )
 
-def _get_reinforcement_level(row: ParamRow, level: int) -> ReinforcementLevel:
+def get_reinforcement_level(row: ParamRow, level: int) -> ReinforcementLevel:
     return ReinforcementLevel(
         level=level,
         damage=_get_damages(row),
@@ -75,4 +75,4 @@ class ReinforcementTableSpec(TableSpecContext):
     @classmethod
     def make_object(cls, api: ApiVersion, data: RetrieverData, row: ParamRow):
         indices, offset = find_offset_indices(row.index, data.main_param, possible_maxima=[0, 10, 25])
-        return Reinforcement([_get_reinforcement_level(data.main_param[i], lvl) for i, lvl in zip(indices, offset)])
\ No newline at end of file
+        return Reinforcement([get_reinforcement_level(data.main_param[i], lvl) for i, lvl in zip(indices, offset)])
\ No newline at end of file
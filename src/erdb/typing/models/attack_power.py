@@ -0,0 +1,163 @@
+from pydantic import Field, NonNegativeFloat, NonNegativeInt, ConstrainedList
+from pydantic.dataclasses import dataclass
+
+from erdb.typing.models import dt_config
+from erdb.typing.models.common import StatRequirements
+from erdb.typing.enums import Affinity
+
+
+"""
+`conlist` cannot be used, otherwise model is not pickable.
+
+Functional equivalent:
+CorrectionCurve = conlist(NonNegativeFloat, min_items=99, max_items=99)
+"""
+class CorrectionCurve(ConstrainedList):
+    item_type = NonNegativeFloat
+    __args__ = (NonNegativeFloat,)
+    min_items = 99
+    max_items = 99
+
+"""
+`conlist` cannot be used, otherwise model is not pickable.
+
+Functional equivalent:
+ReinforcementCurve = conlist(NonNegativeFloat, min_items=1, max_items=26)
+"""
+class ReinforcementCurve(ConstrainedList):
+    item_type = NonNegativeFloat
+    __args__ = (NonNegativeFloat,)
+    min_items = 1
+    max_items = 26
+
+@dataclass(config=dt_config())
+class DamageCurves:
+    physical: ReinforcementCurve | None = None
+    magic: ReinforcementCurve | None = None
+    fire: ReinforcementCurve | None = None
+    lightning: ReinforcementCurve | None = None
+    holy: ReinforcementCurve | None = None
+
+@dataclass(config=dt_config())
+class ScalingCurves:
+    strength: ReinforcementCurve | None = None
+    dexterity: ReinforcementCurve | None = None
+    intelligence: ReinforcementCurve | None = None
+    faith: ReinforcementCurve | None = None
+    arcane: ReinforcementCurve | None = None
+
+@dataclass(config=dt_config())
+class ReinforcementCurves:
+    damage: DamageCurves = Field(...,
+        description="Multipliers of base damage per upgrade level, only of attack types dealt by the affinities using the reinforcement.",
+    )
+    scaling: ScalingCurves = Field(...,
+        description="Multipliers of attribute scaling per upgrade level, only of attributes the affinities using the reinforcement scale with.",
+    )
+
+@dataclass(config=dt_config())
+class AttributeContribution:
+    ratio: float = Field(...,
+        description="Impact ratio of the attribute on the attack type.",
+        example=1.,
+    )
+    penalty: float = Field(...,
+        description="Contribution of the attribute if its requirement is not met.",
+        example=-0.4,
+    )
+    scaling: NonNegativeFloat = Field(...,
+        description="Base scaling of the attribute for the affinity, before the reinforcement's multiplier.",
+        example=0.49,
+    )
+
+@dataclass(config=dt_config())
+class AttributeContributions:
+    strength: AttributeContribution | None = None
+    dexterity: AttributeContribution | None = None
+    intelligence: AttributeContribution | None = None
+    faith: AttributeContribution | None = None
+    arcane: AttributeContribution | None = None
+
+@dataclass(config=dt_config())
+class AttackTypeValues:
+    base: NonNegativeFloat = Field(...,
+        description="Base attack power of the affinity, multiplied by `damage` of the reinforcement at the upgrade level.",
+        example=138.,
+    )
+    correction_id: NonNegativeInt = Field(...,
+        description="ID of the correction curve of the attack type in `corrections` of the Armament.",
+        example=0,
+    )
+    attributes: AttributeContributions = Field(...,
+        description="Attributes the attack type scales with. Given `correction` of the attack type and `reinforcement` of the affinity, an attribute contributes `ratio - 1 + scaling * reinforcement.scaling[attribute][level] * correction[value - 1] * ratio` if its requirement is met, `penalty` otherwise. Scaled attack power is `base * reinforcement.damage[type][level]` multiplied by the sum of contributions, but not less than the lowest contribution, where missing attributes contribute 0.",
+    )
+
+@dataclass(config=dt_config())
+class StatusEffectValues:
+    base: NonNegativeFloat = Field(...,
+        description="Base buildup of the affinity.",
+        example=50.,
+    )
+    upgrades: list[NonNegativeFloat] | None = Field(None,
+        description="Base buildup per upgrade level, replacing `base` if the status effect upgrades with the Armament.",
+        min_items=1, max_items=26,
+        example=[50., 52., 54.],
+    )
+    correction_id: NonNegativeInt | None = Field(None,
+        description="ID of the correction curve of the status effect in `corrections` of the Armament, missing if the status effect does not scale.",
+        example=6,
+    )
+    scaling: NonNegativeFloat | None = Field(None,
+        description="Base arcane scaling of the affinity, so that scaled buildup is `base * scaling * reinforcement.scaling.arcane[level] * correction[arcane - 1]`. Missing if the status effect does not scale.",
+        example=0.5,
+    )
+
+@dataclass(config=dt_config())
+class AttackTypes:
+    physical: AttackTypeValues | None = None
+    magic: AttackTypeValues | None = None
+    fire: AttackTypeValues | None = None
+    lightning: AttackTypeValues | None = None
+    holy: AttackTypeValues | None = None
+
+@dataclass(config=dt_config())
+class StatusEffectTypes:
+    bleed: StatusEffectValues | None = None
+    frostbite: StatusEffectValues | None = None
+    poison: StatusEffectValues | None = None
+    scarlet_rot: StatusEffectValues | None = None
+    sleep: StatusEffectValues | None = None
+    madness: StatusEffectValues | None = None
+
+@dataclass(config=dt_config())
+class AffinityAttackPower:
+    reinforcement_id: NonNegativeInt = Field(...,
+        description="ID of the reinforcement of the affinity in `reinforcements` of the Armament, its curves have a value per upgrade level.",
+        example=0,
+    )
+    attack_power: AttackTypes = Field(...,
+        description="Attack types dealt by the Armament, missing if an attack type deals no damage at any level.",
+    )
+    status_effects: StatusEffectTypes = Field(...,
+        description="Status effects dealt by the Armament, missing if a status effect never builds up.",
+    )
+
+@dataclass(config=dt_config())
+class AttackPower:
+    name: str = Field(...,
+        description="Name of the Armament.",
+        example="Claymore",
+    )
+    requirements: StatRequirements = Field(...,
+        description="Attribute requirements of the Armament, below which an attribute contributes its `penalty`.",
+        example=StatRequirements(strength=16, dexterity=13),
+    )
+    corrections: dict[NonNegativeInt, CorrectionCurve] = Field(...,
+        description="Correction curves used by the affinities of the Armament, each mapping an attribute value minus 1 to the correction of scaling.",
+    )
+    reinforcements: dict[NonNegativeInt, ReinforcementCurves] = Field(...,
+        description="Reinforcements used by the affinities of the Armament, each with the multipliers of base damage and scaling per upgrade level.",
+    )
+    affinity: dict[Affinity, AffinityAttackPower] = Field(...,
+        description="Attack power of every affinity of the Armament.",
+    )
\ No newline at end of file
@@ -1,24 +1,35 @@
-from typing import Any, NamedTuple, Self, overload
+from functools import cached_property
+from typing import Any, Protocol, Self, overload
 from erdb.typing.enums import ItemIDFlag
 
 
 class ParamField(str):
+    """
+    Raw text value of a param field. Typed conversions are computed once per
+    instance and memoized, param stores hand out shared instances per value.
+    """
     @property
     def as_str(self) -> str:
         return self
 
-    @property
+    @cached_property
     def as_int(self) -> int:
         return int(self)
 
-    @property
+    @cached_property
     def as_bool(self) -> bool:
         return self != "0"
 
-    @property
+    @cached_property
     def as_float(self) -> float:
         return float(self)
 
+    @classmethod
+    def from_int(cls, value: int) -> Self:
+        field = cls(value)
+        field.__dict__["as_int"] = value
+        return field
+
     @overload
     def get_int(self, default: int, null_value: Any = "-1", formatter = lambda x: x) -> int: ...
 
@@ -26,7 +37,7 @@ class ParamField(str):
     def get_int(self, default: int | None = None, null_value: Any = "-1", formatter = lambda x: x) -> int | None: ...
 
     def get_int(self, default: int | None = None, null_value: Any = "-1", formatter = lambda x: x) -> int | None:
-        return default if self == str(null_value) else formatter(int(self))
+        return default if self == str(null_value) else formatter(self.as_int)
 
     @overload
     def get_float(self, default: float, null_value: Any = "-1", formatter = lambda x: x) -> float: ...
@@ -35,13 +46,57 @@ class ParamField(str):
     def get_float(self, default: float | None = None, null_value: Any = "-1", formatter = lambda x: x) -> float | None: ...
 
     def get_float(self, default: float | None = None, null_value: Any = "-1", formatter = lambda x: x) -> float | None:
-        return default if self == str(null_value) else formatter(float(self))
+        return default if self == str(null_value) else formatter(self.as_float)
+
+class ParamFieldSource(Protocol):
+    """
+    Storage of param values, shared by all rows of a param.
+    """
+    fields: list[str]
+
+    def __contains__(self, field: object) -> bool: ...
+
+    def field(self, field: str, pos: int) -> ParamField: ...
+
+class _DictSource:
+    fields: list[str]
+
+    _values: dict[str, ParamField]
+
+    def __init__(self, field_dict: dict[str, str]) -> None:
+        self.fields = [k for k in field_dict.keys() if k is not None]
+        self._values = {k: ParamField(field_dict[k]) for k in self.fields}
+
+    def __contains__(self, field: object) -> bool:
+        return field in self._values
+
+    def field(self, field: str, pos: int) -> ParamField:
+        return self._values[field]
+
+class ParamRow:
+    __slots__ = ("index", "item_id_flag", "name", "_source", "_pos")
 
-class ParamRow(NamedTuple):
     index: int
     item_id_flag: ItemIDFlag
     name: str
-    field_dict: dict[str, str]
+
+    _source: ParamFieldSource
+    _pos: int
+
+    def __init__(self, index: int, item_id_flag: ItemIDFlag, name: str, source: ParamFieldSource, pos: int = 0) -> None:
+        self.index = index
+        self.item_id_flag = item_id_flag
+        self.name = name
+        self._source = source
+        self._pos = pos
+
+    @property
+    def fields(self) -> list[str]:
+        return self._source.fields
+
+    @property
+    def source(self) -> ParamFieldSource:
+        return self._source
 
     @property
     def index_hex(self) -> str:
@@ -56,20 +111,19 @@ class ParamRow(NamedTuple):
         return self.index % 100 == 0
 
     def __getitem__(self, key: str) -> ParamField:
-        assert key in self.field_dict, f"\"{key}\" not found"
-        return ParamField(self.field_dict[key])
+        try:
+            return self._source.field(key, self._pos)
+        except KeyError:
+            assert False, f"\"{key}\" not found"
 
     def __contains__(self, __x: object) -> bool:
-        return __x in self.field_dict
+        return __x in self._source
+
+    def __repr__(self) -> str:
+        return f"ParamRow(index={self.index}, name={self.name!r})"
 
     @classmethod
     def make(cls, field_dict: dict[str, str], item_id_flag: ItemIDFlag) -> Self:
-        index = int(field_dict["Row ID"])
-        return cls(
-            index=index,
-            item_id_flag=item_id_flag,
-            name=field_dict["Row Name"],
-            field_dict=field_dict,
-        )
+        return cls(int(field_dict["Row ID"]), item_id_flag, field_dict["Row Name"], _DictSource(field_dict))
 
 ParamDict = dict[int, ParamRow]
\ No newline at end of file
@@ -0,0 +1,112 @@
+import numpy as np
+from typing import NamedTuple
+
+from erdb.loaders.cache import LoaderCache
+from erdb.utils.attack_power import AttackPower, Attributes, CalculatorData, StatusEffects
+from erdb.utils.attack_power_batch import BatchCalculator
+
+
+"""
+Ranking of every armament/affinity combination by attack power for a given set
+of attributes. All combinations are evaluated at once by the BatchCalculator and
+the evaluated catalog is kept per attribute set, so that filtering and sorting
+the same attributes differently does not recalculate anything.
+"""
+
+SORT_KEYS = ("total",) + AttackPower._fields + StatusEffects._fields
+
+class RankedArmament(NamedTuple):
+    name: str
+    affinity: str
+    level: int
+    total: int
+    attack_power: dict[str, int]
+    status_effects: dict[str, int]
+
+class _Evaluation(NamedTuple):
+    levels: np.ndarray
+    total: np.ndarray          # combo
+    attack_power: np.ndarray   # combo, attack type
+    status_effects: np.ndarray # combo, status effect
+    requirements_met: np.ndarray
+
+class ArmamentRanking:
+    calc: BatchCalculator
+
+    _categories: np.ndarray
+    _upgrade_materials: np.ndarray
+    _evaluations: LoaderCache
+
+    def __init__(self, data: CalculatorData, maxsize: int = 32) -> None:
+        self.calc = BatchCalculator(data)
+        self._categories = np.array([data.armaments[name]["category"] for name, _ in self.calc.combos])
+        self._upgrade_materials = np.array([data.armaments[name]["upgrade_material"] for name, _ in self.calc.combos])
+        self._evaluations = LoaderCache(maxsize)
+
+    def _evaluate(self, attributes: Attributes, two_handed: bool, level: int | None) -> _Evaluation:
+        # two-handing multiplies strength by 1.5, which also counts towards the requirement
+        effective = attributes._replace(strength=int(attributes.strength * 1.5)) if two_handed else attributes
+        levels = self.calc.max_levels if level is None else self.calc.levels(level)
+
+        attack_power = self.calc.attack_power([effective], levels=levels)
+        status_effects = self.calc.status_effects([effective], levels=levels)
+
+        return _Evaluation(
+            levels,
+            attack_power.total[:, 0],
+            attack_power.totals[:, 0],
+            status_effects.totals[:, 0],
+            np.all(self.calc.requirements <= np.array(effective), axis=-1),
+        )
+
+    def rank(self,
+        attributes: Attributes,
+        *,
+        two_handed: bool = False,
+        level: int | None = None,
+        categories: list[str] | None = None,
+        upgrade_material: str | None = None,
+        requirements_met: bool = True,
+        sort_by: str = "total",
+        limit: int = 10,
+    ) -> list[RankedArmament]:
+        """
+        Best `limit` armament/affinity combinations for the attributes, at the regular
+        upgrade `level` (converted for somber armaments) or at their maximum level.
+        """
+        assert sort_by in SORT_KEYS, f"Cannot sort by \"{sort_by}\""
+
+        key = (attributes, two_handed, level)
+        evaluation: _Evaluation = self._evaluations.get(key, lambda: self._evaluate(attributes, two_handed, level))
+
+        mask = np.ones(len(self.calc), dtype=bool)
+
+        if categories is not None:
+            mask &= np.isin(self._categories, categories)
+
+        if upgrade_material is not None:
+            mask &= self._upgrade_materials == upgrade_material
+
+        if requirements_met:
+            mask &= evaluation.requirements_met
+
+        if sort_by == "total":
+            scores = evaluation.total
+        elif sort_by in AttackPower._fields:
+            scores = evaluation.attack_power[:, AttackPower._fields.index(sort_by)]
+        else:
+            scores = evaluation.status_effects[:, StatusEffects._fields.index(sort_by)]
+
+        candidates = np.flatnonzero(mask)
+        best = candidates[np.argsort(-scores[candidates], kind="stable")[:limit]]
+
+        return [
+            RankedArmament(
+                *self.calc.combos[c],
+                int(evaluation.levels[c]),
+                int(evaluation.total[c]),
+                dict(zip(AttackPower._fields, map(int, evaluation.attack_power[c]))),
+                dict(zip(StatusEffects._fields, map(int, evaluation.status_effects[c]))),
+            )
+            for c in best
+        ]
\ No newline at end of file
@@ -1,4 +1,6 @@
+import json
 from math import floor
+from pathlib import Path
 from typing import Iterator, NamedTuple
 
 
@@ -87,6 +89,23 @@ class CalculatorData(NamedTuple):
     correction_attack: dict[str, dict[str, str]]
     correction_graph: dict[str, list[float]]
 
+    @classmethod
+    def create(cls, data_path: Path) -> "CalculatorData":
+        """
+        Load from a directory of generated data, ie. `armaments.json`, `reinforcements.json`,
+        `correction-attack.json` and `correction-graph.json`.
+        """
+        def load_data_file(name: str):
+            with open(data_path / name) as f:
+                return json.load(f)
+
+        return cls(
+            load_data_file("armaments.json"),
+            load_data_file("reinforcements.json"),
+            load_data_file("correction-attack.json"),
+            load_data_file("correction-graph.json"),
+        )
+
 class ArmamentCalculator:
     _name: str
     _affinity: str
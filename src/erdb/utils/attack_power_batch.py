@@ -0,0 +1,262 @@
+import numpy as np
+from typing import Iterable, NamedTuple
+
+from erdb.utils.attack_power import AttackPower, Attributes, CalculatorData, StatusEffects
+from erdb.utils.common import to_somber
+
+
+"""
+Batch counterpart of ArmamentCalculator. Every armament/affinity combination is
+compiled into NumPy arrays once, so attack power and status effects of whole
+catalogs can be evaluated for many attribute sets at a time.
+
+This lives separately from `attack_power`, which is also shipped to the wiki
+and must not depend on NumPy.
+
+Scaling of an attack type is separable per attribute: it is a sum (capped from
+below by the lowest term) of one contribution per attribute, each depending only
+on that attribute's value. These contributions are precomputed as curves over
+every attribute value, which reduces the calculation to table lookups.
+"""
+
+_ATTACKS = AttackPower._fields
+_EFFECTS = StatusEffects._fields
+_ATTRIBUTES = Attributes._fields
+
+_CHUNK_SIZE = 1 << 18 # combinations times attribute sets evaluated at once
+_MAX_EFFECTIVE = 150 # cap of effective attribute values (two-handed strength), correction graphs have 151 entries, 0..150
+
+def _as_attributes(attributes: Iterable[Attributes] | np.ndarray) -> np.ndarray:
+    values = np.asarray(list(attributes) if not isinstance(attributes, np.ndarray) else attributes, dtype=np.intp)
+    values = values.reshape(-1, len(_ATTRIBUTES))
+
+    # effective attributes may exceed 99, ie. strength of two-handed armaments
+    assert np.all((1 <= values) & (values <= _MAX_EFFECTIVE)), f"Attributes must be within 1 and {_MAX_EFFECTIVE}"
+    return values
+
+class BatchValues(NamedTuple):
+    """
+    Base and scaled values of every attack type or status effect, in the same
+    order as the fields of AttackPower or StatusEffects (last axis).
+    """
+    base: np.ndarray
+    scaling: np.ndarray
+
+    @property
+    def totals(self) -> np.ndarray:
+        """
+        Total of each attack type or status effect, same as `ValueType.total`.
+        """
+        return np.floor(self.base + self.scaling)
+
+    @property
+    def total(self) -> np.ndarray:
+        """
+        Total of all values combined, same as `AttackPower.total`.
+        """
+        combined = np.zeros(self.base.shape[:-1])
+        for i in range(self.base.shape[-1]): # sequential sum to match the results exactly
+            combined = combined + (self.base[..., i] + self.scaling[..., i])
+        return np.floor(combined)
+
+def _attack_power(contributions: list[np.ndarray], base: np.ndarray) -> BatchValues:
+    # contributions of each attribute: *combos, attack type, attribute set
+    summed = np.zeros_like(contributions[0])
+    for contribution in contributions: # sequential sum to match the results exactly
+        summed = summed + contribution
+
+    low_cap = np.minimum.reduce(contributions)
+    base = np.broadcast_to(base[..., np.newaxis], summed.shape)
+
+    return BatchValues(np.swapaxes(base, -1, -2), np.swapaxes(base * np.maximum(low_cap, summed), -1, -2))
+
+class BatchCalculator:
+    """
+    Attack power and status effects of many armament/affinity/level combinations
+    for many attribute sets. Combinations are addressed by their index in `combos`,
+    results have the shape of the requested combinations followed by the number
+    of attribute sets and the number of attack types or status effects.
+    """
+    combos: list[tuple[str, str]] # (armament, affinity)
+    max_levels: np.ndarray
+    requirements: np.ndarray # combo, attribute
+
+    _index: dict[tuple[str, str], int]
+    _graphs: np.ndarray            # graph, attribute value
+    _damage: np.ndarray            # combo, level, attack type
+    _corrects: np.ndarray          # combo, attack type, attribute
+    _ratio: np.ndarray             # combo, attack type, attribute
+    _base_scaling: np.ndarray      # combo, attack type, attribute
+    _level_scaling: np.ndarray     # combo, level, attribute
+    _attack_graph: np.ndarray      # combo, attack type
+    _effects: np.ndarray           # combo, level, status effect
+    _effect_graph: np.ndarray      # combo, status effect (-1 if effect does not scale)
+    _arcane_scaling: np.ndarray    # combo
+
+    def __init__(self, data: CalculatorData) -> None:
+        graph_ids = {graph_id: i for i, graph_id in enumerate(data.correction_graph.keys())}
+        self._graphs = np.array(list(data.correction_graph.values()), dtype=np.float64)
+
+        self.combos = [(name, affinity) for name, armament in data.armaments.items() for affinity in armament["affinity"].keys()]
+        self._index = {combo: i for i, combo in enumerate(self.combos)}
+
+        count = len(self.combos)
+        levels = max(len(r) for r in data.reinforcements.values())
+
+        self.max_levels = np.zeros(count, dtype=np.intp)
+        self._damage = np.full((count, levels, len(_ATTACKS)), np.nan)
+        self._corrects = np.zeros((count, len(_ATTACKS), len(_ATTRIBUTES)), dtype=bool)
+        self._ratio = np.ones((count, len(_ATTACKS), len(_ATTRIBUTES)))
+        self._base_scaling = np.zeros((count, len(_ATTACKS), len(_ATTRIBUTES)))
+        self._level_scaling = np.full((count, levels, len(_ATTRIBUTES)), np.nan)
+        self.requirements = np.zeros((count, len(_ATTRIBUTES)), dtype=np.intp)
+        self._attack_graph = np.zeros((count, len(_ATTACKS)), dtype=np.intp)
+        self._effects = np.full((count, levels, len(_EFFECTS)), np.nan)
+        self._effect_graph = np.full((count, len(_EFFECTS)), -1, dtype=np.intp)
+        self._arcane_scaling = np.zeros(count)
+
+        for c, (name, affinity) in enumerate(self.combos):
+            armament = data.armaments[name]
+            properties = armament["affinity"][affinity]
+            reinforcements = data.reinforcements[str(properties["reinforcement_id"])]
+            correction_attack = data.correction_attack[str(properties["correction_attack_id"])]
+
+            self.max_levels[c] = len(reinforcements) - 1
+            self.requirements[c] = [armament["requirements"].get(a, 0) for a in _ATTRIBUTES]
+            self._arcane_scaling[c] = properties["scaling"].get("arcane", 0.0)
+
+            for t, attack_type in enumerate(_ATTACKS):
+                self._attack_graph[c, t] = graph_ids[str(properties["correction_calc_id"][attack_type])]
+
+                for a, attrib_name in enumerate(_ATTRIBUTES):
+                    self._corrects[c, t, a] = bool(correction_attack["correction"][attack_type][attrib_name])
+                    self._ratio[c, t, a] = correction_attack["ratio"][attack_type][attrib_name]
+                    self._base_scaling[c, t, a] = correction_attack["override"][attack_type].get(attrib_name, properties["scaling"].get(attrib_name, 0.0))
+
+            for s, effect_type in enumerate(_EFFECTS):
+                if correction_id := properties["correction_calc_id"].get(effect_type):
+                    self._effect_graph[c, s] = graph_ids[str(correction_id)]
+
+            overlays = properties["status_effect_overlay"]
+
+            for l, reinforcement in enumerate(reinforcements):
+                self._damage[c, l] = [properties["damage"].get(t, 0.0) * reinforcement["damage"][t] for t in _ATTACKS]
+                self._level_scaling[c, l] = [reinforcement["scaling"][a] for a in _ATTRIBUTES]
+
+                level = reinforcement["level"]
+                self._effects[c, l] = [
+                    overlays[level][e] if len(overlays) > level and e in overlays[level] else properties["status_effects"].get(e, 0.0)
+                    for e in _EFFECTS
+                ]
+
+    def __len__(self) -> int:
+        return len(self.combos)
+
+    def index(self, name: str, affinity: str = "Standard") -> int:
+        return self._index[(name, affinity)]
+
+    def levels(self, level: int, combos: np.ndarray | None = None) -> np.ndarray:
+        """
+        Reinforcement level of each combination for a regular upgrade level (0-25),
+        converted for somber armaments and capped by the maximum level.
+        """
+        max_levels = self.max_levels if combos is None else self.max_levels[combos]
+        return np.minimum(np.where(max_levels == 10, to_somber(level), level), max_levels)
+
+    def _select(self, combos: np.ndarray | None, levels: np.ndarray | int | None) -> tuple[np.ndarray, np.ndarray]:
+        combos = np.arange(len(self.combos)) if combos is None else np.asarray(combos, dtype=np.intp)
+        levels = self.max_levels[combos] if levels is None else np.asarray(levels, dtype=np.intp)
+        combos, levels = np.broadcast_arrays(combos, levels)
+
+        assert np.all((0 <= levels) & (levels <= self.max_levels[combos])), "Level out of range for some armaments"
+        return combos, levels
+
+    def _contributions(self, combos: np.ndarray, levels: np.ndarray, attribute: int, values: np.ndarray) -> np.ndarray:
+        """
+        Scaling contribution of one attribute at the given values to every attack type,
+        with shape (*combos, attack type, values). Correction graphs are only read
+        at the requested values.
+        """
+        ratio = self._ratio[combos][..., attribute, np.newaxis]
+        corrections = self._graphs[self._attack_graph[combos][..., np.newaxis], values]
+        scaling = (self._base_scaling[combos][..., attribute] * self._level_scaling[combos, levels][..., attribute, np.newaxis])[..., np.newaxis]
+
+        contributions = ratio - 1 + scaling * corrections * ratio
+
+        unmet = values < self.requirements[combos][..., attribute, np.newaxis, np.newaxis]
+        contributions = np.where(unmet, 0.6 * (ratio - 1) - 0.4, contributions)
+
+        return np.where(self._corrects[combos][..., attribute, np.newaxis], contributions, 0.0)
+
+    def _effect_scaling(self, combos: np.ndarray, levels: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """
+        Scaled value of every status effect at the given arcane values, with shape
+        (*combos, status effect, values).
+        """
+        arcane = _ATTRIBUTES.index("arcane")
+        graphs = self._effect_graph[combos]
+
+        scaling = self._effects[combos, levels] * self._arcane_scaling[combos][..., np.newaxis] * self._level_scaling[combos, levels][..., arcane, np.newaxis]
+        scaling = scaling[..., np.newaxis] * self._graphs[graphs[..., np.newaxis], values]
+
+        return np.where((graphs >= 0)[..., np.newaxis], scaling, 0.0)
+
+    def scaling_curves(self, combos: np.ndarray | None = None, levels: np.ndarray | int | None = None) -> np.ndarray:
+        """
+        Scaling contribution of every attribute value to every attack type, with
+        shape (*combos, attack type, attribute, attribute value). Already accounts
+        for unmet requirements, the attack's scaling is the combos' base damage
+        multiplied by the sum of contributions, but no less than the lowest one.
+        """
+        combos, levels = self._select(combos, levels)
+        values = np.arange(self._graphs.shape[-1])
+        return np.stack([self._contributions(combos, levels, a, values) for a in range(len(_ATTRIBUTES))], axis=-2)
+
+    def status_curves(self, combos: np.ndarray | None = None, levels: np.ndarray | int | None = None) -> np.ndarray:
+        """
+        Scaled value of every status effect for every arcane value, with shape
+        (*combos, status effect, attribute value). Status effects only scale with arcane.
+        """
+        combos, levels = self._select(combos, levels)
+        return self._effect_scaling(combos, levels, np.arange(self._graphs.shape[-1]))
+
+    def base_damage(self, combos: np.ndarray | None = None, levels: np.ndarray | int | None = None) -> np.ndarray:
+        combos, levels = self._select(combos, levels)
+        return self._damage[combos, levels]
+
+    def attack_power(self, attributes: Iterable[Attributes] | np.ndarray, combos: np.ndarray | None = None, levels: np.ndarray | int | None = None) -> BatchValues:
+        """
+        Attack power with shape (*combos, attribute sets, attack type). Defaults to
+        every combination at its maximum level.
+        """
+        values = _as_attributes(attributes)
+        combos, levels = self._select(combos, levels)
+
+        base = self.base_damage(combos, levels)
+
+        # bound the size of intermediate arrays for large batches
+        chunk = max(1, _CHUNK_SIZE // max(1, combos.size))
+        parts: list[BatchValues] = []
+
+        for i in range(0, len(values), chunk):
+            contributions = [self._contributions(combos, levels, a, values[i:i + chunk, a]) for a in range(len(_ATTRIBUTES))]
+            parts.append(_attack_power(contributions, base))
+
+        return BatchValues(
+            np.concatenate([p.base for p in parts], axis=-2),
+            np.concatenate([p.scaling for p in parts], axis=-2),
+        )
+
+    def status_effects(self, attributes: Iterable[Attributes] | np.ndarray, combos: np.ndarray | None = None, levels: np.ndarray | int | None = None) -> BatchValues:
+        """
+        Status effects with shape (*combos, attribute sets, status effect). Defaults
+        to every combination at its maximum level.
+        """
+        values = _as_attributes(attributes)
+        combos, levels = self._select(combos, levels)
+
+        base = self._effects[combos, levels] # *combos, status effect
+        scaling = self._effect_scaling(combos, levels, values[:, _ATTRIBUTES.index("arcane")])
+
+        base = np.broadcast_to(base[..., np.newaxis], scaling.shape)
+        return BatchValues(np.swapaxes(base, -1, -2), np.swapaxes(scaling, -1, -2))
\ No newline at end of file
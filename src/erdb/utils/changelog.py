@@ -1,16 +1,20 @@
 from io import TextIOBase
 from enum import Enum
 from sys import stdout
-from typing import Any, NamedTuple, OrderedDict, Self
+from typing import Any, Callable, NamedTuple, OrderedDict, Self
 from pathlib import Path
 from difflib import Differ
 from operator import methodcaller
 from deepdiff import DeepDiff
 from contextlib import suppress
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
 from erdb.table import Table
 from erdb.utils.common import as_str
+from erdb.utils.source_diff import SourceDiff
+from erdb.utils.generation import group_tables
+from erdb.utils.generation_cache import GenerationCache
 from erdb.typing.game_version import GameVersion
 from erdb.typing.effects import SchemaEffect
 
@@ -56,14 +60,13 @@ class _Change(NamedTuple):
                     return obj[prop]
             return getattr(obj, prop, None)
 
-        assert len(self.property_path) > 0, "got a zero-length property_path"
         out = data
 
         for p in self.property_path:
             if (out := _get_any(out, p)) is None:
                 return None
 
-        if self.property_path[-1] == "effects":
+        if len(self.property_path) > 0 and self.property_path[-1] == "effects":
             # treat "effects" field in a special way
             return [str(SchemaEffect.from_obj(elem)) for elem in out] # type: ignore
 
@@ -77,13 +80,14 @@ class _Change(NamedTuple):
         assert len(path) > 0, "Invalid change path"
 
         if isinstance(path[-1], int):
-            assert len(path) > 1, "Invalid change path"
+            # empty path if the item itself is a list, ex. correction graphs
             return cls(change_type, path[:-1], indices_change=True)
 
         else:
             return cls(change_type, path, indices_change=False)
 
 class FormatterBase:
+    extension   = "txt"
     _section    = "{value}"
     _header     = "{value}"
     _prop       = "{value}"
@@ -158,6 +162,7 @@ class FormatterBase:
         assert False, f"Formatter not found for {identifier}."
 
 class FormatterMarkdown(FormatterBase):
+    extension   = "md"
     _section    = "# {value} [[^](#contents)]"
     _header     = "### {value}"
     _prop       = "`{value}`"
@@ -188,15 +193,17 @@ class FormatterText(FormatterBase):
     _begin_diff = "---"
     _end_diff   = "---"
 
+_Loader = Callable[[Table, GameVersion, set[str] | None], dict]
+
 def _get_item_changes(old_data: dict, new_data: dict) -> tuple[list[str], list[str], _Change.Collection]:
-    diff = DeepDiff(old_data, new_data, view="tree")
+    added = [key for key in new_data.keys() if key not in old_data]
+    removed = [key for key in old_data.keys() if key not in new_data]
 
-    def pop_toplevel(change_type: str) -> list[str]:
-        return [c.path(output_format="list")[0] for c in diff.pop(change_type, [])]
+    # most items are equal, which is much cheaper to tell than walking them with DeepDiff
+    changed = [key for key in old_data.keys() if key in new_data and old_data[key] != new_data[key]]
+    diff = DeepDiff({key: old_data[key] for key in changed}, {key: new_data[key] for key in changed}, view="tree")
 
     item_changes = defaultdict(set)
-    added = pop_toplevel("dictionary_item_added")
-    removed = pop_toplevel("dictionary_item_removed")
 
     for report_type, changes in diff.items():
         change_type = _ChangeType.get(report_type)
@@ -207,56 +214,127 @@ def _get_item_changes(old_data: dict, new_data: dict) -> tuple[list[str], list[s
 
     return added, removed, item_changes
 
-def generate(from_version: GameVersion, version: GameVersion, out: Path | None, formatter_id: str = "markdown"):
-    formatter = FormatterBase.create(formatter_id)
-    print(f"Generating changelog from {from_version} to {version}...", flush=True)
+def _add_changes(formatter: FormatterBase, old_data: dict, new_data: dict):
+    added, removed, item_changes = _get_item_changes(old_data, new_data)
 
-    for tb in sorted(Table.effective()):
-        print(f"Generating changelog for {tb}...", flush=True)
+    if len(added) > 0:
+        formatter.header(f"New items added")
+        formatter.add_list(added)
 
-        new_data = tb.make_generator(version).generate()
-        old_data = tb.make_generator(from_version).generate()
+    if len(removed) > 0:
+        formatter.header(f"Items removed")
+        formatter.add_list(removed)
+
+    for item_name, changes in item_changes.items():
+        formatter.header(item_name)
+
+        for change in changes:
+            if len(change.property_path) > 0:
+                formatter.prop(change.display)
 
-        added, removed, item_changes = _get_item_changes(old_data, new_data)
+            formatter.begin_diff()
+
+            old_value = change.navigate(old_data[item_name])
+            new_value = change.navigate(new_data[item_name])
+
+            if change.indices_change:
+                # Differ compares elements as strings, ex. attack power per level
+                for line in Differ().compare([*map(as_str, old_value)], [*map(as_str, new_value)]):
+                    if not line.startswith("?"):
+                        formatter.line(line)
+
+            else:
+                if change.change_type in [_ChangeType.VALUE, _ChangeType.REMOVED]:
+                    formatter.line("-", old_value)
+
+                if change.change_type in [_ChangeType.VALUE, _ChangeType.ADDED]:
+                    formatter.line("+", new_value)
+
+            formatter.end_diff()
+            formatter.line("")
+
+def _create(from_version: GameVersion, version: GameVersion, formatter_id: str, incremental: bool, load: _Loader) -> FormatterBase:
+    formatter = FormatterBase.create(formatter_id)
+    source_diff = SourceDiff(from_version, version) if incremental else None
 
+    for tb in sorted(Table.effective()):
         formatter.section(tb.title)
 
-        if len(added) > 0:
-            formatter.header(f"New items added")
-            formatter.add_list(added)
+        keys = None if source_diff is None else source_diff.affected_keys(tb)
 
-        if len(removed) > 0:
-            formatter.header(f"Items removed")
-            formatter.add_list(removed)
+        if keys is not None and len(keys) == 0:
+            print(f"Skipping changelog for {tb}, no sources changed", flush=True)
+            continue
 
-        for item_name, changes in item_changes.items():
-            formatter.header(item_name)
+        print(f"Generating changelog for {tb}{'' if keys is None else f' ({len(keys)} items)'}...", flush=True)
 
-            for change in changes:
-                formatter.prop(change.display)
-                formatter.begin_diff()
+        new_data = load(tb, version, keys)
+        old_data = load(tb, from_version, keys)
 
-                old_value = change.navigate(old_data[item_name])
-                new_value = change.navigate(new_data[item_name])
+        _add_changes(formatter, old_data, new_data)
 
-                if change.indices_change:
-                    for line in Differ().compare(old_value, new_value):
-                        if not line.startswith("?"):
-                            formatter.line(line)
+    return formatter
 
-                else:
-                    if change.change_type in [_ChangeType.VALUE, _ChangeType.REMOVED]:
-                        formatter.line("-", old_value)
+def _generate_items(tb: Table, version: GameVersion, keys: set[str] | None) -> dict:
+    return tb.make_generator(version).generate(keys=keys)
 
-                    if change.change_type in [_ChangeType.VALUE, _ChangeType.ADDED]:
-                        formatter.line("+", new_value)
+def _cached_items(tb: Table, version: GameVersion, keys: set[str] | None) -> dict:
+    data = GenerationCache.default().get(tb, tb.spec.latest_api(), version)
+    return data if keys is None else {key: value for key, value in data.items() if key in keys}
 
-                formatter.end_diff()
-                formatter.line("")
+def generate(from_version: GameVersion, version: GameVersion, out: Path | None, formatter_id: str = "markdown", incremental: bool = True):
+    """
+    Write changes between the versions. Unless `incremental` is disabled, only items
+    whose gamedata might have changed are generated and compared.
+    """
+    print(f"Generating changelog from {from_version} to {version}...", flush=True)
+    formatter = _create(from_version, version, formatter_id, incremental, _generate_items)
 
     if out is None:
         formatter.write(stdout) # type: ignore
 
     else:
         with open(out, mode="w", encoding="utf-8") as f:
-            formatter.write(f)
\ No newline at end of file
+            formatter.write(f)
+
+def _cache_tables(tables: list[Table], version: GameVersion):
+    for tb in tables:
+        GenerationCache.default().get(tb, tb.spec.latest_api(), version)
+
+def _generate_pair(from_version: GameVersion, version: GameVersion, out: Path, formatter_id: str, incremental: bool) -> Path:
+    print(f"Generating changelog from {from_version} to {version}...", flush=True)
+    formatter = _create(from_version, version, formatter_id, incremental, _cached_items)
+    destination = out / f"{version}.{formatter.extension}"
+
+    with open(destination, mode="w", encoding="utf-8") as f:
+        formatter.write(f)
+
+    return destination
+
+def generate_matrix(versions: list[GameVersion], out: Path, formatter_id: str = "markdown", incremental: bool = True, jobs: int = 1) -> list[Path]:
+    """
+    Write changes between every consecutive pair of the versions to `out`, one file
+    named after the newer version of each pair. Tables of every version are generated
+    once into the generation cache and read by both changelogs involving the version.
+    With more than one job, versions are generated and then pairs compared by a
+    process pool.
+    """
+    versions = sorted(versions)
+    pairs = list(zip(versions, versions[1:]))
+    tables = sorted(Table.effective())
+
+    out.mkdir(parents=True, exist_ok=True)
+
+    if jobs <= 1:
+        for version in versions:
+            _cache_tables(tables, version)
+
+        return [_generate_pair(from_version, version, out, formatter_id, incremental) for from_version, version in pairs]
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # every version is in the cache before any pair reads it, so none is generated twice
+        generating = [executor.submit(_cache_tables, group, version) for version in versions for group in group_tables(tables)]
+        [future.result() for future in generating]
+
+        comparing = [executor.submit(_generate_pair, from_version, version, out, formatter_id, incremental) for from_version, version in pairs]
+        return [future.result() for future in comparing]
\ No newline at end of file
@@ -1,5 +1,6 @@
 import re
 from enum import Enum
+from dataclasses import fields, is_dataclass
 from operator import add
 from itertools import repeat
 from pathlib import Path
@@ -76,7 +77,27 @@ def remove_nulls(val: dict | list | Any) -> dict | list | Any:
     else:
         return val
 
+def _dataclass_no_nulls(val: Any) -> Any:
+    if is_dataclass(val) and not isinstance(val, type):
+        return {f.name: _dataclass_no_nulls(v) for f in fields(val) if (v := getattr(val, f.name)) is not None}
+
+    if isinstance(val, list):
+        return [_dataclass_no_nulls(x) for x in val if x is not None]
+
+    if isinstance(val, dict):
+        return {k: _dataclass_no_nulls(v) for k, v in val.items() if v is not None}
+
+    return val
+
 def pydantic_encoder_no_nulls(obj: Any) -> Any:
+    """
+    Same as `pydantic_encoder` followed by `remove_nulls`, but dataclasses are converted
+    in a single pass which skips None values, instead of copied whole with `asdict`.
+    Remaining values are plain or encoded by another call to this function.
+    """
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return _dataclass_no_nulls(obj)
+
     return remove_nulls(pydantic_encoder(obj))
 
 def get_filename(name: str) -> str:
@@ -28,7 +28,7 @@ def get_changing_fields(effect_ids: dict[int, set[str]], effects: ParamDict) ->
     changing_fields = set()
     null_effect = effects[2] # IDs 0 and 1 seem to have some properties filled in
 
-    for field in null_effect.field_dict.keys():
+    for field in null_effect.fields:
         if field in _IGNORED_FIELDS:
             continue
 
@@ -0,0 +1,138 @@
+import json
+from time import perf_counter
+from pathlib import Path
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Iterable, NamedTuple, TextIO
+
+from erdb.table import Table
+from erdb.utils.common import pydantic_encoder_no_nulls
+from erdb.utils.generation_cache import GenerationCache
+from erdb.utils.table_formats import SQLITE_FILENAME, extension, write_msgpack, write_parquet, write_sqlite
+from erdb.typing.game_version import GameVersion
+
+
+class GenerationTiming(NamedTuple):
+    version: GameVersion
+    table: Table
+    elements: int
+    seconds: float
+
+    def __str__(self) -> str:
+        return f"{self.version} {self.table}: {self.elements} elements in {self.seconds:.2f}s"
+
+def group_tables(tables: Iterable[Table]) -> list[list[Table]]:
+    """
+    Group tables reading the same main param, so that the worker which loads it
+    serves every table built on top of it. Grouping by every shared file would
+    put nearly all tables in one group, as most of them reference SpEffectParam
+    or goods messages.
+    """
+    groups: dict[str, list[Table]] = {}
+
+    for tb in sorted(tables):
+        groups.setdefault(tb.param_name, []).append(tb)
+
+    return list(groups.values())
+
+def write_json(items: Iterable[tuple[str, Any]], out: TextIO, minimize: bool) -> int:
+    """
+    Write the items as a JSON object, encoding one item at a time. The output is the
+    same as `json.dump` of a dictionary of the items, which is never built.
+    """
+    kwargs = {"separators": (",", ":")} if minimize else {"indent": 4}
+    encode = partial(json.dumps, ensure_ascii=False, default=pydantic_encoder_no_nulls, allow_nan=False, **kwargs)
+
+    # strings cannot contain raw newlines, indenting every line of an item nests it in the object
+    first, separator, key_separator, indent = ("", ",", ":", "") if minimize else ("\n    ", ",\n    ", ": ", "    ")
+    count = 0
+
+    out.write("{")
+
+    for key, value in items:
+        out.write(separator if count > 0 else first)
+        out.write(encode(key) + key_separator + encode(value).replace("\n", "\n" + indent))
+        count += 1
+
+    out.write("}" if minimize or count == 0 else "\n}")
+    return count
+
+def _write(items: Iterable[tuple[str, Any]], tb: Table, destination: Path, minimize: bool, output_format: str) -> int:
+    if output_format == "sqlite":
+        output_file = destination / SQLITE_FILENAME
+        print(f"Output file: {output_file}, table \"{tb}\"", flush=True)
+        return write_sqlite(items, output_file, str(tb))
+
+    output_file = destination / f"{tb}.{extension(output_format)}"
+    print(f"Output file: {output_file}", flush=True)
+
+    if output_file.exists():
+        print(f"Output file exists and will be overridden", flush=True)
+
+    if output_format == "parquet":
+        return write_parquet(items, output_file)
+
+    if output_format == "msgpack":
+        with open(output_file, mode="wb") as f:
+            return write_msgpack(items, f)
+
+    with open(output_file, mode="w", encoding="utf-8") as f:
+        return write_json(items, f, minimize)
+
+def generate_table(tb: Table, version: GameVersion, out: Path | TextIO, minimize: bool, output_format: str = "json") -> GenerationTiming:
+    """
+    Generate the table into `out/<version>/<table>.<extension>`, or the version's SQLite
+    database. If `out` is a stream, JSON documents or MessagePack maps are written into it,
+    JSON one document per line if minimized.
+    """
+    start = perf_counter()
+
+    print(f"\n>>> Generating \"{tb}\" from version {version}", flush=True)
+
+    items = GenerationCache.default().items(tb, tb.spec.latest_api(), version)
+
+    if isinstance(out, Path):
+        destination = out / str(version)
+        destination.mkdir(parents=True, exist_ok=True)
+        elements = _write(items, tb, destination, minimize, output_format)
+
+    elif output_format == "msgpack":
+        elements = write_msgpack(items, out.buffer)
+        out.buffer.flush()
+
+    else:
+        assert output_format == "json", f"Cannot write {output_format} into a stream"
+
+        elements = write_json(items, out, minimize)
+        out.write("\n")
+        out.flush()
+
+    print(f"Generated {elements} elements", flush=True)
+    return GenerationTiming(version, tb, elements, perf_counter() - start)
+
+def _generate_group(tables: list[Table], version: GameVersion, out: Path, minimize: bool, output_format: str) -> list[GenerationTiming]:
+    return [generate_table(tb, version, out, minimize, output_format) for tb in tables]
+
+def generate_tables(tables: list[Table], versions: list[GameVersion], out: Path | TextIO, minimize: bool, jobs: int = 1, output_format: str = "json") -> list[GenerationTiming]:
+    """
+    Generate every table for every version. With more than one job, work is split
+    into (version, table group) tasks executed by a process pool. Each output file
+    (or table of a SQLite database) is written by exactly one task, so the output
+    does not depend on scheduling.
+    """
+    if jobs <= 1 or not isinstance(out, Path):
+        return [generate_table(tb, version, out, minimize, output_format) for version in versions for tb in tables]
+
+    timings: list[GenerationTiming] = []
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(_generate_group, group, version, out, minimize, output_format)
+            for version in versions for group in group_tables(tables)
+        ]
+
+        for future in as_completed(futures):
+            timings += future.result()
+
+    # report in the same order a serial run would
+    return sorted(timings, key=lambda t: (versions.index(t.version), tables.index(t.table)))
\ No newline at end of file
@@ -0,0 +1,158 @@
+import os
+import pickle
+from hashlib import sha256
+from functools import cache
+from pathlib import Path
+from typing import Any, Iterable, Iterator, NamedTuple, Self
+
+from erdb import __version__
+from erdb.table import Table
+from erdb.loaders import PKG_DATA_PATH, gamedata, cache_path
+from erdb.typing.game_version import GameVersion
+from erdb.typing.api_version import ApiVersion
+
+
+@cache
+def _code_digest() -> str:
+    """
+    Fingerprint of the installed ERDB code, development builds all share the same
+    version string so the sources themselves are hashed.
+    """
+    h = sha256(__version__.encode("utf-8"))
+    package = PKG_DATA_PATH.parent
+
+    for path in sorted(package.rglob("*.py")):
+        if PKG_DATA_PATH not in path.parents:
+            h.update(str(path.relative_to(package)).encode("utf-8"))
+            h.update(path.read_bytes())
+
+    return h.hexdigest()
+
+def _contrib_digest(tb: Table) -> str:
+    # not memoized, so that contributions are picked up by a running process
+    h = sha256()
+    path = PKG_DATA_PATH / "contrib" / tb.spec.title()
+    files = sorted(path.iterdir()) if path.is_dir() else []
+
+    for f in files:
+        h.update(f.name.encode("utf-8"))
+        h.update(f.read_bytes())
+
+    return h.hexdigest()
+
+class GenerationCache(NamedTuple):
+    """
+    Persistent storage of generated tables. Entries are keyed by everything the
+    output depends on: the table, API and game version, the content of the
+    gamedata and contrib files, and the ERDB code itself.
+    """
+    path: Path
+
+    @classmethod
+    def default(cls) -> Self:
+        return cls(cache_path() / "tables")
+
+    def digest(self, tb: Table, version: GameVersion) -> str:
+        h = sha256()
+        h.update(_code_digest().encode("utf-8"))
+        h.update(gamedata.digest(version).encode("utf-8"))
+        h.update(_contrib_digest(tb).encode("utf-8"))
+
+        return h.hexdigest()[:32]
+
+    def _entry(self, tb: Table, api: ApiVersion, version: GameVersion) -> Path:
+        return self.path / f"{tb}-v{api}-{version}-{self.digest(tb, version)}.pickle"
+
+    def index_entry(self, name: str, version: GameVersion) -> Path:
+        """
+        Location of an index built from the gamedata of all tables (ex. search), which
+        depends on the version and the ERDB code but on no contrib files.
+        """
+        h = sha256()
+        h.update(_code_digest().encode("utf-8"))
+        h.update(gamedata.digest(version).encode("utf-8"))
+
+        return self.path / f"{name}-{version}-{h.hexdigest()[:32]}.pickle"
+
+    def _read(self, entry: Path) -> Iterator[tuple[str, Any]]:
+        with open(entry, mode="rb") as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
+
+    def _write(self, entry: Path, items: Iterable[tuple[str, Any]]) -> Iterator[tuple[str, Any]]:
+        """
+        Pass the items through, storing them one by one. The entry only appears once
+        every item is stored, a failed write is reported and the items keep flowing.
+        """
+        temp = entry.with_suffix(f".{os.getpid()}.tmp")
+        f = None
+
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            f = open(temp, mode="wb")
+
+        except OSError as e:
+            print(f"WARNING: Cannot write generation cache to {entry}: {e}", flush=True)
+
+        try:
+            for item in items:
+                if f is not None:
+                    try:
+                        pickle.dump(item, f)
+                    except OSError as e:
+                        print(f"WARNING: Cannot write generation cache to {entry}: {e}", flush=True)
+                        f.close()
+                        f = None
+
+                yield item
+
+            if f is not None:
+                f.close()
+
+                try:
+                    # outdated entries of the same table/api/version are never read again
+                    for outdated in self.path.glob(f"{entry.name.rsplit('-', 1)[0]}-*.pickle"):
+                        outdated.unlink(missing_ok=True)
+
+                    os.replace(temp, entry)
+
+                except OSError as e:
+                    print(f"WARNING: Cannot write generation cache to {entry}: {e}", flush=True)
+
+        finally:
+            if f is not None:
+                f.close()
+            temp.unlink(missing_ok=True)
+
+    def load(self, tb: Table, api: ApiVersion, version: GameVersion) -> dict | None:
+        try:
+            return dict(self._read(self._entry(tb, api, version)))
+
+        except (OSError, pickle.UnpicklingError):
+            return None
+
+    def store(self, tb: Table, api: ApiVersion, version: GameVersion, data: dict[str, Any]):
+        for _ in self._write(self._entry(tb, api, version), data.items()):
+            pass
+
+    def items(self, tb: Table, api: ApiVersion, version: GameVersion) -> Iterator[tuple[str, Any]]:
+        """
+        Items of the table one at a time, so that neither reading nor generating and
+        storing an entry requires the whole table in memory.
+        """
+        entry = self._entry(tb, api, version)
+
+        if entry.exists():
+            yield from self._read(entry)
+
+        else:
+            yield from self._write(entry, tb.make_generator(version).iterate(api))
+
+    def get(self, tb: Table, api: ApiVersion, version: GameVersion) -> dict[str, Any]:
+        if (data := self.load(tb, api, version)) is not None:
+            return data
+
+        return dict(self._write(self._entry(tb, api, version), tb.make_generator(version).iterate(api)))
\ No newline at end of file
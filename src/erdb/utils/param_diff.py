@@ -0,0 +1,178 @@
+import json
+from csv import reader
+from io import TextIOBase
+from heapq import merge
+from itertools import groupby, islice
+from operator import itemgetter
+from typing import Callable, Iterable, Iterator, NamedTuple
+
+from erdb.loaders import gamedata
+from erdb.loaders.msg_store import iterate_msgs
+from erdb.typing.game_version import GameVersion
+
+
+"""
+Row and field level differences of a raw param or FMG file between two versions,
+without going through any table spec. Both files are streamed from the gamedata store
+in ID order and merge-joined, so memory is bounded by a few rows even for params like
+SpEffectParam.
+
+Files are mostly sorted by ID, but some consist of a few ascending runs, ex. rows
+appended at the end of SpEffectParam. A first pass only finds where the runs begin,
+afterwards every run is streamed separately and the runs are merged.
+"""
+
+OUTPUT_FORMATS = ("jsonl", "markdown")
+
+_Row = tuple[int, list[str]]
+_Opener = Callable[[], Iterator[_Row]]
+
+class RowChange(NamedTuple):
+    id: int
+    name: str
+    change: str # "added", "removed" or "changed"
+    fields: dict[str, tuple[str | None, str | None]] # field -> (old, new)
+
+def _param_fields(name: str, version: GameVersion) -> list[str]:
+    with gamedata.stream_text(version, f"{name}.csv") as f:
+        return next(reader(f, delimiter=";"))
+
+def _param_rows(name: str, version: GameVersion) -> Iterator[_Row]:
+    with gamedata.stream_text(version, f"{name}.csv") as f:
+        rows = reader(f, delimiter=";")
+        next(rows)
+
+        for row in rows:
+            yield int(row[0]), row
+
+def _msg_rows(name: str, version: GameVersion) -> Iterator[_Row]:
+    # same as loaded messages, null entries do not exist
+    for index, text in iterate_msgs(name, version):
+        yield index, [text]
+
+def _runs(open_rows: _Opener) -> list[tuple[int, int | None]]:
+    starts = [0]
+    last = None
+
+    for pos, (index, _) in enumerate(open_rows()):
+        if last is not None and index < last:
+            starts.append(pos)
+        last = index
+
+    return list(zip(starts, starts[1:] + [None]))
+
+def _sorted_rows(open_rows: _Opener) -> Iterator[_Row]:
+    runs = [islice(open_rows(), start, stop) for start, stop in _runs(open_rows)]
+
+    # merge is stable and runs are in file order, duplicate IDs resolve to the last row like loaded params
+    for _, group in groupby(merge(*runs, key=itemgetter(0)), key=itemgetter(0)):
+        *_, last = group
+        yield last
+
+def _in_range(rows: Iterator[_Row], id_min: int | None, id_max: int | None) -> Iterator[_Row]:
+    for row in rows:
+        if id_min is not None and row[0] < id_min:
+            continue
+
+        if id_max is not None and row[0] > id_max:
+            return
+
+        yield row
+
+def _join(old: Iterator[_Row], new: Iterator[_Row]) -> Iterator[tuple[int, list[str] | None, list[str] | None]]:
+    old_row, new_row = next(old, None), next(new, None)
+
+    while old_row is not None or new_row is not None:
+        if new_row is None or (old_row is not None and old_row[0] < new_row[0]):
+            yield old_row[0], old_row[1], None # type: ignore
+            old_row = next(old, None)
+
+        elif old_row is None or new_row[0] < old_row[0]:
+            yield new_row[0], None, new_row[1]
+            new_row = next(new, None)
+
+        else:
+            yield old_row[0], old_row[1], new_row[1]
+            old_row, new_row = next(old, None), next(new, None)
+
+def is_param(name: str, version: GameVersion) -> bool:
+    names = gamedata.files(version)
+    assert f"{name}.csv" in names or f"{name}.fmg.xml" in names, f"No param or FMG file \"{name}\" found in {version}"
+    return f"{name}.csv" in names
+
+def diff_rows(
+    name: str,
+    old: GameVersion,
+    new: GameVersion,
+    *,
+    id_min: int | None = None,
+    id_max: int | None = None,
+    fields: list[str] | None = None,
+    exclude_fields: list[str] | None = None,
+) -> Iterator[RowChange]:
+    """
+    Rows added, removed or changed in the param or FMG file, in ID order. Only the
+    `fields` if specified and none of the `exclude_fields` are compared and listed.
+    """
+    if is_param(name, new) and is_param(name, old):
+        old_fields, new_fields = _param_fields(name, old), _param_fields(name, new)
+        opener = _param_rows
+
+    else:
+        old_fields = new_fields = ["text"]
+        opener = _msg_rows
+
+    # "Row ID" is the join key, fields only present in the old version come last
+    compared = [f for f in new_fields + [f for f in old_fields if f not in new_fields] if f != "Row ID"]
+    compared = [f for f in compared if (fields is None or f in fields) and (exclude_fields is None or f not in exclude_fields)]
+
+    old_pos = {f: i for i, f in enumerate(old_fields)}
+    new_pos = {f: i for i, f in enumerate(new_fields)}
+
+    def get(row: list[str] | None, pos: dict[str, int], field: str) -> str | None:
+        return None if row is None or field not in pos or pos[field] >= len(row) else row[pos[field]]
+
+    old_rows = _in_range(_sorted_rows(lambda: opener(name, old)), id_min, id_max)
+    new_rows = _in_range(_sorted_rows(lambda: opener(name, new)), id_min, id_max)
+
+    for index, old_row, new_row in _join(old_rows, new_rows):
+        values = {f: (get(old_row, old_pos, f), get(new_row, new_pos, f)) for f in compared}
+        row_name = get(new_row, new_pos, "Row Name") or get(old_row, old_pos, "Row Name") or ""
+
+        if old_row is None:
+            yield RowChange(index, row_name, "added", values)
+
+        elif new_row is None:
+            yield RowChange(index, row_name, "removed", values)
+
+        elif len(changed := {f: v for f, v in values.items() if v[0] != v[1]}) > 0:
+            yield RowChange(index, row_name, "changed", changed)
+
+def write_jsonl(changes: Iterable[RowChange], out: TextIOBase) -> int:
+    count = 0
+
+    for change in changes:
+        fields = {f: {"old": old, "new": new} for f, (old, new) in change.fields.items()}
+        out.write(json.dumps({"id": change.id, "name": change.name, "change": change.change, "fields": fields}, ensure_ascii=False) + "\n")
+        count += 1
+
+    return count
+
+def write_markdown(changes: Iterable[RowChange], out: TextIOBase, name: str, old: GameVersion, new: GameVersion) -> int:
+    def cell(value: str | None) -> str:
+        return "" if value is None else value.replace("|", "\\|").replace("\n", "<br>")
+
+    out.write(f"# {name} {old} -> {new}\n")
+    count = 0
+
+    for change in changes:
+        title = f"{change.id} {change.name}".rstrip()
+        out.write(f"\n### {title} ({change.change})\n\n")
+        out.write(f"| Field | {old} | {new} |\n| --- | --- | --- |\n")
+
+        for field, (old_value, new_value) in change.fields.items():
+            out.write(f"| {field} | {cell(old_value)} | {cell(new_value)} |\n")
+
+        count += 1
+
+    return count
\ No newline at end of file
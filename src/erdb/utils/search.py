@@ -0,0 +1,139 @@
+import os
+import re
+import pickle
+from bisect import bisect_left
+from math import log
+from typing import NamedTuple, Self
+
+from erdb.table import Table
+from erdb.table._common import _remove_accents
+from erdb.utils.generation_cache import GenerationCache
+from erdb.typing.game_version import GameVersion
+
+
+"""
+Full-text search over names, summaries and descriptions of the items of every table,
+as found in their messages. Text is folded to lowercase without accents and split into
+words, every word of a query has to match a word of an item either whole or as its
+beginning. Items are ranked by TF-IDF of the matched words, weighted by the message
+they are found in, while prefix matches count less than whole words.
+
+Tables without descriptions (ex. attack power) only repeat items of other tables and
+are not indexed.
+"""
+
+_FIELD_WEIGHTS = {"names": 3.0, "summaries": 1.5, "descriptions": 1.0}
+_PREFIX_WEIGHT = 0.5
+
+_WORD = re.compile(r"\w+")
+
+class SearchResult(NamedTuple):
+    table: Table
+    key: str
+    name: str
+    score: float
+
+def tokenize(text: str) -> list[str]:
+    return _WORD.findall(_remove_accents(text).casefold())
+
+def _searchable(tb: Table) -> bool:
+    return all(field in tb.spec.msg_retrievers for field in ["names", "descriptions"])
+
+SEARCHABLE_TABLES: list[Table] = sorted(filter(_searchable, Table.effective()))
+
+class SearchIndex(NamedTuple):
+    documents: list[tuple[Table, str, str]] # table, key and name of items
+    terms: list[str]                        # sorted
+    postings: list[dict[int, float]]        # weight of a term in every document containing it, by term
+
+    def search(self, query: str, limit: int = 20, tables: list[Table] | None = None) -> list[SearchResult]:
+        words = tokenize(query)
+        scores: dict[int, float] | None = None
+
+        for word in set(words):
+            matches: dict[int, float] = {}
+            pos = bisect_left(self.terms, word)
+
+            while pos < len(self.terms) and self.terms[pos].startswith(word):
+                weight = 1.0 if self.terms[pos] == word else _PREFIX_WEIGHT
+
+                # the best matching term of a document counts, not all of them
+                for doc, tf in self.postings[pos].items():
+                    matches[doc] = max(matches.get(doc, 0.0), weight * tf)
+
+                pos += 1
+
+            # rarity of the query word itself, otherwise rare longer words outrank the word
+            idf = log(1 + len(self.documents) / max(len(matches), 1))
+            scores = {doc: idf * tf for doc, tf in matches.items()} if scores is None else {doc: score + idf * matches[doc] for doc, score in scores.items() if doc in matches}
+
+        if scores is None:
+            return []
+
+        results = [SearchResult(*self.documents[doc], round(score, 4)) for doc, score in scores.items()]
+        results = [r for r in results if tables is None or r.table in tables]
+
+        return sorted(results, key=lambda r: (-r.score, r.name, r.table))[:limit]
+
+    @classmethod
+    def build(cls, version: GameVersion) -> Self:
+        documents: list[tuple[Table, str, str]] = []
+        weights: dict[str, dict[int, float]] = {}
+
+        for tb in SEARCHABLE_TABLES:
+            gen = tb.make_generator(version)
+
+            # the same rows as generated items, the last row of a duplicate key
+            rows = {key: index for index, key in gen.item_keys().items()}
+
+            for key, index in rows.items():
+                doc = len(documents)
+                documents.append((tb, key, tb.spec.parse_name(gen.data.msgs["names"][index])))
+
+                for field, field_weight in _FIELD_WEIGHTS.items():
+                    if (text := gen.data.msgs[field].get(index) if field in gen.data.msgs else None) is None:
+                        continue
+
+                    words = tokenize(text)
+
+                    for word in set(words):
+                        term = weights.setdefault(word, {})
+                        term[doc] = term.get(doc, 0.0) + field_weight * (1 + log(words.count(word)))
+
+        terms = sorted(weights.keys())
+        return cls(documents, terms, [weights[t] for t in terms])
+
+    @classmethod
+    def load(cls, version: GameVersion, cache: GenerationCache | None = None) -> Self:
+        """
+        Index of the version stored in the generation cache, built and stored first if
+        there is no up-to-date one.
+        """
+        cache = GenerationCache.default() if cache is None else cache
+        entry = cache.index_entry("search", version)
+
+        try:
+            with open(entry, mode="rb") as f:
+                return cls(*pickle.load(f))
+
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+
+        index = cls.build(version)
+
+        try:
+            cache.path.mkdir(parents=True, exist_ok=True)
+
+            # outdated indexes of the same version are never read again
+            for outdated in cache.path.glob(f"search-{version}-*.pickle"):
+                outdated.unlink(missing_ok=True)
+
+            temp = entry.with_suffix(f".{os.getpid()}.tmp")
+            with open(temp, mode="wb") as f:
+                pickle.dump(tuple(index), f)
+            os.replace(temp, entry)
+
+        except OSError as e:
+            print(f"WARNING: Cannot write search index to {entry}: {e}", flush=True)
+
+        return index
\ No newline at end of file
@@ -0,0 +1,170 @@
+import numpy as np
+from bisect import bisect_right
+
+from erdb.table import Table
+from erdb.loaders import gamedata
+from erdb.loaders.params import load_table, load_msg
+from erdb.loaders.param_store import ParamTable
+from erdb.utils.common import get_filename
+from erdb.typing.game_version import GameVersion
+
+
+"""
+Differences between the gamedata of two versions, narrowing down the items a changelog
+has to regenerate. Files with the same content hash in both versions are unchanged,
+others are compared row by row.
+
+An item is affected if any row of its family (its own row and the following rows up to
+the next item, ex. affinities of an armament) changed, or if the family references a
+changed row. Rows of other params with the same ID as a family row are referenced
+implicitly. Other references are not typed, any integer field of an item is considered
+to reference rows at most `_REFERENCE_SPAN` IDs above its value, which covers rows
+addressed with an offset like reinforcement levels or upgraded status effects. Rows of other params
+referencing changed rows exactly are considered changed themselves, so effects referencing
+other effects are followed transitively. Shop params reference items instead of being
+referenced, any change to them affects entire tables.
+"""
+
+_REFERENCE_SPAN = 25
+
+def _changed_rows(old: ParamTable, new: ParamTable) -> set[int]:
+    # duplicate IDs resolve to the last row, same as loaded params
+    old_pos = {index: pos for pos, index in enumerate(old.ids)}
+    new_pos = {index: pos for pos, index in enumerate(new.ids)}
+    changed = old_pos.keys() ^ new_pos.keys()
+
+    if set(old.fields) != set(new.fields):
+        return changed | old_pos.keys()
+
+    common = sorted(old_pos.keys() & new_pos.keys())
+    old_common = np.array([old_pos[i] for i in common], dtype=np.int64)
+    new_common = np.array([new_pos[i] for i in common], dtype=np.int64)
+    differs = np.zeros(len(common), dtype=bool)
+
+    for field in new.fields:
+        old_column, new_column = old.columns[field], new.columns[field]
+
+        if old_column.blob is None and new_column.blob is None:
+            differs |= np.frombuffer(old_column.values, dtype=np.int64)[old_common] != np.frombuffer(new_column.values, dtype=np.int64)[new_common]
+
+        else: # text is the same as in the CSV regardless of the column type
+            differs |= np.fromiter((old_column.get(o) != new_column.get(n) for o, n in zip(old_common, new_common)), dtype=bool, count=len(common))
+
+    return changed | {common[i] for i in np.flatnonzero(differs)}
+
+def _referencing(table: ParamTable, dirty: np.ndarray, span: int) -> set[int]:
+    """
+    IDs of rows with an integer field referencing any of the sorted `dirty` IDs,
+    or a row at most `span` IDs above it.
+    """
+    if len(dirty) == 0:
+        return set()
+
+    hit = np.zeros(len(table), dtype=bool)
+
+    for field, column in table.columns.items():
+        if field == "Row ID" or column.blob is not None:
+            continue
+
+        values = np.frombuffer(column.values, dtype=np.int64)
+        nearest = np.searchsorted(dirty, values) # first dirty ID not below the value
+        found = nearest < len(dirty)
+
+        hit |= (values >= 0) & found & (dirty[np.minimum(nearest, len(dirty) - 1)] - values <= span)
+
+    return {table.ids[pos] for pos in np.flatnonzero(hit)}
+
+class SourceDiff:
+    old: GameVersion
+    new: GameVersion
+
+    _old_files: dict[str, str]
+    _new_files: dict[str, str]
+    _params: dict[str, set[int]]
+    _msgs: dict[str, set[int]]
+
+    def __init__(self, old: GameVersion, new: GameVersion) -> None:
+        self.old = old
+        self.new = new
+        self._old_files = gamedata.files(old)
+        self._new_files = gamedata.files(new)
+        self._params = {}
+        self._msgs = {}
+
+    def changed(self, filename: str) -> bool:
+        return self._old_files.get(filename) != self._new_files.get(filename)
+
+    def param(self, name: str) -> set[int]:
+        """
+        IDs of rows added, removed or changed in the param.
+        """
+        if not self.changed(f"{name}.csv"):
+            return set()
+
+        if (rows := self._params.get(name)) is None:
+            rows = self._params[name] = _changed_rows(load_table(name, self.old), load_table(name, self.new))
+
+        return rows
+
+    def msg(self, name: str) -> set[int]:
+        """
+        IDs of messages added, removed or changed in the file.
+        """
+        if not self.changed(f"{name}.fmg.xml"):
+            return set()
+
+        if (ids := self._msgs.get(name)) is None:
+            old, new = load_msg(name, self.old), load_msg(name, self.new)
+            ids = self._msgs[name] = {i for i in old.keys() | new.keys() if old.get(i) != new.get(i)}
+
+        return ids
+
+    def affected_keys(self, tb: Table) -> set[str] | None:
+        """
+        Keys of items which might differ between the versions, None if any item might.
+        """
+        spec = tb.spec
+        main = spec.main_param_retriever.param_name
+        referenced = {r.param_name for r in spec.param_retrievers.values()} - {main}
+
+        if any(self.changed(f"{name}.csv") for r in spec.shop_retrievers.values() for name in r.param_names):
+            return None
+
+        main_rows = self.param(main)
+        msg_ids = set().union(*(self.msg(r.file_name) for r in spec.msg_retrievers.values()))
+        dirty = set().union(main_rows, msg_ids, *map(self.param, referenced))
+
+        # rows referencing changed rows are changed as well
+        while True:
+            dirty_ids = np.array(sorted(dirty), dtype=np.int64)
+            found = set().union(*(_referencing(load_table(name, self.new), dirty_ids, 0) for name in referenced)) - dirty
+
+            if len(found) == 0:
+                break
+
+            dirty |= found
+
+        old_contrib = spec.contrib_retriever.get(spec.title(), self.old)
+        new_contrib = spec.contrib_retriever.get(spec.title(), self.new)
+        contrib = {f for f in old_contrib.keys() | new_contrib.keys() if old_contrib.get(f) != new_contrib.get(f)}
+
+        keys: set[str] = set()
+
+        for version in [self.old, self.new]:
+            gen = tb.make_generator(version)
+            items = gen.item_keys()
+            item_ids = sorted(items.keys())
+
+            # params indexed by the ID of the main row (ex. Magic) are implicit references
+            affected = dirty & gen.data.main_param.keys()
+
+            if version == self.new and len(dirty) > 0:
+                affected |= _referencing(load_table(main, version), np.array(sorted(dirty), dtype=np.int64), _REFERENCE_SPAN) & gen.data.main_param.keys()
+
+            for index in affected:
+                if (family := bisect_right(item_ids, index) - 1) >= 0:
+                    keys.add(items[item_ids[family]])
+
+            keys |= {key for key in items.values() if get_filename(key) in contrib}
+
+        return keys
\ No newline at end of file
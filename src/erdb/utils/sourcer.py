@@ -7,7 +7,7 @@ import xml.etree.ElementTree as xmltree
 from PIL import Image
 from io import BytesIO
 from csv import DictReader
-from zipfile import ZipFile, ZIP_DEFLATED
+from zipfile import ZipFile
 from itertools import chain, islice
 from time import sleep
 from hashlib import md5
@@ -15,7 +15,7 @@ from pathlib import Path
 from typing import NamedTuple, Self
 
 from erdb.table import Table
-from erdb.loaders import PKG_DATA_PATH
+from erdb.loaders import PKG_DATA_PATH, gamedata
 from erdb.utils.common import Destination, get_filename
 from erdb.utils.cloudflare_images_client import CloudflareImagesClient
 from erdb.typing.game_version import GameVersion, GameVersionInstance
@@ -246,14 +246,14 @@ def source_gamedata(game_dir: Path, ignore_checksum: bool, version: GameVersion
 
     print(f"Effective version: {version}.", flush=True)
 
-    archive = PKG_DATA_PATH / "gamedata" / f"{version}.zip"
-    assert not archive.exists(), f"{archive} exists and is not empty."
+    assert version not in gamedata.versions(), f"Gamedata of version {version} already exists."
 
-    print(f"Adding files to archive...", flush=True)
-    with ZipFile(archive, "w", compression=ZIP_DEFLATED) as z:
-        for filename, metadata in manifest["gamedata"].items():
-            location = metadata["location"].format(game_dir=game_dir)
-            z.write(Path(location) / filename, arcname=filename)
+    print(f"Adding files to gamedata...", flush=True)
+    contents = {
+        filename: (Path(metadata["location"].format(game_dir=game_dir)) / filename).read_bytes()
+        for filename, metadata in manifest["gamedata"].items()
+    }
+    gamedata.add_version(version, contents)
 
     print(f"Sourcing version {version} complete!", flush=True)
 
@@ -467,4 +467,4 @@ def source_icons(game_dir: Path, tables: list[Table], size: int, file_format: st
                         cf_images.upload(data.getvalue(), filename)
 
     except: raise
-    finally: _process_cache(table_dir, names_dir, icon_dir, keep_cache=keep_cache)
+    finally: _process_cache(table_dir, names_dir, icon_dir, keep_cache=keep_cache)
\ No newline at end of file
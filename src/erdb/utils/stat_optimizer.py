@@ -0,0 +1,183 @@
+import numpy as np
+from enum import Enum
+from itertools import combinations, product
+from typing import NamedTuple
+
+from erdb.utils.attack_power import AttackPower, Attributes, StatusEffects
+from erdb.utils.attack_power_batch import BatchCalculator
+
+
+"""
+Distribution of attribute points maximizing the attack power of an armament.
+
+Scaling of every attack type is a sum of per-attribute contributions, therefore
+the (optionally weighted) attack power is a sum of one function per attribute and
+the best distribution of a point budget is found with a knapsack over the five
+attributes. Correction graphs are monotone and piecewise: spending points only
+pays off where a function reaches a new maximum, every other value is dominated
+by a cheaper one and is pruned before the search.
+
+The game caps scaling from below by the lowest contribution, which matters when
+several requirements are left unmet. Such distributions are searched separately:
+unmet attributes are not worth any points, and each attack type either scales
+with the sum or is capped, so every combination of both is again separable.
+Candidates of all searches are finally compared using the exact calculation.
+"""
+
+class StartingClass(str, Enum):
+    VAGABOND = "vagabond"
+    WARRIOR = "warrior"
+    HERO = "hero"
+    BANDIT = "bandit"
+    ASTROLOGER = "astrologer"
+    PROPHET = "prophet"
+    SAMURAI = "samurai"
+    PRISONER = "prisoner"
+    CONFESSOR = "confessor"
+    WRETCH = "wretch"
+
+    @property
+    def level(self) -> int:
+        return _STARTING_CLASSES[self][0]
+
+    @property
+    def attributes(self) -> Attributes:
+        return Attributes(*_STARTING_CLASSES[self][1:])
+
+# rune level, strength, dexterity, intelligence, faith, arcane
+_STARTING_CLASSES: dict[StartingClass, tuple[int, int, int, int, int, int]] = {
+    StartingClass.VAGABOND: (9, 14, 13, 9, 9, 7),
+    StartingClass.WARRIOR: (8, 10, 16, 10, 8, 9),
+    StartingClass.HERO: (7, 16, 9, 7, 8, 11),
+    StartingClass.BANDIT: (5, 9, 13, 9, 8, 14),
+    StartingClass.ASTROLOGER: (6, 8, 12, 16, 7, 9),
+    StartingClass.PROPHET: (7, 11, 10, 7, 16, 10),
+    StartingClass.SAMURAI: (9, 12, 15, 9, 8, 8),
+    StartingClass.PRISONER: (9, 11, 14, 14, 6, 9),
+    StartingClass.CONFESSOR: (10, 12, 12, 9, 14, 9),
+    StartingClass.WRETCH: (1, 10, 10, 10, 10, 10),
+}
+
+class Allocation(NamedTuple):
+    attributes: Attributes
+    points: int # actually spent, fewer than the budget if more would not increase attack power
+    score: float
+
+def parse_weights(string: str) -> dict[str, float]:
+    """
+    Parse weights in format "{type}={weight},...", ie. "physical=1,bleed=0.5".
+    Types are attack types and status effects.
+    """
+    weights: dict[str, float] = {}
+
+    for part in string.split(","):
+        name, value = part.split("=", maxsplit=1)
+        name = name.strip()
+
+        assert name in AttackPower._fields or name in StatusEffects._fields, f"Invalid weight type: {name}"
+        weights[name] = float(value)
+
+    return weights
+
+def _candidates(gains: np.ndarray, start: int) -> list[tuple[int, float]]:
+    """
+    Values worth investing into: the starting value and every value reaching a new
+    maximum. Values not exceeding the gain of a lower value are dominated.
+    """
+    candidates = [(start, gains[start])]
+
+    for value in range(start + 1, 100):
+        if gains[value] > candidates[-1][1]:
+            candidates.append((value, gains[value]))
+
+    return candidates
+
+def _search(candidates: list[list[tuple[int, float]]], base: Attributes, points: int) -> Attributes | None:
+    """
+    Knapsack over attributes, choosing one candidate value for each without spending
+    more than `points` in total. None if no choice fits within the budget.
+    """
+    # best[b]: highest gain of the attributes so far using no more than b points
+    best = np.zeros(points + 1)
+    choices: list[np.ndarray] = []
+
+    for start, attribute_candidates in zip(base, candidates):
+        gains = np.full(points + 1, -np.inf)
+        chosen = np.full(points + 1, start)
+
+        for value, gain in attribute_candidates:
+            cost = value - start
+            if cost > points:
+                break
+
+            shifted = np.full(points + 1, -np.inf)
+            shifted[cost:] = best[:points + 1 - cost] + gain
+
+            better = shifted > gains
+            gains[better] = shifted[better]
+            chosen[better] = value
+
+        best = gains
+        choices.append(chosen)
+
+    if best[points] == -np.inf:
+        return None
+
+    attributes: list[int] = []
+    remaining = points
+
+    for a in reversed(range(len(base))):
+        value = int(choices[a][remaining])
+        attributes.insert(0, value)
+        remaining -= value - base[a]
+
+    return Attributes(*attributes)
+
+def optimize_attributes(calc: BatchCalculator, combo: int, level: int, base: Attributes, points: int, weights: dict[str, float] | None = None) -> Allocation:
+    """
+    Distribute up to `points` attribute points on top of `base` to maximize the
+    (weighted) attack power of an armament/affinity combination at the given level.
+    Attack power is weighted 1 and status effects 0 if no weights are provided.
+    """
+    weights = {t: 1.0 for t in AttackPower._fields} if weights is None else weights
+
+    assert points >= 0, "Number of points cannot be negative"
+    assert all(w >= 0 for w in weights.values()), "Weights cannot be negative"
+
+    attack_weights = np.array([weights.get(t, 0.0) for t in AttackPower._fields])
+    effect_weights = np.array([weights.get(e, 0.0) for e in StatusEffects._fields])
+
+    # attack type, attribute, value weighted by base damage of each attack type
+    curves = calc.scaling_curves(combo, level) * (attack_weights * calc.base_damage(combo, level))[:, np.newaxis, np.newaxis]
+    effects = effect_weights @ calc.status_curves(combo, level)
+    arcane = Attributes._fields.index("arcane")
+
+    def gains(scaling: np.ndarray) -> np.ndarray:
+        ret = curves[scaling].sum(axis=0)
+        ret[arcane] += effects
+        return ret
+
+    found = [_search([_candidates(g, start) for g, start in zip(gains(np.ones(len(curves), dtype=bool)), base)], base, points)]
+
+    requirements = calc.requirements[combo]
+    unmet = [a for a, start in enumerate(base) if start < requirements[a]]
+
+    for count in range(2, len(unmet) + 1):
+        for left_unmet in combinations(unmet, count):
+            for scaling in product([True, False], repeat=len(curves)):
+                capped_gains = gains(np.array(scaling))
+                found.append(_search([
+                    [(start, 0.0)] if a in left_unmet else _candidates(capped_gains[a], max(start, requirements[a]))
+                    for a, start in enumerate(base)
+                ], base, points))
+
+    candidates = list({a for a in found if a is not None})
+    attack_power = calc.attack_power(candidates, combo, level)
+    status_effects = calc.status_effects(candidates, combo, level)
+
+    scores = (attack_power.base + attack_power.scaling) @ attack_weights + (status_effects.base + status_effects.scaling) @ effect_weights
+    spent = [sum(attributes) - sum(base) for attributes in candidates]
+
+    # highest score, then fewest points spent
+    best = max(range(len(candidates)), key=lambda i: (scores[i], -spent[i]))
+    return Allocation(candidates[best], spent[best], float(scores[best]))
\ No newline at end of file
@@ -0,0 +1,189 @@
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable
+
+from erdb.utils.common import pydantic_encoder_no_nulls
+
+try:
+    import msgpack # type: ignore
+
+except ImportError:
+    msgpack = None
+
+try:
+    import pyarrow # type: ignore
+    import pyarrow.parquet # type: ignore
+
+except ImportError:
+    pyarrow = None
+
+
+"""
+Output formats of generated tables other than JSON, which load faster than parsing
+JSON text. Items hold the same values as in the JSON output, null values removed.
+
+MessagePack keeps the structure as is. Parquet and SQLite store one row per item:
+nested objects are flattened into columns named by the path to the value (ex.
+`absorptions.physical`), lists of plain values stay lists in Parquet and anything
+else within a list is kept as JSON text. Columns mixing types are JSON text as well.
+"""
+
+OUTPUT_FORMATS = ("json", "msgpack", "parquet", "sqlite")
+
+SQLITE_FILENAME = "erdb.sqlite"
+
+# columns most lookups go through, indexed wherever a table has them
+_SQLITE_INDEXED = ["id", "name", "category"]
+
+_Rows = list[dict[str, Any]]
+
+def extension(output_format: str) -> str:
+    return {"msgpack": "msgpack", "parquet": "parquet"}.get(output_format, "json")
+
+def _plain(value: Any) -> Any:
+    # exactly what the JSON output holds: string keys, no enums, no nulls
+    return json.loads(json.dumps(value, ensure_ascii=False, default=pydantic_encoder_no_nulls, allow_nan=False))
+
+def _is_scalar(value: Any) -> bool:
+    return not isinstance(value, (list, dict))
+
+def _flatten(value: Any, column: str, columns: dict[str, Any]):
+    if isinstance(value, dict) and len(value) > 0:
+        for key, nested in value.items():
+            _flatten(nested, f"{column}.{key}" if column else key, columns)
+
+    elif isinstance(value, list) and all(map(_is_scalar, value)):
+        columns[column] = value
+
+    elif _is_scalar(value):
+        columns[column] = value
+
+    else:
+        columns[column] = json.dumps(value, ensure_ascii=False)
+
+def flatten(item: Any) -> dict[str, Any]:
+    """
+    Columns of an item's row, nested objects flattened into dotted paths.
+    """
+    columns: dict[str, Any] = {}
+    _flatten(_plain(item), "", columns)
+    return columns
+
+def _kind(value: Any) -> str:
+    return "bool" if isinstance(value, bool) else type(value).__name__
+
+def _common(kinds: set[str]) -> str | None:
+    """
+    Kind of values of all `kinds`, integers mixed with floats are floats.
+    """
+    if len(kinds) <= 1:
+        return next(iter(kinds), None)
+
+    return "float" if kinds == {"int", "float"} else None
+
+def _normalize(rows: _Rows, lists: bool) -> dict[str, str]:
+    """
+    Make every column hold values of a single kind in place, return the kind of each
+    column in order of appearance. Mixed columns, and lists if not supported, are JSON text.
+    """
+    kinds: dict[str, set[str]] = {}
+    elements: dict[str, set[str]] = {}
+
+    for row in rows:
+        for column, value in row.items():
+            kinds.setdefault(column, set()).add(_kind(value))
+
+            if isinstance(value, list):
+                elements.setdefault(column, set()).update(map(_kind, value))
+
+    def column_kind(column: str) -> str:
+        if kinds[column] != {"list"}:
+            return _common(kinds[column]) or "json"
+
+        # lists which are all empty have no kind of elements, but are lists nonetheless
+        element = _common(elements[column])
+
+        if not lists or (element is None and len(elements[column]) > 0):
+            return "json"
+
+        return f"list[{element or 'str'}]"
+
+    result = {column: column_kind(column) for column in kinds.keys()}
+
+    for row in rows:
+        for column, value in row.items():
+            kind = result[column]
+
+            if kind == "json":
+                row[column] = json.dumps(value, ensure_ascii=False)
+
+            elif kind == "float":
+                row[column] = float(value)
+
+            elif kind == "list[float]":
+                row[column] = [float(v) for v in value]
+
+    return result
+
+def _rows(items: Iterable[tuple[str, Any]]) -> _Rows:
+    # flattened rows are plain values, much smaller than the items themselves
+    return [{"key": key} | flatten(value) for key, value in items]
+
+def write_msgpack(items: Iterable[tuple[str, Any]], out: BinaryIO) -> int:
+    """
+    Write the items as a single map, packed one item at a time.
+    """
+    assert msgpack is not None, "MessagePack output requires the msgpack package, install erdb[msgpack]"
+
+    packer = msgpack.Packer()
+    packed = [packer.pack(key) + packer.pack(_plain(value)) for key, value in items]
+
+    # the size of a map comes first, packed items are kept until it is known
+    out.write(packer.pack_map_header(len(packed)))
+
+    for item in packed:
+        out.write(item)
+
+    return len(packed)
+
+def write_parquet(items: Iterable[tuple[str, Any]], path: Path) -> int:
+    assert pyarrow is not None, "Parquet output requires the pyarrow package, install erdb[parquet]"
+
+    rows = _rows(items)
+    columns = _normalize(rows, lists=True)
+
+    # built by column, otherwise the schema is inferred from the first row only
+    table = pyarrow.table({column: [row.get(column) for row in rows] for column in columns.keys()} or {"key": pyarrow.array([], pyarrow.string())})
+    pyarrow.parquet.write_table(table, path)
+
+    return len(rows)
+
+def _quote(name: str) -> str:
+    return "\"" + name.replace("\"", "\"\"") + "\""
+
+def write_sqlite(items: Iterable[tuple[str, Any]], path: Path, table_name: str) -> int:
+    """
+    Replace `table_name` in the database with one row per item, keyed by `key`.
+    """
+    rows = _rows(items)
+    columns = _normalize(rows, lists=False)
+    columns.pop("key", None)
+
+    types = {"bool": "INTEGER", "int": "INTEGER", "float": "REAL"}
+    definitions = ", ".join(["\"key\" TEXT PRIMARY KEY"] + [f"{_quote(c)} {types.get(kind, 'TEXT')}" for c, kind in columns.items()])
+
+    names = ["key"] + list(columns.keys())
+    insert = f"INSERT INTO {_quote(table_name)} ({', '.join(map(_quote, names))}) VALUES ({', '.join('?' * len(names))})"
+
+    # tables of one version share the database, rows are prepared before locking it
+    with sqlite3.connect(path, timeout=600) as db:
+        db.execute(f"DROP TABLE IF EXISTS {_quote(table_name)}")
+        db.execute(f"CREATE TABLE {_quote(table_name)} ({definitions})")
+        db.executemany(insert, ([row.get(c) for c in names] for row in rows))
+
+        for column in [c for c in _SQLITE_INDEXED if c in columns]:
+            db.execute(f"CREATE INDEX {_quote(f'{table_name}_{column}')} ON {_quote(table_name)} ({_quote(column)})")
+
+    db.close()
+    return len(rows)
\ No newline at end of file
@@ -0,0 +1,58 @@
+import pytest
+
+from erdb.utils.attack_power import ArmamentCalculator, Attributes
+from erdb.utils.armament_ranking import ArmamentRanking
+
+
+@pytest.fixture(scope="module")
+def ranking(calc_data) -> ArmamentRanking:
+    return ArmamentRanking(calc_data)
+
+@pytest.mark.parametrize("sort_by", ["total", "physical", "bleed"])
+def test_sorted_and_matches_calculator(calc_data, ranking, sort_by):
+    attributes = Attributes.from_string("30,40,10,10,25")
+    ranked = ranking.rank(attributes, sort_by=sort_by, limit=20)
+
+    assert len(ranked) == 20
+
+    scores = [r.total if sort_by == "total" else {**r.attack_power, **r.status_effects}[sort_by] for r in ranked]
+    assert scores == sorted(scores, reverse=True)
+
+    for r in ranked:
+        calc = ArmamentCalculator(calc_data, r.name, r.affinity, r.level)
+        attack_power = calc.attack_power(attributes)
+        assert r.total == attack_power.total
+        assert r.attack_power == {t: v.total for t, v in attack_power.items()}
+        assert r.status_effects == {e: v.total for e, v in calc.status_effects(attributes).items()}
+
+def test_filters(calc_data, ranking):
+    attributes = Attributes.from_string("20,20,20,20,20")
+    ranked = ranking.rank(attributes, categories=["Katana"], upgrade_material="Somber Smithing Stone", level=10, limit=100)
+
+    assert len(ranked) > 0
+
+    for r in ranked:
+        armament = calc_data.armaments[r.name]
+        assert armament["category"] == "Katana"
+        assert armament["upgrade_material"] == "Somber Smithing Stone"
+        assert r.level == 4
+
+def test_requirements(calc_data, ranking):
+    attributes = Attributes.from_string("10,10,10,10,10")
+
+    for r in ranking.rank(attributes, limit=100):
+        assert all(a >= req for a, req in zip(attributes, ranking.calc.requirements[ranking.calc.index(r.name, r.affinity)]))
+
+    assert len(ranking.rank(attributes, requirements_met=False, limit=100)) == 100
+
+def test_two_handed(ranking):
+    # 27 strength counts as 40 when two-handing, meeting more requirements
+    one_handed = ranking.rank(Attributes.from_string("27,10,10,10,10"), limit=len(ranking.calc))
+    two_handed = ranking.rank(Attributes.from_string("27,10,10,10,10"), two_handed=True, limit=len(ranking.calc))
+
+    assert len(two_handed) > len(one_handed)
+    assert two_handed[0].total > one_handed[0].total
+
+def test_invalid_sort_key(ranking):
+    with pytest.raises(AssertionError):
+        ranking.rank(Attributes.from_string("10,10,10,10,10"), sort_by="weight")
\ No newline at end of file
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from erdb.utils.attack_power import Attributes, ArmamentCalculator
+from erdb.utils.attack_power_batch import BatchCalculator
+
+
+_ATTRIBUTE_SETS = [
+    Attributes(10, 10, 10, 10, 10),
+    Attributes(40, 12, 9, 15, 7),
+    Attributes(8, 30, 60, 8, 45),
+    Attributes(99, 99, 99, 99, 99),
+]
+
+@pytest.fixture(scope="module")
+def batch(calc_data) -> BatchCalculator:
+    return BatchCalculator(calc_data)
+
+@pytest.mark.parametrize("level", [0, 7, 25])
+def test_matches_armament_calculator(calc_data, batch, level):
+    combos = np.arange(0, len(batch), 11)
+    levels = batch.levels(level, combos)
+
+    ap = batch.attack_power(_ATTRIBUTE_SETS, combos, levels)
+    se = batch.status_effects(_ATTRIBUTE_SETS, combos, levels)
+
+    for i, c in enumerate(combos):
+        calc = ArmamentCalculator(calc_data, *batch.combos[c], int(levels[i]))
+
+        for j, attribs in enumerate(_ATTRIBUTE_SETS):
+            expected = calc.attack_power(attribs)
+            assert [v.base for v in expected] == list(ap.base[i, j])
+            assert [v.scaling for v in expected] == list(ap.scaling[i, j])
+            assert expected.total == ap.total[i, j]
+
+            assert [v.total for v in calc.status_effects(attribs)] == list(se.totals[i, j])
+
+def test_grid_shape(batch):
+    combos = np.array([batch.index("Dagger", "Heavy"), batch.index("Dagger", "Keen")])
+    values = batch.attack_power(np.array(_ATTRIBUTE_SETS), combos[:, np.newaxis], np.arange(0, 26, 5))
+
+    assert values.base.shape == (2, 6, len(_ATTRIBUTE_SETS), 5)
+    assert np.all(np.diff(values.total, axis=1) >= 0) # upgrading never decreases attack power
+
+def test_level_out_of_range(batch):
+    with pytest.raises(AssertionError):
+        batch.attack_power(_ATTRIBUTE_SETS, batch.index("Moonveil", "Standard"), 25)
\ No newline at end of file
@@ -0,0 +1,78 @@
+import pytest
+
+from erdb.table import Table
+from erdb.utils.attack_power import Attributes, ArmamentCalculator
+
+
+_ATTRIBUTE_SETS = [
+    Attributes(10, 10, 10, 10, 10),
+    Attributes(40, 12, 9, 15, 7),
+    Attributes(8, 30, 60, 8, 45),
+    Attributes(99, 99, 99, 99, 99),
+]
+
+_TOLERANCE = 0.001
+
+@pytest.fixture(scope="module")
+def table(generate) -> dict:
+    return generate(Table.ATTACK_POWER)
+
+def _attack_power(item: dict, affinity: str, level: int, attributes: Attributes) -> dict[str, tuple[float, float]]:
+    # formula as documented by the model
+    ret = {}
+    aff = item["affinity"][affinity]
+    reinforcement = item["reinforcements"][str(aff["reinforcement_id"])]
+
+    for attack_type, values in aff["attack_power"].items():
+        correction = item["corrections"][str(values["correction_id"])]
+        contributions = [
+            c["penalty"] if value < item["requirements"].get(attribute, 0) else c["ratio"] - 1 + c["scaling"] * reinforcement["scaling"][attribute][level] * correction[value - 1] * c["ratio"]
+            for attribute, value in attributes.items() if (c := values["attributes"].get(attribute)) is not None
+        ]
+        low_cap = min(contributions + ([0.0] if len(contributions) < 5 else []))
+        base = values["base"] * reinforcement["damage"][attack_type][level]
+        ret[attack_type] = (base, base * max(low_cap, sum(contributions)))
+
+    return ret
+
+def _status_effects(item: dict, affinity: str, level: int, attributes: Attributes) -> dict[str, tuple[float, float]]:
+    ret = {}
+    aff = item["affinity"][affinity]
+    reinforcement = item["reinforcements"][str(aff["reinforcement_id"])]
+
+    for effect_type, values in aff["status_effects"].items():
+        base = values["upgrades"][level] if "upgrades" in values else values["base"]
+        scaling = 0.0 if "scaling" not in values else base * values["scaling"] * reinforcement["scaling"]["arcane"][level] * item["corrections"][str(values["correction_id"])][attributes.arcane - 1]
+        ret[effect_type] = (base, scaling)
+
+    return ret
+
+def test_keys(calc_data, table):
+    assert table.keys() == calc_data.armaments.keys()
+
+    for name, item in table.items():
+        assert item["affinity"].keys() == calc_data.armaments[name]["affinity"].keys()
+
+@pytest.mark.parametrize("armament", [
+    "Claymore", "Uchigatana", "Rivers of Blood", "Sword of Night and Flame", "Dismounter",
+    "Dragon Greatclaw", "Antspur Rapier", "Serpent-Hunter", "Coded Sword", "Black Knife",
+])
+def test_matches_calculator(calc_data, table, armament):
+    item = table[armament]
+
+    for affinity in item["affinity"].keys():
+        reinforcement_id = calc_data.armaments[armament]["affinity"][affinity]["reinforcement_id"]
+        levels = len(calc_data.reinforcements[str(reinforcement_id)])
+
+        for level in range(0, levels):
+            calc = ArmamentCalculator(calc_data, armament, affinity, level)
+
+            for attributes in _ATTRIBUTE_SETS:
+                attack_power = _attack_power(item, affinity, level, attributes)
+                for attack_type, value in calc.attack_power(attributes).items():
+                    # correction curves are rounded
+                    assert attack_power.get(attack_type, (0.0, 0.0)) == (value.base, pytest.approx(value.scaling, abs=_TOLERANCE)), f"{affinity} {armament} +{level} {attack_type}"
+
+                status_effects = _status_effects(item, affinity, level, attributes)
+                for effect_type, value in calc.status_effects(attributes).items():
+                    assert status_effects.get(effect_type, (0.0, 0.0)) == (value.base, pytest.approx(value.scaling, abs=_TOLERANCE)), f"{affinity} {armament} +{level} {effect_type}"
\ No newline at end of file
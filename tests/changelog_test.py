@@ -0,0 +1,49 @@
+import pytest
+from io import StringIO
+
+from erdb.table import Table
+from erdb.loaders import GAME_VERSIONS
+from erdb.utils.changelog import FormatterText, _add_changes, generate, generate_matrix
+
+
+_TABLES = [Table.CORRECTION_GRAPH, Table.TOOLS]
+_VERSIONS = [GAME_VERSIONS[3], GAME_VERSIONS[2], GAME_VERSIONS[1]]
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("ERDB_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(Table, "effective", classmethod(lambda cls: _TABLES))
+    return tmp_path / "cache"
+
+def _written(formatter: FormatterText) -> str:
+    out = StringIO()
+    formatter.write(out)
+    return out.getvalue()
+
+def test_list_of_numbers_changes():
+    formatter = FormatterText()
+    formatter.section("Test")
+    _add_changes(formatter, {"Item": {"base": [1.0, 2.0]}}, {"Item": {"base": [1.0, 2.5]}})
+
+    lines = _written(formatter).splitlines()
+    assert "- 2.0" in lines and "+ 2.5" in lines and "  1.0" in lines
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_matrix_matches_pairs(tmp_path, cache_dir, jobs):
+    files = generate_matrix(list(reversed(_VERSIONS)), tmp_path / "out", formatter_id="text", jobs=jobs)
+    assert files == [tmp_path / "out" / f"{v}.txt" for v in _VERSIONS[1:]]
+
+    # every version is generated once, then shared by both of its pairs
+    assert len(list((cache_dir / "tables").glob("*.pickle"))) == len(_TABLES) * len(_VERSIONS)
+
+    for from_version, version in zip(_VERSIONS, _VERSIONS[1:]):
+        generate(from_version, version, tmp_path / "pair.txt", formatter_id="text")
+        assert sorted((tmp_path / "out" / f"{version}.txt").read_text().splitlines()) == sorted((tmp_path / "pair.txt").read_text().splitlines())
+
+def test_list_item_changes():
+    formatter = FormatterText()
+    formatter.section("Test")
+    _add_changes(formatter, {"0": [0.0, 1.0]}, {"0": [0.0, 0.5]})
+
+    lines = _written(formatter).splitlines()
+    assert "- 1.0" in lines and "+ 0.5" in lines
\ No newline at end of file
@@ -0,0 +1,23 @@
+import json
+import pytest
+from typing import Callable
+
+from erdb.table import Table
+from erdb.loaders import GAME_VERSIONS
+from erdb.utils.common import pydantic_encoder_no_nulls
+from erdb.utils.attack_power import CalculatorData
+from erdb.typing.api_version import ApiVersion
+
+
+def _generate(tb: Table) -> dict:
+    # the same plain values as the JSON output
+    data = tb.make_generator(GAME_VERSIONS[0]).generate(ApiVersion.VER_1)
+    return json.loads(json.dumps(data, default=pydantic_encoder_no_nulls))
+
+@pytest.fixture(scope="module")
+def generate() -> Callable[[Table], dict]:
+    return _generate
+
+@pytest.fixture(scope="module")
+def calc_data(generate) -> CalculatorData:
+    return CalculatorData(*map(generate, [Table.ARMAMENTS, Table.REINFORCEMENTS, Table.CORRECTION_ATTACK, Table.CORRECTION_GRAPH]))
\ No newline at end of file
@@ -0,0 +1,54 @@
+import os
+import json
+import pytest
+
+from erdb.loaders import contrib
+from erdb.typing.game_version import GameVersion
+
+
+_V = GameVersion.from_string
+
+@pytest.fixture
+def element(tmp_path, monkeypatch):
+    monkeypatch.setattr(contrib, "PKG_DATA_PATH", tmp_path)
+    path = tmp_path / "contrib" / "Armament"
+    path.mkdir(parents=True)
+    return path
+
+def _write(path, data: dict, mtime_ns: int):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def test_version_ranges(element):
+    _write(element / "Dagger.json", {
+        "any version": {"locations": ["a"], "remarks": ["r"]},
+        "from 1.03.0 until 1.05.0": {"locations": ["b"]},
+        "only 1.04.0": {"remarks": ["s"], "weight": 2},
+        "from 1.05.0": {"weight": 3},
+    }, 1)
+
+    assert contrib.load("Armament", _V("1.02.3")) == {"Dagger": {"locations": ["a"], "remarks": ["r"]}}
+    assert contrib.load("Armament", _V("1.03.2")) == {"Dagger": {"locations": ["a", "b"], "remarks": ["r"]}}
+    assert contrib.load("Armament", _V("1.04.0")) == {"Dagger": {"locations": ["a", "b"], "remarks": ["r", "s"], "weight": 2}}
+    assert contrib.load("Armament", _V("1.04.1")) == {"Dagger": {"locations": ["a", "b"], "remarks": ["r"]}}
+    assert contrib.load("Armament", _V("1.10.0")) == {"Dagger": {"locations": ["a"], "remarks": ["r"], "weight": 3}}
+
+def test_no_matching_range(element):
+    _write(element / "Dagger.json", {"until 1.03.0": {"weight": 1}}, 1)
+
+    assert contrib.load("Armament", _V("1.02.0")) == {"Dagger": {"weight": 1}}
+    assert contrib.load("Armament", _V("1.03.0")) == {"Dagger": {}}
+
+def test_missing_element(element):
+    assert contrib.load("Armor", _V("1.10.0")) == {}
+
+def test_changes_are_picked_up(element):
+    _write(element / "Dagger.json", {"any version": {"weight": 1}}, 1)
+    assert contrib.load("Armament", _V("1.10.0")) == {"Dagger": {"weight": 1}}
+
+    _write(element / "Dagger.json", {"any version": {"weight": 2}}, 2)
+    _write(element / "Club.json", {"any version": {"weight": 3}}, 2)
+    assert contrib.load("Armament", _V("1.10.0")) == {"Club": {"weight": 3}, "Dagger": {"weight": 2}}
+
+    (element / "Dagger.json").unlink()
+    assert contrib.load("Armament", _V("1.10.0")) == {"Club": {"weight": 3}}
@@ -0,0 +1,66 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from erdb.table import Table
+from erdb.app_api.common import DataProxy, GameVersionEnum, LATEST_VERSION
+from erdb.utils.generation_cache import GenerationCache
+from erdb.typing.game_version import GameVersion
+from erdb.typing.api_version import ApiVersion
+
+
+def test_concurrent_requests_share_generation(tmp_path):
+    async def run() -> list[dict]:
+        proxy = DataProxy(GenerationCache(tmp_path), ThreadPoolExecutor(max_workers=2))
+        requests = [proxy.generate(ApiVersion.VER_1, LATEST_VERSION, Table.CORRECTION_GRAPH) for _ in range(4)]
+        requests.append(proxy.generate(ApiVersion.VER_1, GameVersionEnum.latest, Table.CORRECTION_GRAPH))
+        return await asyncio.gather(*requests)
+
+    first, *others = asyncio.run(run())
+    assert len(first) > 0
+    assert all(data is first for data in others)
+
+def test_old_versions_are_evicted(tmp_path):
+    versions = list(GameVersionEnum)[2:5]
+
+    async def run() -> DataProxy:
+        proxy = DataProxy(GenerationCache(tmp_path), maxsize=2)
+        for game_version in versions:
+            await proxy.generate(ApiVersion.VER_1, game_version, Table.CORRECTION_GRAPH)
+        return proxy
+
+    proxy = asyncio.run(run())
+    assert [key[1] for key in proxy._recent] == [v.value for v in versions[1:]]
+
+def test_item_without_table(tmp_path):
+    game_version = list(GameVersionEnum)[3]
+
+    async def run() -> tuple[DataProxy, list]:
+        proxy = DataProxy(GenerationCache(tmp_path))
+        items = [await proxy.item(ApiVersion.VER_1, game_version, Table.GESTURES, key) for key in ["The Ring", "The Ring", "Not A Gesture"]]
+        return proxy, items
+
+    proxy, (item, again, missing) = asyncio.run(run())
+    assert item is not None and item is again
+    assert missing is None
+    assert len(proxy._recent) == 0
+
+    data = GenerationCache(tmp_path).get(Table.GESTURES, ApiVersion.VER_1, GameVersion.from_string(game_version.value))
+    assert item == data["The Ring"]
+
+def test_item_of_table_in_memory(tmp_path):
+    async def run() -> tuple[dict, object]:
+        proxy = DataProxy(GenerationCache(tmp_path))
+        data = await proxy.generate(ApiVersion.VER_1, LATEST_VERSION, Table.GESTURES)
+        return data, await proxy.item(ApiVersion.VER_1, LATEST_VERSION, Table.GESTURES, "Bow")
+
+    data, item = asyncio.run(run())
+    assert item is data["Bow"]
+
+def test_search_index_is_shared(tmp_path):
+    async def run() -> list:
+        proxy = DataProxy(GenerationCache(tmp_path))
+        return await asyncio.gather(proxy.search(GameVersionEnum.latest), proxy.search(LATEST_VERSION))
+
+    first, second = asyncio.run(run())
+    assert first is second
+    assert first.search("godrick great rune")[0].name == "Godrick's Great Rune"
\ No newline at end of file
@@ -0,0 +1,39 @@
+import pytest
+
+from erdb.effect_parser import cache_stats, get_effects_nested, parse_effects
+from erdb.effect_parser.aggregator import aggregate_effects
+from erdb.loaders import GAME_VERSIONS
+from erdb.loaders.params import load
+from erdb.typing.enums import ItemIDFlag
+
+
+_VERSION = GAME_VERSIONS[0]
+
+@pytest.fixture(scope="module")
+def talismans():
+    return load("EquipParamAccessory", _VERSION, ItemIDFlag.ACCESSORIES)
+
+@pytest.fixture(scope="module")
+def effects():
+    return load("SpEffectParam", _VERSION, ItemIDFlag.NON_EQUIPABBLE)
+
+def test_cached_effects_match_uncached(talismans, effects):
+    for talisman in talismans.values():
+        effect_id = talisman["refId"].as_int
+
+        if effect_id not in effects:
+            continue
+
+        expected = [e.to_dict() for e in aggregate_effects(get_effects_nested(effects[effect_id], effects, None))]
+        assert parse_effects(talisman, effects, "refId") == expected
+
+def test_repeated_parse_hits_cache(talismans, effects):
+    talisman = next(t for t in talismans.values() if t["refId"].as_int in effects)
+
+    first = parse_effects(talisman, effects, "refId")
+    hits = cache_stats().hits
+    second = parse_effects(talisman, effects, "refId")
+
+    assert first == second
+    assert first is not second
+    assert cache_stats().hits == hits + 1
\ No newline at end of file
@@ -0,0 +1,95 @@
+import pytest
+from zipfile import ZipFile
+
+from erdb.loaders import GAME_VERSIONS, gamedata
+from erdb.typing.game_version import GameVersion
+
+
+_V1, _V2, _V3 = map(GameVersion.from_string, ["1.00.0", "1.01.0", "1.02.0"])
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(gamedata, "PKG_DATA_PATH", tmp_path)
+    gamedata._files.cache_clear()
+    gamedata._object.cache_clear()
+    yield tmp_path
+    gamedata._files.cache_clear()
+    gamedata._object.cache_clear()
+
+def test_every_version_is_intact():
+    # reading verifies the content hash of every object, including ones stored as deltas
+    for version in GAME_VERSIONS:
+        for filename in gamedata.files(version):
+            assert len(gamedata.read(version, filename)) > 0
+
+def test_delta_round_trip():
+    base = b"Row ID;value\r\n1;10\r\n2;20\r\n3;30\r\n"
+    data = b"Row ID;value\r\n1;10\r\n2;25\r\n4;40\r\n"
+    assert gamedata._apply(base, gamedata._delta(base, data)) == data
+    assert gamedata._apply(data, gamedata._delta(data, b"")) == b""
+
+def test_inserted_text_is_split():
+    data = b"".join(b"%d;%s\r\n" % (i, b"x" * 100) for i in range(2000))
+    ops = gamedata._delta(b"", data)
+
+    assert len(ops) > 1 and all(isinstance(op, str) and len(op) < 2 * gamedata._MAX_INSERT for op in ops)
+    assert gamedata._apply(b"", ops) == data
+
+def test_stream_matches_read(store):
+    newest = b"".join(b"%d;%d\r\n" % (i, i) for i in range(20000))
+    middle = newest.replace(b"5;5\r\n", b"5;50\r\n").replace(b"\r\n", b"\n", 100)
+    oldest = b"x\ry\r\n" + middle[:-30000] + "\u00e9\u2028\n".encode("utf-8")
+
+    gamedata.add_version(_V3, {"a.csv": newest})
+    gamedata.add_version(_V2, {"a.csv": middle})
+    gamedata.add_version(_V1, {"a.csv": oldest})
+
+    for version, data in [(_V3, newest), (_V2, middle), (_V1, oldest)]:
+        with gamedata.stream(version, "a.csv") as f:
+            assert f.read() == data == gamedata.read(version, "a.csv")
+
+        with gamedata.stream_text(version, "a.csv") as f, gamedata.open_text(version, "a.csv") as g:
+            assert list(f) == list(g)
+
+def test_versions_share_objects(store):
+    gamedata.add_version(_V1, {"a.csv": b"1;x\n2;y\n", "b.csv": b"same\n"})
+    gamedata.add_version(_V2, {"a.csv": b"1;x\n2;z\n", "b.csv": b"same\n"})
+
+    assert gamedata.versions() == [_V2, _V1]
+    assert len(list((store / "gamedata" / "objects").iterdir())) == 3
+
+    assert gamedata.read(_V1, "a.csv") == b"1;x\n2;y\n"
+    assert gamedata.read(_V2, "a.csv") == b"1;x\n2;z\n"
+    assert gamedata.files(_V1)["b.csv"] == gamedata.files(_V2)["b.csv"]
+
+def test_older_contents_are_deltas(store):
+    gamedata.add_version(_V1, {"a.csv": b"1;x\n"})
+    gamedata.add_version(_V3, {"a.csv": b"1;x\n3;z\n"})
+    gamedata.add_version(_V2, {"a.csv": b"1;x\n2;y\n"}) # imported out of order
+
+    newest, middle, oldest = (gamedata.files(v)["a.csv"] for v in [_V3, _V2, _V1])
+
+    assert gamedata._encoding(newest) is None
+    assert gamedata._encoding(middle) == newest
+    assert gamedata._encoding(oldest) == middle
+    assert gamedata.read(_V1, "a.csv") == b"1;x\n"
+
+def test_shared_objects_are_whole(store):
+    gamedata.add_version(_V1, {"a.csv": b"x\n", "b.csv": b"y\n"})
+    gamedata.add_version(_V2, {"a.csv": b"y\n", "b.csv": b"x\n"})
+
+    assert all(gamedata._encoding(digest) is None for digest in gamedata.files(_V1).values())
+    assert gamedata.read(_V1, "a.csv") == gamedata.read(_V2, "b.csv") == b"x\n"
+
+def test_import_archive(store, tmp_path):
+    archive = tmp_path / "archive.zip"
+    with ZipFile(archive, "w") as z:
+        z.writestr("a.csv", "1;x\n")
+        z.writestr("b.fmg.xml", "<fmg></fmg>")
+
+    gamedata.import_archive(archive, _V1)
+    assert gamedata.files(_V1).keys() == {"a.csv", "b.fmg.xml"}
+    assert gamedata.read(_V1, "b.fmg.xml") == b"<fmg></fmg>"
+
+    with pytest.raises(AssertionError):
+        gamedata.import_archive(archive, _V1)
\ No newline at end of file
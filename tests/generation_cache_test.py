@@ -0,0 +1,37 @@
+from erdb.table import Table
+from erdb.loaders import GAME_VERSIONS
+from erdb.utils.generation_cache import GenerationCache
+from erdb.typing.api_version import ApiVersion
+
+
+_VERSION = GAME_VERSIONS[0]
+
+def test_generated_table_is_stored(tmp_path):
+    cache = GenerationCache(tmp_path)
+    assert cache.load(Table.CORRECTION_GRAPH, ApiVersion.VER_1, _VERSION) is None
+
+    data = cache.get(Table.CORRECTION_GRAPH, ApiVersion.VER_1, _VERSION)
+    assert cache.load(Table.CORRECTION_GRAPH, ApiVersion.VER_1, _VERSION) == data
+    assert len(list(tmp_path.glob("correction-graph-v1-*.pickle"))) == 1
+
+def test_items_are_streamed_and_stored(tmp_path):
+    cache = GenerationCache(tmp_path)
+    generated = list(cache.items(Table.CORRECTION_GRAPH, ApiVersion.VER_1, _VERSION))
+
+    assert len(generated) > 0
+    assert list(cache.items(Table.CORRECTION_GRAPH, ApiVersion.VER_1, _VERSION)) == generated
+    assert cache.load(Table.CORRECTION_GRAPH, ApiVersion.VER_1, _VERSION) == dict(generated)
+
+def test_unfinished_items_are_not_stored(tmp_path):
+    cache = GenerationCache(tmp_path)
+    items = cache.items(Table.CORRECTION_GRAPH, ApiVersion.VER_1, _VERSION)
+    next(items)
+    items.close()
+
+    assert cache.load(Table.CORRECTION_GRAPH, ApiVersion.VER_1, _VERSION) is None
+    assert len(list(tmp_path.iterdir())) == 0
+
+def test_digest_depends_on_version():
+    cache = GenerationCache.default()
+    digests = {cache.digest(Table.CORRECTION_GRAPH, v) for v in GAME_VERSIONS[:2]}
+    assert len(digests) == 2
\ No newline at end of file
@@ -0,0 +1,75 @@
+import json
+import pytest
+from io import StringIO
+from pathlib import Path
+
+from erdb.table import Table
+from erdb.loaders import GAME_VERSIONS
+from erdb.utils.common import pydantic_encoder_no_nulls
+from erdb.utils.generation import generate_tables, group_tables, write_json
+
+
+@pytest.fixture(scope="module")
+def gestures() -> dict:
+    return Table.GESTURES.make_generator(GAME_VERSIONS[0]).generate()
+
+def _dumps(data: dict, minimize: bool) -> str:
+    kwargs = {"separators": (",", ":")} if minimize else {"indent": 4}
+    return json.dumps(data, ensure_ascii=False, default=pydantic_encoder_no_nulls, allow_nan=False, **kwargs)
+
+def _write(items, minimize: bool) -> tuple[int, str]:
+    out = StringIO()
+    count = write_json(items, out, minimize)
+    return count, out.getvalue()
+
+@pytest.mark.parametrize("minimize", [False, True])
+def test_same_as_dump(gestures: dict, minimize: bool):
+    assert _write(gestures.items(), minimize) == (len(gestures), _dumps(gestures, minimize))
+
+@pytest.mark.parametrize("minimize", [False, True])
+def test_nested_and_empty_values(minimize: bool):
+    data = {"a": {"b": [1, {"c": None}], "d": {}}, "e\n\"f": [], "g": None, "h": "i\nj"}
+    assert _write(data.items(), minimize) == (len(data), _dumps(data, minimize))
+
+@pytest.mark.parametrize("minimize", [False, True])
+def test_empty(minimize: bool):
+    assert _write(iter([]), minimize) == (0, "{}")
+
+def test_duplicate_keys_as_dictionary():
+    generator = Table.GESTURES.make_generator(GAME_VERSIONS[0])
+    keys = [key for key, _ in generator.iterate()]
+
+    # The Ring has two rows
+    assert len(keys) == len(set(keys))
+    assert len(keys) < len([row for row in generator.data.main_param.values() if all(pred(row) for pred in generator.spec.predicates)])
+
+def test_group_tables_by_main_param():
+    tables = [Table.TOOLS, Table.CORRECTION_GRAPH, Table.GESTURES, Table.REINFORCEMENTS, Table.SPELLS]
+    groups = group_tables(tables)
+
+    # tools, gestures and spells are all read from EquipParamGoods
+    assert groups == [[Table.CORRECTION_GRAPH], [Table.GESTURES, Table.SPELLS, Table.TOOLS], [Table.REINFORCEMENTS]]
+
+    # sorted within groups, groups by their first table
+    assert all(group == sorted(group) for group in groups)
+    assert [group[0] for group in groups] == sorted(group[0] for group in groups)
+
+def _files(path: Path) -> dict[str, bytes]:
+    return {str(f.relative_to(path)): f.read_bytes() for f in sorted(path.rglob("*")) if f.is_file()}
+
+@pytest.mark.parametrize("minimize", [False, True])
+def test_parallel_same_as_serial(tmp_path, monkeypatch, minimize: bool):
+    tables = [Table.TOOLS, Table.CORRECTION_GRAPH, Table.GESTURES]
+    versions = GAME_VERSIONS[:2]
+    timings = {}
+
+    for jobs in [1, 2]:
+        # nothing is served from tables generated by the other run
+        monkeypatch.setenv("ERDB_CACHE_DIR", str(tmp_path / f"cache-{jobs}"))
+        timings[jobs] = generate_tables(tables, versions, tmp_path / f"out-{jobs}", minimize, jobs=jobs)
+
+    assert [(t.version, t.table, t.elements) for t in timings[1]] == [(t.version, t.table, t.elements) for t in timings[2]]
+
+    serial, parallel = _files(tmp_path / "out-1"), _files(tmp_path / "out-2")
+    assert len(serial) == len(tables) * len(versions)
+    assert serial == parallel
\ No newline at end of file
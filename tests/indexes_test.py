@@ -0,0 +1,59 @@
+import pytest
+from enum import Enum
+from typing import NamedTuple
+
+from erdb.app_api.indexes import Predicate, TableIndex
+
+
+class _Rarity(str, Enum):
+    COMMON = "Common"
+    RARE = "Rare"
+
+class _Item(NamedTuple):
+    weight: float
+    rarity: _Rarity
+    is_tradable: bool
+
+_DATA = {
+    "Dagger": _Item(1.5, _Rarity.COMMON, True),
+    "Club": _Item(3.0, _Rarity.COMMON, True),
+    "Moonveil": _Item(6.5, _Rarity.RARE, False),
+    "Rivers of Blood": _Item(6.5, _Rarity.RARE, False),
+    "Greatsword": _Item(23.0, _Rarity.COMMON, True),
+}
+
+@pytest.mark.parametrize("queries,expected", [
+    (["rarity:Rare"], ["Moonveil", "Rivers of Blood"]),
+    (["is_tradable:True"], ["Dagger", "Club", "Greatsword"]),
+    (["weight:6.5"], ["Moonveil", "Rivers of Blood"]),
+    (["weight:>3"], ["Moonveil", "Rivers of Blood", "Greatsword"]),
+    (["weight:>=3"], ["Club", "Moonveil", "Rivers of Blood", "Greatsword"]),
+    (["weight:<6.5"], ["Dagger", "Club"]),
+    (["weight:1.5..6.5"], ["Dagger", "Club", "Moonveil", "Rivers of Blood"]),
+    (["weight:<=10", "rarity:Common"], ["Dagger", "Club"]),
+    (["rarity:Legendary"], []),
+])
+def test_select(queries: list[str], expected: list[str]):
+    index = TableIndex(_DATA)
+    assert index.select([Predicate.parse(q) for q in queries]) == expected
+
+def test_select_matches_linear_scan():
+    index = TableIndex(_DATA)
+    for item in _DATA.values():
+        expected = [k for k, v in _DATA.items() if str(v.weight) == str(item.weight)]
+        assert index.select([Predicate.parse(f"weight:{item.weight}")]) == expected
+
+def test_unknown_field():
+    with pytest.raises(AttributeError):
+        TableIndex(_DATA).select([Predicate.parse("nope:1")])
+
+def test_range_not_a_number():
+    # not a range, matched exactly
+    assert Predicate.parse("weight:>heavy") == Predicate("weight", equals=">heavy")
+    assert Predicate.parse("rarity:<Bow") == Predicate("rarity", equals="<Bow")
+    assert TableIndex(_DATA).select([Predicate.parse("weight:>heavy")]) == []
+
+@pytest.mark.parametrize("query", ["rarity:1..5", "rarity:>1", "is_tradable:<=1"])
+def test_range_of_non_numeric_field(query: str):
+    with pytest.raises(ValueError):
+        TableIndex(_DATA).select([Predicate.parse(query)])
\ No newline at end of file
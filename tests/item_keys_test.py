@@ -0,0 +1,47 @@
+from unicodedata import normalize, combining
+
+from erdb.table import Table
+from erdb.table._common import TableSpecContext, load_item_keys
+from erdb.table._retrievers import MsgsRetriever
+from erdb.loaders import GAME_VERSIONS
+
+
+_VERSION = GAME_VERSIONS[0]
+
+def _pk(name: str) -> str:
+    return "".join(c for c in normalize("NFKD", TableSpecContext.parse_name(name)) if not combining(c))
+
+def test_keys_match_names():
+    names = MsgsRetriever("WeaponName").get(_VERSION)
+    keys = load_item_keys(MsgsRetriever("WeaponName"), _VERSION)
+
+    assert keys.pks == {index: _pk(name) for index, name in names.items()}
+    assert all(index in keys.ids[pk] for index, pk in keys.pks.items())
+    assert sum(map(len, keys.ids.values())) == len(keys.pks)
+
+def test_keys_are_shared():
+    assert Table.GESTURES.make_generator(_VERSION).data.keys is Table.TOOLS.make_generator(_VERSION).data.keys
+
+def test_find_row():
+    generator = Table.ARMAMENTS.make_generator(_VERSION)
+
+    for index, key in generator.item_keys().items():
+        row = generator.find_row(key)
+        assert row is not None and row.index == index
+
+    assert generator.find_row("Not An Armament") is None
+
+def test_find_row_duplicate_name():
+    generator = Table.GESTURES.make_generator(_VERSION)
+    row = generator.find_row("The Ring")
+
+    # same item as in the generated table, made of the last row
+    assert row is not None
+    assert generator.spec.make_object(generator.spec.latest_api(), generator.data, row) == generator.generate()["The Ring"]
+
+def test_find_row_unnamed():
+    generator = Table.REINFORCEMENTS.make_generator(_VERSION)
+    assert generator.data.keys is None
+
+    row = generator.find_row("100")
+    assert row is not None and row.index == 100
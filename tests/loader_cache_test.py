@@ -0,0 +1,28 @@
+from erdb.loaders.cache import LoaderCache
+
+
+def test_hits_and_misses():
+    cache = LoaderCache(maxsize=4)
+    calls = []
+
+    def loader(value):
+        return lambda: calls.append(value) or value
+
+    assert cache.get("a", loader(1)) == 1
+    assert cache.get("a", loader(2)) == 1
+    assert cache.get("b", loader(3)) == 3
+
+    assert calls == [1, 3]
+    assert cache.stats().hits == 1
+    assert cache.stats().misses == 2
+
+def test_least_recently_used_is_evicted():
+    cache = LoaderCache(maxsize=2)
+    cache.get("a", lambda: 1)
+    cache.get("b", lambda: 2)
+    cache.get("a", lambda: 1) # "b" is now the least recently used
+    cache.get("c", lambda: 3)
+
+    assert cache.stats().size == 2
+    assert cache.get("a", lambda: -1) == 1
+    assert cache.get("b", lambda: -2) == -2
\ No newline at end of file
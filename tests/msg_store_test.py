@@ -0,0 +1,60 @@
+import pytest
+import xml.etree.ElementTree as xmltree
+
+from erdb.loaders import GAME_VERSIONS, gamedata
+from erdb.loaders.msg_store import MsgTable, iterate_msgs
+from erdb.loaders.params import load_msg
+
+
+_VERSION = GAME_VERSIONS[0]
+
+def _read_fmg(filename: str) -> dict[int, str]:
+    entries = xmltree.fromstring(gamedata.read(_VERSION, f"{filename}.fmg.xml")).findall(".//text")
+    return {int(str(e.get("id"))): str(e.text) for e in entries if e.text != "%null%"}
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("ERDB_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+@pytest.mark.parametrize("filename", ["GoodsName", "GoodsInfo", "WeaponCaption"])
+def test_values_match_fmg(filename: str):
+    expected = _read_fmg(filename)
+    table = MsgTable.open(filename, _VERSION)
+
+    assert len(table) == len(expected)
+    assert list(table.keys()) == list(expected.keys())
+    assert dict(table.items()) == expected
+    assert -1 not in table and "1" not in table
+    assert table.get(-1) is None
+
+def test_compiled_file_is_reused(cache_dir):
+    MsgTable.open("GoodsName", _VERSION)
+    compiled = list(cache_dir.rglob("GoodsName.*.bin"))
+    assert len(compiled) == 1
+
+    mtime = compiled[0].stat().st_mtime_ns
+    MsgTable.open("GoodsName", _VERSION)
+    assert compiled[0].stat().st_mtime_ns == mtime
+
+def test_range():
+    full = _read_fmg("GoodsName")
+    ranged = load_msg("GoodsName", _VERSION, 8000, 8999)
+
+    assert len(ranged) > 0
+    assert dict(ranged.items()) == {i: t for i, t in full.items() if 8000 <= i <= 8999}
+    assert min(full.keys()) not in ranged
+
+def test_iterate_ids():
+    full = _read_fmg("GoodsName")
+    ids = set(list(full.keys())[10:20])
+
+    assert dict(iterate_msgs("GoodsName", _VERSION, ids=ids)) == {i: full[i] for i in ids}
+    assert dict(iterate_msgs("GoodsName", _VERSION, id_min=min(ids), id_max=max(ids))) == {i: t for i, t in full.items() if min(ids) <= i <= max(ids)}
+
+def test_texts_are_shared():
+    table = MsgTable.open("GoodsInfo", _VERSION)
+    first, *others = [i for i, t in table.items() if t == table[min(table)]]
+
+    assert len(others) > 0
+    assert all(table[first] is table[i] for i in others)
@@ -0,0 +1,59 @@
+import pytest
+
+from erdb.loaders import GAME_VERSIONS
+from erdb.utils.param_diff import RowChange, _join, _sorted_rows, diff_rows
+from erdb.utils.source_diff import SourceDiff
+
+
+_OLD, _NEW = GAME_VERSIONS[2], GAME_VERSIONS[1]
+
+def _opener(ids: list[int]):
+    return lambda: iter([(index, [str(index), str(pos)]) for pos, index in enumerate(ids)])
+
+@pytest.mark.parametrize("ids,expected", [
+    ([1, 2, 3], [1, 2, 3]),
+    ([1, 5, 9, 2, 3, 10, 4], [1, 2, 3, 4, 5, 9, 10]),
+    ([3, 2, 1], [1, 2, 3]),
+    ([], []),
+])
+def test_sorted_rows(ids, expected):
+    assert [index for index, _ in _sorted_rows(_opener(ids))] == expected
+
+def test_sorted_rows_duplicates():
+    # last duplicate in the file wins, same as loaded params
+    rows = list(_sorted_rows(_opener([1, 2, 3, 2, 4])))
+    assert rows == [(1, ["1", "0"]), (2, ["2", "3"]), (3, ["3", "2"]), (4, ["4", "4"])]
+
+def test_join():
+    old = iter([(1, ["a"]), (2, ["b"]), (4, ["d"])])
+    new = iter([(2, ["B"]), (3, ["c"]), (4, ["d"]), (5, ["e"])])
+
+    assert list(_join(old, new)) == [
+        (1, ["a"], None),
+        (2, ["b"], ["B"]),
+        (3, None, ["c"]),
+        (4, ["d"], ["d"]),
+        (5, None, ["e"]),
+    ]
+
+@pytest.mark.parametrize("param", ["SpEffectParam", "EquipParamWeapon", "Magic"])
+def test_params_match_source_diff(param):
+    assert {c.id for c in diff_rows(param, _OLD, _NEW)} == SourceDiff(_OLD, _NEW).param(param)
+
+def test_msgs_match_source_diff():
+    assert {c.id for c in diff_rows("GoodsInfo", GAME_VERSIONS[-1], _NEW)} == SourceDiff(GAME_VERSIONS[-1], _NEW).msg("GoodsInfo")
+
+def test_filters():
+    changes = list(diff_rows("SpEffectParam", _OLD, _NEW))
+    changed = next(c for c in changes if c.change == "changed")
+    field = next(iter(changed.fields))
+
+    filtered = list(diff_rows("SpEffectParam", _OLD, _NEW, id_min=changed.id, id_max=changed.id, fields=[field]))
+    assert filtered == [RowChange(changed.id, changed.name, "changed", {field: changed.fields[field]})]
+
+    excluded = list(diff_rows("SpEffectParam", _OLD, _NEW, id_min=changed.id, id_max=changed.id, exclude_fields=list(changed.fields)))
+    assert excluded == []
+
+def test_unknown_file():
+    with pytest.raises(AssertionError):
+        list(diff_rows("NoSuchParam", _OLD, _NEW))
\ No newline at end of file
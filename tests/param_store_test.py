@@ -0,0 +1,55 @@
+import csv
+import pytest
+
+from erdb.loaders import GAME_VERSIONS, gamedata
+from erdb.loaders.param_store import ParamTable
+from erdb.loaders.params import load, load_ids
+from erdb.typing.enums import ItemIDFlag
+
+
+_VERSION = GAME_VERSIONS[0]
+
+def _read_csv(param: str) -> list[dict[str, str]]:
+    with gamedata.open_text(_VERSION, f"{param}.csv") as f:
+        return list(csv.DictReader(f, delimiter=";"))
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("ERDB_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+@pytest.mark.parametrize("param", ["CalcCorrectGraph", "EquipMtrlSetParam", "ShopLineupParam"])
+def test_values_match_csv(param: str):
+    expected = _read_csv(param)
+    table = ParamTable.open(param, _VERSION)
+
+    assert len(table) == len(expected)
+
+    for pos, row in enumerate(expected):
+        assert table.ids[pos] == int(row["Row ID"])
+        assert all(table.value(field, pos) == row[field] for field in table.fields)
+
+def test_compiled_file_is_reused(cache_dir):
+    ParamTable.open("CalcCorrectGraph", _VERSION)
+    compiled = list(cache_dir.rglob("CalcCorrectGraph.*.bin"))
+    assert len(compiled) == 1
+
+    mtime = compiled[0].stat().st_mtime_ns
+    ParamTable.open("CalcCorrectGraph", _VERSION)
+    assert compiled[0].stat().st_mtime_ns == mtime
+
+def test_load_ids_range():
+    full = load("EquipMtrlSetParam", _VERSION, ItemIDFlag.NON_EQUIPABBLE)
+    ranged = load_ids("EquipMtrlSetParam", _VERSION, ItemIDFlag.NON_EQUIPABBLE, 300000, 400000)
+
+    assert list(ranged.keys()) == [i for i in full.keys() if 300000 <= i <= 400000]
+    assert all(ranged[i]["materialId01"] == full[i]["materialId01"] for i in ranged.keys())
+
+def test_fields_are_shared_and_typed():
+    rows = list(load("EquipMtrlSetParam", _VERSION, ItemIDFlag.NON_EQUIPABBLE).values())
+    first, *others = [row for row in rows if row["itemNum01"] == "1"]
+
+    assert len(others) > 0
+    assert all(first["itemNum01"] is row["itemNum01"] for row in others)
+    assert first["itemNum01"].as_int == 1
+    assert first["Row ID"].as_int == first.index
\ No newline at end of file
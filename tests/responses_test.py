@@ -0,0 +1,37 @@
+import gzip
+import json
+from fastapi import Request
+
+from erdb.app_api.responses import EncodedResponse
+
+
+_DATA = {"Dagger": {"weight": 1.5, "name": "Dagger"}, "Club": {"weight": 3.0, "name": "Club"}}
+
+def _request(**headers: str) -> Request:
+    return Request({"type": "http", "headers": [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()]})
+
+def test_plain():
+    response = EncodedResponse.encode(_DATA).respond(_request())
+    assert response.status_code == 200
+    assert json.loads(response.body) == _DATA
+    assert "content-encoding" not in response.headers
+
+def test_gzip():
+    response = EncodedResponse.encode(_DATA).respond(_request(accept_encoding="deflate, gzip;q=0.8"))
+    assert response.headers["content-encoding"] == "gzip"
+    assert json.loads(gzip.decompress(response.body)) == _DATA
+
+def test_gzip_refused():
+    response = EncodedResponse.encode(_DATA).respond(_request(accept_encoding="gzip;q=0"))
+    assert "content-encoding" not in response.headers
+
+def test_not_modified():
+    encoded = EncodedResponse.encode(_DATA)
+    etag = encoded.respond(_request(accept_encoding="gzip")).headers["etag"]
+
+    assert encoded.respond(_request(if_none_match=etag)).status_code == 304
+    assert encoded.respond(_request(if_none_match=f"\"other\", W/{etag}")).status_code == 304
+    assert encoded.respond(_request(if_none_match="\"other\"")).status_code == 200
+
+def test_etag_depends_on_content():
+    assert EncodedResponse.encode(_DATA).digest != EncodedResponse.encode({"Dagger": _DATA["Dagger"]}).digest
\ No newline at end of file
@@ -0,0 +1,67 @@
+import pytest
+
+from erdb.table import Table
+from erdb.utils.search import SEARCHABLE_TABLES, SearchIndex, tokenize
+from erdb.utils.generation_cache import GenerationCache
+from erdb.loaders import GAME_VERSIONS
+
+
+_VERSION = GAME_VERSIONS[0]
+
+@pytest.fixture(scope="module")
+def index() -> SearchIndex:
+    return SearchIndex.build(_VERSION)
+
+def test_tokenize():
+    assert tokenize("Godrick's GREAT Rune") == ["godrick", "s", "great", "rune"]
+    assert tokenize("Ásh of Wár: Blood Tax") == ["ash", "of", "war", "blood", "tax"]
+
+def test_documents_match_generated_keys(index: SearchIndex):
+    keys = set(Table.GESTURES.make_generator(_VERSION).generate().keys())
+    assert {key for tb, key, _ in index.documents if tb == Table.GESTURES} == keys
+
+    # derived tables only repeat items of other tables
+    assert all(tb != Table.ATTACK_POWER for tb, _, _ in index.documents)
+
+def test_searchable_tables(index: SearchIndex):
+    assert Table.ALL not in SEARCHABLE_TABLES and Table.ATTACK_POWER not in SEARCHABLE_TABLES
+    assert {tb for tb, _, _ in index.documents} == set(SEARCHABLE_TABLES)
+
+def test_all_words_match(index: SearchIndex):
+    results = index.search("godrick great rune")
+
+    assert len(results) > 0
+    assert results[0].name == "Godrick's Great Rune"
+    assert all("godrick" in tokenize(r.name) or r.score < results[0].score for r in results)
+
+def test_case_and_accents_are_folded(index: SearchIndex):
+    assert index.search("GÓDRÏCK") == index.search("godrick")
+
+def test_prefix_matches_rank_lower(index: SearchIndex):
+    results = index.search("blood", limit=100)
+    exact = [r.score for r in results if "blood" in tokenize(r.name)]
+    prefix = [r.score for r in results if any(w.startswith("blood") and w != "blood" for w in tokenize(r.name)) and "blood" not in tokenize(r.name)]
+
+    assert len(exact) > 0 and len(prefix) > 0
+    assert max(prefix) < max(exact)
+
+def test_tables_and_limit(index: SearchIndex):
+    results = index.search("sword", limit=5, tables=[Table.ARMAMENTS])
+
+    assert len(results) == 5
+    assert all(r.table == Table.ARMAMENTS for r in results)
+    assert [r.score for r in results] == sorted([r.score for r in results], reverse=True)
+
+def test_no_match(index: SearchIndex):
+    assert index.search("xyzzyq") == []
+    assert index.search("godrick xyzzyq") == []
+    assert index.search("  ") == []
+
+def test_stored_in_generation_cache(tmp_path, index: SearchIndex):
+    cache = GenerationCache(tmp_path)
+    stale = tmp_path / f"search-{_VERSION}-outdated.pickle"
+    stale.write_bytes(b"")
+
+    assert SearchIndex.load(_VERSION, cache) == index
+    assert [p.name for p in tmp_path.iterdir()] == [cache.index_entry("search", _VERSION).name]
+    assert SearchIndex.load(_VERSION, cache) == index
\ No newline at end of file
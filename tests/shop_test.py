@@ -0,0 +1,47 @@
+from erdb.shop import Lookup, Material, Product
+from erdb.typing.params import ParamRow, ParamDict
+from erdb.typing.enums import ItemIDFlag
+
+
+def _params(*rows: dict[str, str]) -> ParamDict:
+    param_rows = [ParamRow.make(row, ItemIDFlag.NON_EQUIPABBLE) for row in rows]
+    return {row.index: row for row in param_rows}
+
+def _lineup(index: int, product: int, material_set: int) -> dict[str, str]:
+    return {
+        "Row ID": str(index), "Row Name": "", "equipId": str(product), "equipType": "1",
+        "value": "0", "mtrlId": str(material_set), "costType": "0",
+    }
+
+def _material_set(index: int, *materials: int) -> dict[str, str]:
+    row = {"Row ID": str(index), "Row Name": ""}
+
+    for i in range(1, 7):
+        row[f"materialId0{i}"] = str(materials[i - 1]) if i <= len(materials) else "-1"
+        row[f"materialCate0{i}"] = "1"
+        row[f"itemNum0{i}"] = "1"
+
+    return row
+
+def _lookup() -> Lookup:
+    shop = _params(_lineup(1, 100, 10), _lineup(2, 200, 20), _lineup(3, 300, -1))
+    material_sets = _params(_material_set(10, 40000), _material_set(20, 40000, 50000))
+    return Lookup(shop, material_sets)
+
+def test_lineups_from_material():
+    lookup = _lookup()
+
+    both = lookup.get_lineups_from_material(Material(40000, Material.Category.PROTECTOR))
+    single = lookup.get_lineups_from_material(Material(50000, Material.Category.PROTECTOR))
+
+    assert [l.product.index for l in both] == [100, 200]
+    assert [l.product.index for l in single] == [200]
+    assert lookup.get_lineups_from_material(Material(60000, Material.Category.PROTECTOR)) == []
+
+def test_lineups_from_product():
+    lookup = _lookup()
+    lineups = lookup.get_lineups_from_product(Product(300, Product.Category.PROTECTOR))
+
+    assert len(lineups) == 1
+    assert lineups[0].materials == {}
+    assert len(lookup.lineups) == 3
\ No newline at end of file
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from erdb.table import Table
+from erdb.loaders import GAME_VERSIONS
+from erdb.loaders.param_store import ParamTable, _compile
+from erdb.utils.changelog import _get_item_changes
+from erdb.utils.source_diff import SourceDiff, _changed_rows, _referencing
+
+
+def _table(fields: list[str], rows: list[list[str]]) -> ParamTable:
+    return ParamTable("Test", GAME_VERSIONS[0], _compile(fields, rows))
+
+def test_changed_rows():
+    old = _table(["Row ID", "Row Name", "value"], [["1", "a", "10"], ["2", "b", "20"], ["3", "c", "30"]])
+    new = _table(["Row ID", "Row Name", "value"], [["1", "a", "10"], ["2", "b", "21"], ["4", "d", "40"]])
+    assert _changed_rows(old, new) == {2, 3, 4}
+
+def test_changed_rows_text():
+    old = _table(["Row ID", "Row Name", "value"], [["1", "a", "1.5"], ["2", "b", "20"]])
+    new = _table(["Row ID", "Row Name", "value"], [["1", "a", "1.5"], ["2", "c", "20"]])
+    assert _changed_rows(old, new) == {2}
+
+def test_changed_rows_duplicates():
+    # last duplicate wins, same as loaded params
+    old = _table(["Row ID", "value"], [["1", "10"], ["1", "11"], ["2", "20"]])
+    new = _table(["Row ID", "value"], [["1", "11"], ["2", "20"]])
+    assert _changed_rows(old, new) == set()
+
+def test_changed_rows_fields():
+    old = _table(["Row ID", "value"], [["1", "10"], ["2", "20"]])
+    new = _table(["Row ID", "value", "other"], [["1", "10", "0"], ["2", "20", "0"]])
+    assert _changed_rows(old, new) == {1, 2}
+
+def test_referencing():
+    table = _table(["Row ID", "ref", "text"], [["1", "100", "a"], ["2", "-1", "b"], ["3", "190", "c"], ["4", "0", "5"]])
+    dirty = np.array([5, 110, 200], dtype=np.int64)
+
+    assert _referencing(table, dirty, 0) == set()
+    assert _referencing(table, dirty, 10) == {1, 3, 4}
+    assert _referencing(table, dirty, 5) == {4}
+
+@pytest.mark.parametrize("tb", [Table.REINFORCEMENTS, Table.TASLISMANS, Table.TOOLS, Table.SPELLS])
+@pytest.mark.parametrize("old,new", [(GAME_VERSIONS[2], GAME_VERSIONS[1]), (GAME_VERSIONS[6], GAME_VERSIONS[5])])
+def test_affected_keys_cover_changes(tb, old, new):
+    keys = SourceDiff(old, new).affected_keys(tb)
+    added, removed, item_changes = _get_item_changes(tb.make_generator(old).generate(), tb.make_generator(new).generate())
+
+    assert keys is None or set(added) | set(removed) | set(item_changes.keys()) <= keys
\ No newline at end of file
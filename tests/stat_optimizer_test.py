@@ -0,0 +1,42 @@
+import itertools
+import numpy as np
+import pytest
+
+from erdb.utils.attack_power import Attributes
+from erdb.utils.attack_power_batch import BatchCalculator
+from erdb.utils.stat_optimizer import StartingClass, optimize_attributes, parse_weights
+
+
+@pytest.fixture(scope="module")
+def batch(calc_data) -> BatchCalculator:
+    return BatchCalculator(calc_data)
+
+def _brute_force(batch: BatchCalculator, combo: int, base: Attributes, points: int, weights: np.ndarray) -> float:
+    candidates = [
+        [min(99, b + p) for b, p in zip(base, spent)]
+        for spent in itertools.product(range(points + 1), repeat=len(base)) if sum(spent) <= points
+    ]
+    values = batch.attack_power(candidates, combo)
+    return float(np.max((values.base + values.scaling) @ weights))
+
+@pytest.mark.parametrize("armament,affinity,starting_class,points", [
+    ("Claymore", "Heavy", StartingClass.SAMURAI, 8),
+    ("Uchigatana", "Keen", StartingClass.ASTROLOGER, 6),
+    ("Dismounter", "Sacred", StartingClass.ASTROLOGER, 4), # requirements left unmet
+    ("Sword of Night and Flame", "Standard", StartingClass.WRETCH, 10),
+    ("Dagger", "Standard", StartingClass.HERO, 0),
+])
+def test_matches_brute_force(batch, armament, affinity, starting_class, points):
+    combo = batch.index(armament, affinity)
+    allocation = optimize_attributes(batch, combo, batch.max_levels[combo], starting_class.attributes, points)
+
+    assert sum(allocation.attributes) - sum(starting_class.attributes) == allocation.points <= points
+    assert allocation.score == pytest.approx(_brute_force(batch, combo, starting_class.attributes, points, np.ones(5)))
+
+def test_weights_ignore_other_types(batch):
+    combo = batch.index("Claymore", "Heavy")
+    allocation = optimize_attributes(batch, combo, 25, StartingClass.WRETCH.attributes, 20, parse_weights("magic=1"))
+
+    # heavy claymore deals no magic damage, no point is worth spending
+    assert allocation.attributes == StartingClass.WRETCH.attributes
+    assert allocation.points == 0
\ No newline at end of file
@@ -0,0 +1,71 @@
+import json
+import sqlite3
+import pytest
+
+from erdb.utils.table_formats import flatten, write_msgpack, write_parquet, write_sqlite
+
+
+_ITEMS = {
+    "Dagger": {"id": 1, "name": "Dagger", "weight": 1.5, "damage": {"physical": 75}, "tags": ["light"], "effects": [{"value": 2}]},
+    "Club": {"id": 2, "name": "Club", "weight": 3, "damage": {"physical": 103}, "tags": [], "effects": []},
+    "Moon": {"id": 3, "name": "Moon", "weight": "heavy", "damage": {}, "tags": []},
+}
+
+def test_flatten():
+    assert flatten(_ITEMS["Dagger"]) == {
+        "id": 1, "name": "Dagger", "weight": 1.5, "damage.physical": 75,
+        "tags": ["light"], "effects": "[{\"value\": 2}]",
+    }
+
+def test_flatten_empty_object():
+    assert flatten(_ITEMS["Moon"])["damage"] == "{}"
+
+def test_sqlite(tmp_path):
+    path = tmp_path / "erdb.sqlite"
+    assert write_sqlite(_ITEMS.items(), path, "armaments") == len(_ITEMS)
+
+    # replaced, not appended to
+    assert write_sqlite(_ITEMS.items(), path, "armaments") == len(_ITEMS)
+
+    with sqlite3.connect(path) as db:
+        db.row_factory = sqlite3.Row
+        rows = {row["key"]: dict(row) for row in db.execute("SELECT * FROM armaments")}
+        indexes = {row["name"] for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL")}
+
+    db.close()
+
+    assert rows["Dagger"]["damage.physical"] == 75
+    assert rows["Moon"]["damage.physical"] is None
+    assert json.loads(rows["Dagger"]["tags"]) == ["light"]
+    assert json.loads(rows["Club"]["weight"]) == 3 and json.loads(rows["Moon"]["weight"]) == "heavy"
+    assert indexes == {"armaments_id", "armaments_name"}
+
+def test_msgpack(tmp_path):
+    msgpack = pytest.importorskip("msgpack")
+    path = tmp_path / "armaments.msgpack"
+
+    with open(path, mode="wb") as f:
+        assert write_msgpack(_ITEMS.items(), f) == len(_ITEMS)
+
+    assert msgpack.unpackb(path.read_bytes()) == _ITEMS
+
+def test_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet
+
+    path = tmp_path / "armaments.parquet"
+    assert write_parquet(_ITEMS.items(), path) == len(_ITEMS)
+
+    table = pyarrow.parquet.read_table(path)
+    assert table.column("key").to_pylist() == list(_ITEMS.keys())
+    assert table.column("damage.physical").to_pylist() == [75, 103, None]
+    assert table.column("tags").to_pylist() == [["light"], [], []]
+
+def test_parquet_mixed_numbers(tmp_path):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet
+
+    path = tmp_path / "armaments.parquet"
+    write_parquet([("Dagger", {"weight": 1.5}), ("Club", {"weight": 3})], path)
+
+    assert pyarrow.parquet.read_table(path).column("weight").to_pylist() == [1.5, 3.0]
\ No newline at end of file